@@ -1,16 +1,40 @@
 import os
+import json
+import asyncio
+import calendar
 import uuid
-import shutil
+import hashlib
 import logging
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.db import models, database
 from app.api.v1 import schemas
-from app.services.processing_service import process_meeting_file
+from app.services.processing_service import (
+    enqueue_meeting_clone,
+    enqueue_meeting_processing,
+    failed_insight_keys,
+    find_completed_duplicate,
+    get_stage_states,
+)
 from app.services.graph_service import fetch_meeting_context, upsert_meeting_graph
-from app.services.llm_service import generate_meeting_chat_response
+from app.services.llm_service import (
+    build_chat_context_prefix,
+    generate_meeting_chat_response,
+    stream_meeting_chat_response,
+)
+from app.services.chat_cache import chat_context_key, get_chat_context_cache
+from app.services.chat_history import condense_chat_history, conversation_key
+from app.services.retrieval_service import retrieve_transcript_excerpts
+from app.services.audio_service import probe_duration
+from app.services.scheduling_service import completion_latency_stats, duration_lane
+from app.services.progress_service import is_terminal, progress_broadcaster
+from app.core.config import settings
+from app.core.metrics import UPLOAD_BYTES
 from kombu.exceptions import OperationalError
+from redis.exceptions import RedisError
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +97,27 @@ def list_meetings(
     return meetings
 
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _save_and_hash(source, path: str) -> str:
+    """Copies an upload to `path` in chunks and returns its SHA-256 hex digest."""
+    digest = hashlib.sha256()
+    with open(path, "wb") as buffer:
+        for chunk in iter(lambda: source.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            buffer.write(chunk)
+    return digest.hexdigest()
+
+
+def _discard_file(path: str) -> None:
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except OSError as e:
+        logger.warning(f"Failed to remove {path}: {e}")
+
+
 @router.post("/upload", response_model=schemas.MeetingResponse, status_code=202)
 def upload_meeting_file(
     file: UploadFile = File(...),
@@ -80,7 +125,8 @@ def upload_meeting_file(
 ):
     """
     Upload an audio/video file for processing.
-    The file is saved and a background task is triggered.
+    The file is saved and a background task is triggered; if the same
+    recording was already processed, that task reuses its results.
     """
     try:
         logger.info(f"Received upload request for file: {file.filename}")
@@ -100,6 +146,7 @@ def upload_meeting_file(
         file.file.seek(0)  # Reset to beginning
         
         logger.info(f"File size: {file_size} bytes")
+        UPLOAD_BYTES.inc(file_size)
         
         if file_size > MAX_FILE_SIZE:
             raise HTTPException(
@@ -109,26 +156,37 @@ def upload_meeting_file(
         
         # Generate a unique filename to avoid conflicts
         saved_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(UPLOAD_DIRECTORY, saved_filename)
-        
-        logger.info(f"Saving file to: {file_path}")
+        temp_path = os.path.join(UPLOAD_DIRECTORY, f".incoming-{saved_filename}")
 
-        # Save the uploaded file
+        logger.info(f"Saving file to: {temp_path}")
+
+        # Save the uploaded file, hashing it on the way to disk
         try:
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-                logger.info(f"File saved successfully: {file_path}")
+            content_hash = _save_and_hash(file.file, temp_path)
+            logger.info(f"File saved successfully: {temp_path} (sha256 {content_hash})")
         except Exception as e:
             logger.error(f"Failed to save file: {e}", exc_info=True)
+            _discard_file(temp_path)
             raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
 
+        # Stored by content, so concurrent uploads of one recording share a file
+        file_path = os.path.join(UPLOAD_DIRECTORY, f"{content_hash}{file_extension}")
+
+        # Probe the duration so pipeline tasks can be scheduled shortest-job-first
+        duration_seconds = probe_duration(temp_path)
+        logger.info(f"Probed duration: {duration_seconds}s ({duration_lane(duration_seconds)} lane)")
+
+        source = find_completed_duplicate(db, content_hash) if settings.UPLOAD_DEDUP_ENABLED else None
+
         # Create a new meeting record in the database
         try:
             new_meeting = models.Meeting(
                 original_filename=file.filename,
                 saved_filename=saved_filename,
                 file_path=file_path,
-                status=models.MeetingStatus.PENDING
+                content_hash=content_hash,
+                status=models.MeetingStatus.PENDING,
+                duration_seconds=duration_seconds,
             )
             db.add(new_meeting)
             db.commit()
@@ -137,17 +195,32 @@ def upload_meeting_file(
         except Exception as e:
             logger.error(f"Failed to create meeting record: {e}", exc_info=True)
             # Clean up saved file if database operation fails
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            _discard_file(temp_path)
             raise HTTPException(status_code=500, detail=f"Failed to create meeting record: {e}")
 
+        # Moved into place only now: a meeting finishing with the same content
+        # keeps the file once this meeting's row exists.
+        try:
+            os.replace(temp_path, file_path)
+        except Exception as e:
+            logger.error(f"Failed to store file {file_path}: {e}", exc_info=True)
+            _discard_file(temp_path)
+            new_meeting.status = models.MeetingStatus.FAILED
+            db.commit()
+            raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
+
         # Trigger the background processing task
         try:
-            logger.info(f"Queuing processing task for meeting {new_meeting.id}")
-            # Use delay() which should return immediately even if worker is not running
-            task_result = process_meeting_file.delay(str(new_meeting.id))
-            logger.info(f"Successfully queued processing task for meeting {new_meeting.id}, task_id: {task_result.id}")
-        except (OperationalError, ConnectionError) as e:
+            # Returns immediately even if no worker is running
+            if source is not None:
+                # The same recording was already processed: reuse its results
+                logger.info(f"Queuing clone of completed meeting {source.id} for meeting {new_meeting.id}")
+                task_id = enqueue_meeting_clone(str(new_meeting.id), str(source.id))
+            else:
+                logger.info(f"Queuing processing task for meeting {new_meeting.id}")
+                task_id = enqueue_meeting_processing(str(new_meeting.id))
+            logger.info(f"Successfully queued processing task for meeting {new_meeting.id}, task_id: {task_id}")
+        except (OperationalError, ConnectionError, RedisError) as e:
             logger.error(f"Failed to queue processing task (Redis/Celery error) for meeting {new_meeting.id}: {e}", exc_info=True)
             # Update meeting status to indicate task queue failure
             new_meeting.status = models.MeetingStatus.FAILED
@@ -175,6 +248,21 @@ def upload_meeting_file(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/stats/latency", response_model=schemas.LatencyStatsResponse)
+def get_completion_latency_stats(
+    days: Optional[float] = Query(7, gt=0, description="Only meetings completed in the last N days"),
+    db: Session = Depends(database.get_db),
+):
+    """
+    Upload-to-completion latency (p50/p95) per duration lane.
+    """
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    return schemas.LatencyStatsResponse(
+        window_days=days,
+        lanes=completion_latency_stats(db, since),
+    )
+
+
 @router.get("/{meeting_id}/graph", response_model=schemas.GraphContextResponse)
 def get_meeting_graph_context(
     meeting_id: uuid.UUID,
@@ -257,31 +345,154 @@ def get_meeting_status(
         message=f"Processing status for meeting {meeting.id} is {meeting.status.value}"
     )
 
-@router.get("/{meeting_id}", response_model=schemas.MeetingDetailsResponse)
-def get_meeting_details(
+@router.get("/{meeting_id}/stages", response_model=schemas.MeetingStagesResponse)
+def get_meeting_stages(
     meeting_id: uuid.UUID,
     db: Session = Depends(database.get_db)
 ):
     """
-    Retrieve the full details, transcript, and summary of a processed meeting.
+    Per-stage pipeline state: the latest run of each stage with its attempt count.
     """
     meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
-    return meeting
+    return schemas.MeetingStagesResponse(
+        meeting_id=meeting.id,
+        status=meeting.status,
+        stages=get_stage_states(db, str(meeting.id)),
+    )
 
 
-@router.post("/{meeting_id}/chat", response_model=schemas.MeetingChatResponse)
-def chat_about_meeting(
+@router.post("/{meeting_id}/resume", response_model=schemas.JobStatusResponse, status_code=202)
+def resume_meeting_processing(
     meeting_id: uuid.UUID,
-    payload: schemas.MeetingChatRequest,
-    db: Session = Depends(database.get_db),
+    force: bool = Query(False, description="Re-run every stage instead of skipping checkpointed ones"),
+    db: Session = Depends(database.get_db)
 ):
+    """
+    Re-queues the pipeline for a meeting. Stages with a completed checkpoint are
+    skipped unless `force` is set, which needs the uploaded file (409 when it
+    has been removed). A completed meeting can be resumed without `force` while
+    insight prompts that kept failing are stored as placeholders; only those
+    are regenerated.
+    """
     meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
+    if (
+        meeting.status == models.MeetingStatus.COMPLETED
+        and not force
+        and not failed_insight_keys(db, str(meeting.id))
+    ):
+        raise HTTPException(status_code=409, detail="Meeting already processed; pass force=true to reprocess")
+    # force re-runs preprocessing and transcription, which need the upload;
+    # it is removed once a meeting completes.
+    if (force or not meeting.transcript) and not (meeting.file_path and os.path.exists(meeting.file_path)):
+        raise HTTPException(status_code=409, detail="Uploaded file is no longer available to reprocess")
+
+    meeting.status = models.MeetingStatus.PENDING
+    db.commit()
+    try:
+        task_id = enqueue_meeting_processing(str(meeting.id), force=force)
+        logger.info(f"Queued resume of meeting {meeting.id} (force={force}), task_id: {task_id}")
+    except (OperationalError, ConnectionError, RedisError) as e:
+        logger.error(f"Failed to queue resume (Redis/Celery error) for meeting {meeting.id}: {e}", exc_info=True)
+        meeting.status = models.MeetingStatus.FAILED
+        db.commit()
+        raise HTTPException(
+            status_code=503,
+            detail=f"Failed to queue processing task. Please ensure Redis is running and Celery worker is started. Error: {str(e)}"
+        )
+
+    return schemas.JobStatusResponse(
+        meeting_id=meeting.id,
+        status=meeting.status,
+        message=f"Processing resumed for meeting {meeting.id}"
+    )
+
+
+def _event_stream_start(meeting_id: uuid.UUID, db: Session = Depends(database.get_db)) -> Dict[str, Any]:
+    # A sync dependency, so FastAPI runs the query in its threadpool instead of on the event loop.
+    meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return {
+        "meeting_key": str(meeting.id),
+        "status": meeting.status,
+        # Events published before the meeting's last update belong to an earlier run
+        "not_before": calendar.timegm(meeting.updated_at.timetuple()) if meeting.updated_at else 0,
+    }
+
+
+@router.get("/{meeting_id}/events")
+async def stream_meeting_events(start: Dict[str, Any] = Depends(_event_stream_start)):
+    """
+    Pipeline progress for a meeting, as server-sent events.
+
+    Emits a `status` event with the current meeting status, then a `progress`
+    event per stage update published by the worker (e.g. "Transcribing 40%",
+    "Generating insights 3/6"), and a final `status` event once the pipeline
+    completes or fails. Comment lines are sent as keepalives.
+    """
+    meeting_key, status, not_before = start["meeting_key"], start["status"], start["not_before"]
+
+    async def event_stream() -> AsyncIterator[str]:
+        yield _sse_event("status", {"meeting_id": meeting_key, "status": status.value})
+        if status in (models.MeetingStatus.COMPLETED, models.MeetingStatus.FAILED):
+            return
+
+        queue = progress_broadcaster.subscribe(meeting_key)
+        try:
+            # Subscribed first, so nothing published from here on is missed
+            event = await _current_progress(meeting_key, not_before)
+            while True:
+                if event is not None:
+                    yield _sse_event("progress", event)
+                    if is_terminal(event):
+                        final_status = "COMPLETED" if event["status"] == "completed" else "FAILED"
+                        yield _sse_event("status", {"meeting_id": meeting_key, "status": final_status})
+                        return
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.PROGRESS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    # Covers the end of the pipeline racing the subscription
+                    latest = await _current_progress(meeting_key, not_before)
+                    event = latest if latest is not None and is_terminal(latest) else None
+        finally:
+            progress_broadcaster.unsubscribe(meeting_key, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _current_progress(meeting_id: str, not_before: float) -> Optional[Dict[str, Any]]:
+    event = await progress_broadcaster.last_event(meeting_id)
+    if event is None or event.get("timestamp", 0) < not_before:
+        return None
+    return event
 
+
+@router.get("/{meeting_id}", response_model=schemas.MeetingDetailsResponse)
+def get_meeting_details(
+    meeting_id: uuid.UUID,
+    db: Session = Depends(database.get_db)
+):
+    """
+    Retrieve the full details, transcript, and summary of a processed meeting.
+    """
+    meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    return meeting
+
+
+def _load_chat_context(meeting: models.Meeting) -> Dict[str, Any]:
     context = fetch_meeting_context(str(meeting.id))
     if not context:
         try:
@@ -304,10 +515,9 @@ def chat_about_meeting(
             )
             context = fetch_meeting_context(str(meeting.id))
         except Exception as exc:
-            logger.error("Failed to sync meeting %s to graph: %s", meeting_id, exc, exc_info=True)
+            logger.error("Failed to sync meeting %s to graph: %s", meeting.id, exc, exc_info=True)
             context = {}
-    else:
-        context = context or {}
+    context = context or {}
 
     # Merge SQL context to ensure we have fallbacks
     context.setdefault("original_filename", meeting.original_filename)
@@ -333,11 +543,85 @@ def chat_about_meeting(
                 title_candidate = first_line.lstrip("#").strip()
         context["title"] = title_candidate or meeting.original_filename
 
+    return context
+
+
+def _chat_response_context(context: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": context.get("title"),
+        "tags": context.get("tags"),
+        "created_at": context.get("created_at"),
+        "topics": context.get("topics"),
+        "participants": context.get("participants"),
+        "decisions": context.get("decisions"),
+        "timeline": context.get("timeline"),
+    }
+
+
+def _get_compiled_chat_context(meeting: models.Meeting) -> Dict[str, Any]:
+    """
+    Returns {"prompt_prefix", "context"} for a meeting, compiling it from the graph
+    on a cache miss. `context` is the block returned to chat clients.
+    """
+    cache = get_chat_context_cache()
+    cache_key = chat_context_key(str(meeting.id), meeting.updated_at.isoformat() if meeting.updated_at else None)
+    if cache is not None:
+        compiled = cache.get(cache_key)
+        if compiled is not None:
+            return compiled
+
+    context = _load_chat_context(meeting)
+    compiled = {
+        "prompt_prefix": build_chat_context_prefix(context),
+        "context": _chat_response_context(context),
+    }
+    if cache is not None:
+        cache.put(cache_key, compiled)
+    return compiled
+
+
+def _condensed_history(meeting: models.Meeting, payload: schemas.MeetingChatRequest) -> List[Dict[str, str]]:
+    history = [msg.model_dump() for msg in payload.history] if payload.history else []
+    return condense_chat_history(history, conversation_key(str(meeting.id), payload.conversation_id, history))
+
+
+def _retrieve_excerpts(meeting: models.Meeting, question: str) -> List[Dict[str, Any]]:
+    if not meeting.transcript:
+        return []
+    version = meeting.updated_at.isoformat() if meeting.updated_at else None
+    return retrieve_transcript_excerpts(str(meeting.id), version, question)
+
+
+def _excerpt_sources(excerpts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {"start_time": excerpt.get("start_time"), "end_time": excerpt.get("end_time")}
+        for excerpt in excerpts
+    ]
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/{meeting_id}/chat", response_model=schemas.MeetingChatResponse)
+def chat_about_meeting(
+    meeting_id: uuid.UUID,
+    payload: schemas.MeetingChatRequest,
+    db: Session = Depends(database.get_db),
+):
+    meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    compiled = _get_compiled_chat_context(meeting)
+    excerpts = _retrieve_excerpts(meeting, payload.message)
+
     try:
         reply = generate_meeting_chat_response(
             question=payload.message,
-            meeting_context=context,
-            history=[msg.model_dump() for msg in payload.history] if payload.history else [],
+            prompt_prefix=compiled["prompt_prefix"],
+            history=_condensed_history(meeting, payload),
+            transcript_excerpts=excerpts,
         )
     except Exception as exc:
         logger.error("Failed to generate chat response for meeting %s: %s", meeting_id, exc, exc_info=True)
@@ -346,13 +630,57 @@ def chat_about_meeting(
     return schemas.MeetingChatResponse(
         meeting_id=meeting.id,
         reply=reply,
-        context={
-            "title": context.get("title"),
-            "tags": context.get("tags"),
-            "created_at": context.get("created_at"),
-            "topics": context.get("topics"),
-            "participants": context.get("participants"),
-            "decisions": context.get("decisions"),
-            "timeline": context.get("timeline"),
-        },
-    )
\ No newline at end of file
+        context=compiled["context"],
+        sources=_excerpt_sources(excerpts),
+    )
+
+
+@router.post("/{meeting_id}/chat/stream")
+def stream_chat_about_meeting(
+    meeting_id: uuid.UUID,
+    payload: schemas.MeetingChatRequest,
+    db: Session = Depends(database.get_db),
+):
+    """
+    Streaming variant of the chat endpoint, as server-sent events.
+
+    Emits a `token` event per generated fragment, then a `context` event with the
+    same context block and sources the JSON endpoint returns. Failures after the
+    headers are sent (history condensing, retrieval, generation) are reported as
+    an `error` event, since the 200 status has already been sent.
+    """
+    meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    compiled = _get_compiled_chat_context(meeting)
+    meeting_key = str(meeting.id)
+
+    def event_stream() -> Iterator[str]:
+        try:
+            # Condensing may call the LLM and retrieval embeds the question, so both
+            # run once the stream has started rather than delaying the response.
+            history = _condensed_history(meeting, payload)
+            excerpts = _retrieve_excerpts(meeting, payload.message)
+            for text in stream_meeting_chat_response(
+                question=payload.message,
+                prompt_prefix=compiled["prompt_prefix"],
+                history=history,
+                transcript_excerpts=excerpts,
+            ):
+                yield _sse_event("token", {"text": text})
+        except Exception as exc:
+            logger.error("Failed to stream chat response for meeting %s: %s", meeting_key, exc, exc_info=True)
+            yield _sse_event("error", {"detail": "Failed to generate chat response"})
+            return
+        yield _sse_event(
+            "context",
+            {"meeting_id": meeting_key, "context": compiled["context"], "sources": _excerpt_sources(excerpts)},
+        )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Stop reverse proxies from buffering the stream and delaying the first token
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
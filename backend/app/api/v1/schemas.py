@@ -2,7 +2,7 @@ import uuid
 from typing import List, Dict, Any, Optional, Literal
 from pydantic import BaseModel, Field
 from datetime import datetime
-from app.db.models import MeetingStatus
+from app.db.models import MeetingStatus, StageStatus
 
 class MeetingBase(BaseModel):
     original_filename: str
@@ -12,6 +12,8 @@ class MeetingResponse(MeetingBase):
     id: uuid.UUID
     status: MeetingStatus
     created_at: datetime
+    duration_seconds: Optional[float] = None
+    completed_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -22,6 +24,36 @@ class JobStatusResponse(BaseModel):
     message: str
 
 
+class MeetingStageState(BaseModel):
+    stage: str
+    status: StageStatus
+    queue: Optional[str] = None
+    attempts: int = 1
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class MeetingStagesResponse(BaseModel):
+    meeting_id: uuid.UUID
+    status: MeetingStatus
+    stages: List[MeetingStageState] = Field(default_factory=list)
+
+
+class LaneLatencyStats(BaseModel):
+    lane: str
+    count: int
+    p50_seconds: Optional[float] = None
+    p95_seconds: Optional[float] = None
+    mean_seconds: Optional[float] = None
+
+
+class LatencyStatsResponse(BaseModel):
+    window_days: Optional[float] = None
+    lanes: List[LaneLatencyStats] = Field(default_factory=list)
+
+
 class MeetingDetailsResponse(MeetingResponse):
     transcript: Optional[str] = None
     summary: Optional[str] = None
@@ -41,11 +73,15 @@ class ChatMessage(BaseModel):
 class MeetingChatRequest(BaseModel):
     message: str
     history: List[ChatMessage] = []
+    # Stable id for the conversation; lets older turns be summarized incrementally
+    conversation_id: Optional[str] = None
 
 class MeetingChatResponse(BaseModel):
     meeting_id: uuid.UUID
     reply: str
     context: Dict[str, Any]
+    # Timestamp ranges of the transcript excerpts the reply was grounded in
+    sources: List[Dict[str, Any]] = Field(default_factory=list)
 
 class GraphParticipant(BaseModel):
     id: Optional[str] = None
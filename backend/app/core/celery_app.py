@@ -1,9 +1,13 @@
 import os
 from celery import Celery
 from dotenv import load_dotenv
+from kombu import Queue
 
 load_dotenv()
 
+# Separator kombu's Redis transport puts between a queue name and its priority step
+PRIORITY_SEPARATOR = "\x06\x16"
+
 celery_broker_url = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 celery_result_backend = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
 
@@ -25,4 +29,29 @@ celery_app.conf.update(
     broker_connection_retry_on_startup=True,
     broker_connection_retry=True,
     broker_connection_max_retries=100,
+    # Each pipeline stage has its own queue so CPU-bound (ffmpeg) and I/O-bound
+    # (Deepgram, OpenAI, Neo4j) worker pools can be sized separately with -Q.
+    # Declaring every queue means a worker started without -Q still consumes all of them.
+    # Redis emulates priorities with one list per step; 0 is served first.
+    # Pipeline stages get a priority from the meeting's duration lane (see
+    # scheduling_service), anything else the middle step.
+    broker_transport_options={"priority_steps": list(range(10))},
+    task_default_priority=5,
+    task_default_queue="celery",
+    task_queues=[
+        Queue("celery"),
+        Queue("audio"),
+        Queue("transcription"),
+        Queue("llm"),
+        Queue("graph"),
+    ],
+    task_routes={
+        "pipeline.preprocess": {"queue": "audio"},
+        "pipeline.transcribe": {"queue": "transcription"},
+        "pipeline.insight": {"queue": "llm"},
+        "pipeline.persist": {"queue": "graph"},
+        "pipeline.graph_sync": {"queue": "graph"},
+        "pipeline.index_chunks": {"queue": "graph"},
+        "pipeline.clone": {"queue": "graph"},
+    },
 )
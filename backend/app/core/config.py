@@ -4,9 +4,79 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
+    REDIS_URL: str | None = None  # Application caches; defaults to CELERY_BROKER_URL
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 2.0
+    PIPELINE_EXECUTOR: str = "celery"  # "celery" (staged tasks) or "asyncio" (async_worker.py)
+    ASYNC_PIPELINE_MAX_MEETINGS: int = 24  # Meetings in flight per asyncio worker process
+    ASYNC_PIPELINE_CLAIM_TTL_SECONDS: int = 300  # Refreshed while running; a dead worker's meetings can be queued again after it
+    ASYNC_FFMPEG_CONCURRENCY: int = 2
+    ASYNC_DEEPGRAM_CONCURRENCY: int = 8
+    ASYNC_LLM_CONCURRENCY: int = 16
+    ASYNC_NEO4J_CONCURRENCY: int = 8
+    METRICS_WORKER_PORT: int = 9808  # Prometheus exporter of Celery/async workers; 0 disables
+    PROGRESS_EVENTS_ENABLED: bool = True  # Worker stage progress over Redis pub/sub
+    PROGRESS_KEEPALIVE_SECONDS: float = 15.0
+    PRIORITY_LANES_ENABLED: bool = True  # Shortest-job-first by probed media duration
+    PRIORITY_SHORT_MAX_MINUTES: float = 15.0
+    PRIORITY_MEDIUM_MAX_MINUTES: float = 45.0
+    PRIORITY_AGING_SECONDS: float = 600.0  # Each interval waited raises a meeting one priority step
+    PRIORITY_AGING_CHECK_SECONDS: float = 60.0  # How often workers re-prioritise tasks waiting on the broker
+    UPLOAD_DEDUP_ENABLED: bool = True  # Re-uploads of a completed recording reuse its results
     FFMPEG_PATH: str = "ffmpeg"  # Default to system ffmpeg if not specified
+    AUDIO_PREPROCESS_ENABLED: bool = True
+    AUDIO_PREPROCESS_CODEC: str = "opus"  # "opus" or "flac"
+    AUDIO_PREPROCESS_BITRATE: str = "24k"  # Opus only
+    AUDIO_PREPROCESS_SAMPLE_RATE: int = 16000
+    FFPROBE_PATH: str = "ffprobe"
+    TRANSCRIPTION_CHUNKING_ENABLED: bool = False
+    TRANSCRIPTION_CHUNK_MINUTES: float = 10.0
+    TRANSCRIPTION_CHUNK_CONCURRENCY: int = 4
+    TRANSCRIPTION_CHUNK_OVERLAP_SECONDS: float = 30.0
+    TRANSCRIPTION_CACHE_ENABLED: bool = True
+    TRANSCRIPTION_CACHE_DIR: str | None = None  # Defaults to backend/cache/transcriptions
+    TRANSCRIPTION_CACHE_MAX_MB: int = 1024
     DEEPGRAM_API_KEY: str
+    DEEPGRAM_POOL_SIZE: int = 10
+    DEEPGRAM_MAX_RETRIES: int = 3
+    DEEPGRAM_RETRY_BACKOFF_SECONDS: float = 2.0
+    DEEPGRAM_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    DEEPGRAM_READ_TIMEOUT_BASE_SECONDS: float = 60.0
+    DEEPGRAM_READ_TIMEOUT_PER_MINUTE_SECONDS: float = 3.0
+    DEEPGRAM_READ_TIMEOUT_MAX_SECONDS: float = 1800.0
+    DEEPGRAM_READ_TIMEOUT_FALLBACK_SECONDS: float = 300.0
     OPENAI_API_KEY: str
+    LLM_MODEL: str = "gpt-4o-mini"
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 120.0
+    LLM_HTTP_POOL_SIZE: int = 20
+    LLM_HTTP_KEEPALIVE_SECONDS: float = 120.0
+    LLM_MAX_RETRIES: int = 6
+    LLM_RATE_LIMIT_ENABLED: bool = True  # Shared across workers through Redis
+    LLM_RATE_LIMIT_RPM: int = 500
+    LLM_RATE_LIMIT_TPM: int = 200000
+    LLM_RATE_LIMIT_BURST_SECONDS: float = 15.0
+    LLM_RATE_LIMIT_COMPLETION_TOKENS: int = 800  # Reserved per call until real usage is known
+    LLM_RATE_LIMIT_MAX_WAIT_SECONDS: float = 600.0
+    EMBEDDING_RATE_LIMIT_RPM: int = 3000
+    EMBEDDING_RATE_LIMIT_TPM: int = 1000000
+    LLM_MAX_CONCURRENCY: int = 6
+    LLM_INSIGHTS_MODE: str = "per_prompt"  # "per_prompt" or "combined"
+    LLM_TRANSCRIPT_TOKEN_BUDGET: int = 30000  # Longer transcripts are map-reduced
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str | None = None  # Defaults to backend/cache/llm_responses.sqlite3
+    LLM_CACHE_TTL_HOURS: int = 24 * 30
+    LLM_CACHE_MAX_MB: int = 256
+    CHAT_CONTEXT_CACHE_ENABLED: bool = True
+    CHAT_CONTEXT_CACHE_BACKEND: str = "redis"  # "redis" or "memory"
+    CHAT_CONTEXT_CACHE_TTL_SECONDS: int = 24 * 3600
+    CHAT_CONTEXT_CACHE_MAX_ENTRIES: int = 256  # In-process LRU size
+    CHAT_HISTORY_RECENT_TURNS: int = 6  # Sent verbatim; older turns are summarized
+    CHAT_HISTORY_RECENT_TOKENS: int = 2000
+    CHAT_HISTORY_SUMMARY_TOKENS: int = 400
+    CHAT_HISTORY_SUMMARY_BATCH_TURNS: int = 4
+    CHAT_RETRIEVAL_ENABLED: bool = True
+    CHAT_RETRIEVAL_TOP_K: int = 4
+    CHAT_RETRIEVAL_CHUNK_TOKENS: int = 300
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
     NEO4J_URI: str | None = None
     NEO4J_USERNAME: str | None = None
     NEO4J_PASSWORD: str | None = None
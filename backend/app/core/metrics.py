@@ -0,0 +1,135 @@
+import logging
+
+import redis
+from prometheus_client import REGISTRY, Counter, Histogram, start_http_server
+from prometheus_client.core import GaugeMetricFamily
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets for long-running external calls (seconds)
+LONG_CALL_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600, 1200)
+
+DEEPGRAM_REQUEST_SECONDS = Histogram(
+    "deepgram_request_seconds",
+    "Wall-clock time of Deepgram transcription requests, including retries",
+    ["outcome"],
+    buckets=LONG_CALL_BUCKETS,
+)
+DEEPGRAM_RETRIES = Counter(
+    "deepgram_retries_total",
+    "Retries performed by the Deepgram HTTP retry policy",
+)
+DEEPGRAM_UPLOAD_BYTES = Counter(
+    "deepgram_upload_bytes_total",
+    "Audio bytes sent to Deepgram (cache hits excluded)",
+)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "pipeline_stage_seconds",
+    "Duration of recorded pipeline stages (insight stages are per prompt, e.g. insight:tags)",
+    ["stage", "queue", "status"],
+    buckets=LONG_CALL_BUCKETS,
+)
+AUDIO_PREPROCESS_BYTES = Counter(
+    "audio_preprocess_bytes_total",
+    "Bytes read from uploads and written as encoded speech audio",
+    ["direction"],
+)
+UPLOAD_BYTES = Counter(
+    "upload_bytes_total",
+    "Bytes of uploaded recordings received by the API",
+)
+
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_seconds",
+    "Time of LLM calls per prompt, including rate limiting and concurrency waits",
+    ["prompt", "outcome"],
+    buckets=LONG_CALL_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens used by LLM and embedding calls, as reported by the provider where available",
+    ["model", "kind"],
+)
+
+GRAPH_WRITE_SECONDS = Histogram(
+    "graph_write_seconds",
+    "Time of Neo4j write batches",
+    ["operation"],
+    buckets=LONG_CALL_BUCKETS,
+)
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by result; hit ratio = rate(result=hit) / rate(all)",
+    ["cache", "result"],
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+class QueueDepthCollector:
+    """
+    Reports pipeline queue depths at scrape time: the Celery queues (summed over
+    Redis priority steps) and the asyncio executor's queue. Reads are a couple
+    of Redis round trips per scrape; failures just omit the samples.
+    """
+
+    def __init__(self):
+        self._broker = None
+
+    def describe(self):
+        # Keeps registration from running a (Redis-reading) collection at import time.
+        yield self._family()
+
+    def collect(self):
+        from app.core.celery_app import PRIORITY_SEPARATOR, celery_app
+        from app.services.pipeline_queue import pipeline_queue_depth
+
+        depth = self._family()
+        try:
+            if celery_app.conf.broker_url.startswith(("redis://", "rediss://")):
+                queues = [queue.name for queue in celery_app.conf.task_queues]
+                steps = celery_app.conf.broker_transport_options.get("priority_steps") or [0]
+                if self._broker is None:
+                    self._broker = redis.Redis.from_url(
+                        celery_app.conf.broker_url, socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS
+                    )
+                pipe = self._broker.pipeline(transaction=False)
+                for name in queues:
+                    for step in steps:
+                        pipe.llen(f"{name}{PRIORITY_SEPARATOR}{step}" if step else name)
+                lengths = pipe.execute()
+                for index, name in enumerate(queues):
+                    depth.add_metric([name], sum(lengths[index * len(steps):(index + 1) * len(steps)]))
+            depth.add_metric(["asyncio"], pipeline_queue_depth())
+        except Exception as exc:
+            logger.debug("Could not read queue depths: %s", exc)
+        yield depth
+
+    @staticmethod
+    def _family() -> GaugeMetricFamily:
+        return GaugeMetricFamily("pipeline_queue_depth", "Tasks or meetings waiting per queue", labels=["queue"])
+
+
+REGISTRY.register(QueueDepthCollector())
+
+_exporter_port = None
+
+
+def start_metrics_exporter(port: int) -> None:
+    """Serves this process' metrics on `port` (once per process; 0 disables)."""
+    global _exporter_port
+    if not port or _exporter_port is not None:
+        return
+    try:
+        start_http_server(port)
+    except OSError as exc:
+        logger.warning("Could not start metrics exporter on port %s: %s", port, exc)
+        return
+    _exporter_port = port
+    logger.info("Serving Prometheus metrics on port %s", port)
@@ -0,0 +1,25 @@
+import logging
+from functools import lru_cache
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def redis_url() -> str:
+    return settings.REDIS_URL or settings.CELERY_BROKER_URL
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> redis.Redis:
+    """Shared Redis client for application caches; defaults to the Celery broker instance."""
+    url = redis_url()
+    logger.info("Initialising Redis client for %s", url)
+    return redis.Redis.from_url(
+        url,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        health_check_interval=30,
+    )
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, func, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Float, Integer, ForeignKey, func, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from .database import Base
 import enum
@@ -16,7 +16,8 @@ class Meeting(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     original_filename = Column(String, nullable=False)
     saved_filename = Column(String, unique=True, nullable=False)
-    file_path = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)  # Shared by uploads of the same content
+    content_hash = Column(String, nullable=True, index=True)  # SHA-256 of the uploaded file
     status = Column(SQLEnum(MeetingStatus), nullable=False, default=MeetingStatus.PENDING)
     
     transcript = Column(String, nullable=True)
@@ -26,5 +27,29 @@ class Meeting(Base):
     sentiment = Column(String, nullable=True)
     tags = Column(String, nullable=True) # To store comma-separated tags
     knowledge_graph = Column(String, nullable=True) # To store JSON as a string
+    duration_seconds = Column(Float, nullable=True) # Probed with ffprobe at upload
+    completed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class StageStatus(enum.Enum):
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+class MeetingStage(Base):
+    """One execution of a pipeline stage for a meeting, with its timing."""
+    __tablename__ = "meeting_stages"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    meeting_id = Column(UUID(as_uuid=True), ForeignKey("meetings.id"), nullable=False, index=True)
+    stage = Column(String, nullable=False)  # e.g. "preprocess", "transcribe", "insight:key_points", "persist"
+    queue = Column(String, nullable=True)
+    task_id = Column(String, nullable=True)
+    status = Column(SQLEnum(StageStatus), nullable=False, default=StageStatus.RUNNING)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    output = Column(String, nullable=True)  # JSON handed to later stages
+    error = Column(String, nullable=True)
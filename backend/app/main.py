@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.endpoints import meetings, search 
 from app.db import database, models
@@ -7,8 +7,10 @@ import subprocess
 import redis
 import logging
 from sqlalchemy import text
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.core.config import settings
 from app.services.graph_service import check_connection as check_neo4j_connection
+from app.services.llm_service import warm_llm_clients
 
 # Configure logging
 logging.basicConfig(
@@ -47,6 +49,10 @@ app.include_router(
     tags=["Search"]
 )
 
+@app.on_event("startup")
+def warm_clients():
+    warm_llm_clients()
+
 @app.get("/", tags=["Root"])
 def read_root():
     return {"message": "Welcome to the AI Meeting Intelligence Platform API"}
@@ -56,6 +62,11 @@ def health_check():
     """Basic health check endpoint"""
     return {"status": "healthy", "service": "ai-meeting-platform"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics of this API process (the workers export their own)"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/ready", tags=["Health"])
 def readiness_check():
     """Readiness check for dependencies"""
@@ -0,0 +1,254 @@
+import json
+import uuid
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import Meeting, MeetingStatus
+
+from . import audio_service
+from .transcription_service import (
+    atranscribe_audio_file,
+    atranscribe_audio_file_chunked,
+    merge_transcription_and_diarization,
+)
+from .llm_service import INSIGHT_PROMPTS, agenerate_meeting_insights, insight_placeholders
+from .graph_service import aupsert_meeting_graph
+from .retrieval_service import aindex_meeting_transcript
+from .chat_cache import invalidate_chat_context
+from .progress_service import publish_progress
+from .processing_service import (
+    PipelineTask,
+    _checkpointed_insights,
+    _chunk_index_is_stale,
+    _complete_meeting,
+    _get_meeting,
+    _graph_payload,
+    _graph_sync_is_stale,
+    _insight_batches,
+    _insight_stage_name,
+    _is_transcribed,
+    _record_preprocessed,
+    _persist_insights,
+    _publish_insight_progress,
+    _record_stage,
+    _remove_file,
+    _reusable_preprocess,
+    _transcription_audio,
+    clone_meeting_results,
+    encoded_audio_prefix,
+    mark_meeting_failed,
+)
+
+logger = logging.getLogger(__name__)
+
+# Same retry policy as the Celery stage tasks
+_MAX_RETRIES = PipelineTask.retry_kwargs["max_retries"]
+_RETRY_COUNTDOWN_SECONDS = PipelineTask.retry_kwargs["countdown"]
+
+
+async def run_meeting_pipeline(meeting_id: str, force: bool = False) -> None:
+    """
+    Runs the whole meeting pipeline as a coroutine, for async_worker.py.
+
+    Same stages, checkpoints and progress events as the Celery workflow, but
+    waiting on Deepgram, the LLM and Neo4j costs no thread: one process keeps
+    dozens of meetings in flight, bounded by the ASYNC_*_CONCURRENCY semaphore
+    of each dependency. FFmpeg runs in threads. SQLite writes stay synchronous,
+    as they are short and local. A failing stage is retried on its own like a
+    PipelineTask; once retries are exhausted the meeting is marked FAILED.
+
+    A session must not hold a pooled connection while a coroutine waits, or a few
+    dozen meetings exhaust the pool and block the loop: stage inputs are read
+    before `_record_stage`, whose commit releases the connection.
+    """
+    run_id = uuid.uuid4().hex
+    db: Session = SessionLocal()
+    try:
+        meeting = _get_meeting(db, meeting_id)
+        meeting.status = MeetingStatus.PROCESSING
+        db.commit()
+        logger.info(f"Starting async AI pipeline for meeting_id: {meeting_id}")
+
+        if force or not _is_transcribed(db, meeting_id):
+            await _with_retries(meeting_id, "preprocess", lambda: _preprocess(db, meeting, force))
+            audio = await _with_retries(meeting_id, "transcribe", lambda: _transcribe(db, meeting))
+            # Only removed once transcription succeeded, so a resume can reuse it.
+            if audio["encoded"]:
+                _remove_file(audio["path"], "encoded audio")
+        else:
+            logger.info(f"Transcript for meeting {meeting_id} already checkpointed; skipping transcription")
+        db.commit()
+
+        parts = await asyncio.gather(
+            *(_generate_insights_or_placeholders(meeting_id, run_id, keys, force) for keys in _insight_batches()),
+            return_exceptions=True,
+        )
+        insights: Dict[str, str] = {}
+        for part in parts:
+            # Every batch has settled (and checkpointed) before a failure is raised.
+            if isinstance(part, BaseException):
+                raise part
+            insights.update(part)
+        db.refresh(meeting)
+        _persist_insights(db, None, meeting, insights)
+
+        # Graph sync and chunk indexing are not fatal, as in the Celery workflow.
+        if force or _graph_sync_is_stale(db, meeting_id):
+            try:
+                payload = _graph_payload(meeting)
+                with _record_stage(db, None, meeting_id, "graph_sync"):
+                    await aupsert_meeting_graph(payload)
+                await asyncio.to_thread(invalidate_chat_context, meeting_id)
+                logger.info("Synced meeting %s to Neo4j graph", meeting_id)
+            except Exception as graph_exc:
+                logger.error("Failed to persist meeting %s to Neo4j graph: %s", meeting_id, graph_exc)
+
+        if settings.CHAT_RETRIEVAL_ENABLED and _chunk_index_is_stale(db, meeting_id):
+            try:
+                transcript = meeting.transcript
+                with _record_stage(db, None, meeting_id, "index_chunks"):
+                    await aindex_meeting_transcript(meeting_id, transcript)
+            except Exception as index_exc:
+                logger.error("Failed to index transcript chunks for meeting %s: %s", meeting_id, index_exc)
+
+        _complete_meeting(db, meeting)
+    except Exception as exc:
+        logger.error(f"Async pipeline failed for meeting {meeting_id}: {exc}")
+        mark_meeting_failed(meeting_id, exc)
+        raise
+    finally:
+        db.close()
+
+
+async def run_meeting_clone(meeting_id: str, source_meeting_id: str) -> None:
+    """Clones a completed meeting's results into a duplicate upload, for async_worker.py."""
+    try:
+        await _with_retries(
+            meeting_id, "clone", lambda: asyncio.to_thread(_clone_meeting, meeting_id, source_meeting_id)
+        )
+    except Exception as exc:
+        logger.error(f"Clone of meeting {source_meeting_id} into {meeting_id} failed: {exc}")
+        mark_meeting_failed(meeting_id, exc)
+        raise
+
+
+async def run_meeting_indexing(meeting_id: str) -> None:
+    """Rebuilds a meeting's transcript chunk index, for async_worker.py (the index_chunks task)."""
+    db: Session = SessionLocal()
+    try:
+        transcript = _get_meeting(db, meeting_id).transcript
+
+        async def _index() -> None:
+            with _record_stage(db, None, meeting_id, "index_chunks"):
+                await aindex_meeting_transcript(meeting_id, transcript)
+
+        await _with_retries(meeting_id, "index_chunks", _index)
+    except Exception as exc:
+        # The meeting's results are unaffected; chat keeps its lexical fallback.
+        logger.error("Failed to index transcript chunks for meeting %s: %s", meeting_id, exc)
+        raise
+    finally:
+        db.close()
+
+
+def _clone_meeting(meeting_id: str, source_meeting_id: str) -> None:
+    # In a thread: a clone is only short SQL and Neo4j writes, with no LLM or Deepgram waits.
+    db: Session = SessionLocal()
+    try:
+        meeting = _get_meeting(db, meeting_id)
+        source = _get_meeting(db, source_meeting_id)
+        meeting.status = MeetingStatus.PROCESSING
+        db.commit()
+        clone_meeting_results(db, None, meeting, source)
+    finally:
+        db.close()
+
+
+async def _with_retries(meeting_id: str, stage: str, run: Callable[[], Awaitable[Any]]) -> Any:
+    for attempt in range(_MAX_RETRIES + 1):
+        try:
+            return await run()
+        except ValueError:
+            raise
+        except Exception as exc:
+            if attempt == _MAX_RETRIES:
+                raise
+            logger.warning(
+                f"Stage {stage} failed for meeting {meeting_id} ({exc}); "
+                f"retry {attempt + 1}/{_MAX_RETRIES} in {_RETRY_COUNTDOWN_SECONDS}s"
+            )
+            await asyncio.sleep(_RETRY_COUNTDOWN_SECONDS)
+
+
+async def _preprocess(db: Session, meeting: Meeting, force: bool) -> None:
+    meeting_id = str(meeting.id)
+    file_path, output_prefix = meeting.file_path, encoded_audio_prefix(meeting)
+    if _reusable_preprocess(db, meeting_id, force):
+        return
+    with _record_stage(db, None, meeting_id, "preprocess") as stage:
+        audio = await audio_service.run_bounded(audio_service.preprocess_audio, file_path, output_prefix)
+        _record_preprocessed(meeting_id, audio)
+        stage.output = json.dumps(audio)
+
+
+async def _transcribe(db: Session, meeting: Meeting) -> Dict[str, Any]:
+    """Transcribes the preprocessed audio (or the upload) and returns the audio used."""
+    meeting_id = str(meeting.id)
+    audio = _transcription_audio(db, meeting)
+    with _record_stage(db, None, meeting_id, "transcribe"):
+        if settings.TRANSCRIPTION_CHUNKING_ENABLED:
+            word_table = await atranscribe_audio_file_chunked(
+                audio["path"],
+                on_progress=lambda done, total: publish_progress(meeting_id, "transcribe", "running", done / total),
+            )
+        else:
+            word_table = await atranscribe_audio_file(audio["path"])
+        meeting.transcript = merge_transcription_and_diarization(word_table)
+        db.commit()
+        logger.info(f"Successfully created speaker-labeled transcript for meeting {meeting_id}")
+    return audio
+
+
+async def _generate_insights_or_placeholders(
+    meeting_id: str, run_id: str, keys: List[str], force: bool
+) -> Dict[str, str]:
+    try:
+        return await _with_retries(meeting_id, "insights", lambda: _generate_insights(meeting_id, run_id, keys, force))
+    except ValueError:
+        raise
+    except Exception as exc:
+        # As in the Celery workflow: the stage stays FAILED (a resume regenerates
+        # it) and the meeting completes with placeholders.
+        logger.error(f"Giving up on insights {', '.join(keys)} for meeting {meeting_id}: {exc}")
+        _publish_insight_progress(meeting_id, run_id, keys)
+        return insight_placeholders(keys, exc)
+
+
+async def _generate_insights(meeting_id: str, run_id: str, keys: List[str], force: bool) -> Dict[str, str]:
+    # Insight batches run concurrently, so each records its stage in its own session.
+    db: Session = SessionLocal()
+    try:
+        transcript = _get_meeting(db, meeting_id).transcript
+        if not force:
+            checkpoint = _checkpointed_insights(db, meeting_id)
+            if all(key in checkpoint for key in keys):
+                logger.info(f"Reusing checkpointed insights {', '.join(keys)} for meeting {meeting_id}")
+                _publish_insight_progress(meeting_id, run_id, keys)
+                return {key: checkpoint[key] for key in keys}
+
+        with _record_stage(db, None, meeting_id, _insight_stage_name(keys)) as stage:
+            logger.info(f"Generating AI insights {', '.join(keys)} for meeting {meeting_id}")
+            if len(keys) == len(INSIGHT_PROMPTS):
+                insights = await agenerate_meeting_insights(transcript)
+            else:
+                insights = await agenerate_meeting_insights(transcript, keys=keys)
+            stage.output = json.dumps(insights)
+        _publish_insight_progress(meeting_id, run_id, keys)
+        return insights
+    finally:
+        db.close()
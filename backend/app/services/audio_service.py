@@ -0,0 +1,263 @@
+import os
+import re
+import time
+import asyncio
+import logging
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Codec -> (ffmpeg encoder args, container format, file extension)
+_CODECS = {
+    "opus": (["-c:a", "libopus", "-application", "voip"], "ogg", ".ogg"),
+    "flac": (["-c:a", "flac"], "flac", ".flac"),
+}
+
+_READ_CHUNK_SIZE = 1024 * 1024
+
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[0-9.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[0-9.]+)")
+
+# Caps concurrent ffmpeg/ffprobe processes started from the asyncio pipeline.
+_ASYNC_FFMPEG_SLOTS = asyncio.Semaphore(max(1, settings.ASYNC_FFMPEG_CONCURRENCY))
+
+
+class AudioPreprocessingError(Exception):
+    pass
+
+
+def _resolve_codec() -> Optional[str]:
+    codec = settings.AUDIO_PREPROCESS_CODEC.lower()
+    if codec not in _CODECS:
+        logger.warning("Unsupported AUDIO_PREPROCESS_CODEC '%s'", codec)
+        return None
+    return codec
+
+
+def _build_encode_command(
+    input_file_path: str,
+    codec: str,
+    output: str = "pipe:1",
+    start: Optional[float] = None,
+    duration: Optional[float] = None,
+) -> List[str]:
+    encoder_args, container, _ = _CODECS[codec]
+    command = [
+        settings.FFMPEG_PATH,
+        "-hide_banner",
+        "-loglevel", "error",
+        "-nostdin",
+    ]
+    if start is not None:
+        command += ["-ss", f"{start:.3f}"]
+    command += ["-i", input_file_path]
+    if duration is not None:
+        command += ["-t", f"{duration:.3f}"]
+    command += [
+        "-vn",  # drop any video track
+        "-ac", "1",  # downmix to mono
+        "-ar", str(settings.AUDIO_PREPROCESS_SAMPLE_RATE),
+        *encoder_args,
+        # Deterministic output (no random Ogg serials or encoder tags) so the same
+        # upload always produces the same bytes and hits the transcription cache.
+        "-fflags", "+bitexact",
+        "-flags:a", "+bitexact",
+    ]
+    if codec == "opus":
+        command += ["-b:a", settings.AUDIO_PREPROCESS_BITRATE]
+    command += ["-f", container, output]
+    return command
+
+
+def preprocess_audio(input_file_path: str, output_prefix: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Strips video and re-encodes a recording to mono speech audio with FFmpeg.
+
+    FFmpeg writes the encoded stream to a pipe which is drained in chunks into a
+    sibling file (`output_prefix`.transcode.<ext>, by default named after the
+    input), so neither the input nor the output is ever held in memory.
+
+    Returns a dict with:
+    - path: file to send for transcription (the original if encoding did not help)
+    - encoded: whether `path` is a new file created by this call
+    - input_bytes / output_bytes / encode_seconds / codec
+    """
+    input_bytes = os.path.getsize(input_file_path)
+    stats: Dict[str, Any] = {
+        "path": input_file_path,
+        "encoded": False,
+        "input_bytes": input_bytes,
+        "output_bytes": input_bytes,
+        "encode_seconds": 0.0,
+        "codec": None,
+    }
+
+    if not settings.AUDIO_PREPROCESS_ENABLED:
+        return stats
+
+    codec = _resolve_codec()
+    if not codec:
+        return stats
+
+    output_path = f"{output_prefix or os.path.splitext(input_file_path)[0]}.transcode{_CODECS[codec][2]}"
+    command = _build_encode_command(input_file_path, codec)
+
+    started = time.perf_counter()
+    try:
+        output_bytes = 0
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+            with open(output_path, "wb") as output_file:
+                while True:
+                    chunk = proc.stdout.read(_READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    output_file.write(chunk)
+                    output_bytes += len(chunk)
+            stderr = proc.stderr.read().decode("utf-8", errors="replace").strip()
+            returncode = proc.wait()
+        if returncode != 0:
+            raise AudioPreprocessingError(f"ffmpeg exited with code {returncode}: {stderr}")
+        if output_bytes == 0:
+            raise AudioPreprocessingError("ffmpeg produced no audio output")
+    except Exception as exc:
+        logger.warning("Audio preprocessing failed for %s, sending original file: %s", input_file_path, exc)
+        _remove_quietly(output_path)
+        return stats
+
+    encode_seconds = time.perf_counter() - started
+
+    if output_bytes >= input_bytes:
+        logger.info(
+            "Encoded audio (%d bytes) is not smaller than the original (%d bytes); sending original file",
+            output_bytes,
+            input_bytes,
+        )
+        _remove_quietly(output_path)
+        stats["encode_seconds"] = encode_seconds
+        return stats
+
+    stats.update(
+        path=output_path,
+        encoded=True,
+        output_bytes=output_bytes,
+        encode_seconds=encode_seconds,
+        codec=codec,
+    )
+    return stats
+
+
+def probe_duration(input_file_path: str) -> Optional[float]:
+    """Returns the media duration in seconds using ffprobe, or None if it cannot be determined."""
+    command = [
+        settings.FFPROBE_PATH,
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        input_file_path,
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, check=True, timeout=30)
+        return float(result.stdout.decode().strip())
+    except Exception as exc:
+        logger.warning("Could not probe duration of %s: %s", input_file_path, exc)
+        return None
+
+
+def detect_silences(
+    input_file_path: str,
+    noise_db: float = -35.0,
+    min_silence_seconds: float = 0.5,
+) -> List[Tuple[float, float]]:
+    """Returns (start, end) pairs of silent stretches found by FFmpeg's silencedetect filter."""
+    command = [
+        settings.FFMPEG_PATH,
+        "-hide_banner",
+        "-nostdin",
+        "-i", input_file_path,
+        "-vn",
+        "-af", f"silencedetect=noise={noise_db}dB:d={min_silence_seconds}",
+        "-f", "null",
+        "-",
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, check=True)
+    except Exception as exc:
+        logger.warning("Silence detection failed for %s: %s", input_file_path, exc)
+        return []
+
+    silences: List[Tuple[float, float]] = []
+    pending_start: Optional[float] = None
+    for line in result.stderr.decode("utf-8", errors="replace").splitlines():
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            pending_start = max(float(start_match.group(1)), 0.0)
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and pending_start is not None:
+            silences.append((pending_start, float(end_match.group(1))))
+            pending_start = None
+    return silences
+
+
+def plan_segments(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    target_seconds: float,
+) -> List[Tuple[float, float]]:
+    """
+    Splits [0, duration] into consecutive segments of roughly `target_seconds`.
+
+    Each cut is placed at the middle of the silence closest to the ideal cut point
+    (searching a quarter of a segment either side); without a nearby silence the
+    cut falls exactly on the ideal point.
+    """
+    if duration <= target_seconds:
+        return [(0.0, duration)]
+
+    window = target_seconds / 4
+    midpoints = [(start + end) / 2 for start, end in silences]
+    cuts: List[float] = []
+    previous = 0.0
+    while duration - previous > target_seconds + window:
+        ideal = previous + target_seconds
+        candidates = [point for point in midpoints if abs(point - ideal) <= window and point > previous]
+        cut = min(candidates, key=lambda point: abs(point - ideal)) if candidates else ideal
+        cuts.append(cut)
+        previous = cut
+
+    boundaries = [0.0, *cuts, duration]
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def extract_segment(input_file_path: str, start: float, duration: float, output_path: str) -> str:
+    """Encodes [start, start + duration) of a recording into `output_path` using the preprocessing codec."""
+    codec = _resolve_codec() or "flac"
+    command = _build_encode_command(input_file_path, codec, output=output_path, start=start, duration=duration)
+    result = subprocess.run(command, capture_output=True)
+    if result.returncode != 0:
+        raise AudioPreprocessingError(
+            f"ffmpeg failed to extract segment {start:.1f}s+{duration:.1f}s: "
+            f"{result.stderr.decode('utf-8', errors='replace').strip()}"
+        )
+    return output_path
+
+
+async def run_bounded(func, *args, **kwargs):
+    """Runs one of the blocking ffmpeg helpers above in a thread, bounded by ASYNC_FFMPEG_CONCURRENCY."""
+    async with _ASYNC_FFMPEG_SLOTS:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+def segment_extension() -> str:
+    return _CODECS[_resolve_codec() or "flac"][2]
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        if path and os.path.exists(path):
+            os.remove(path)
+    except OSError as exc:
+        logger.warning("Failed to remove %s: %s", path, exc)
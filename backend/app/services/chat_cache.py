@@ -0,0 +1,151 @@
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class ChatCache:
+    """
+    JSON cache for chat state, namespaced by `namespace`.
+
+    Entries live in Redis so every API process shares them and the Celery worker
+    can invalidate them; if Redis is unreachable the cache falls back to an
+    in-process LRU with the same TTL.
+    """
+
+    def __init__(self, namespace: str, backend: str, ttl_seconds: int, max_entries: int):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        key = f"{self.namespace}:{name}"
+        entry = self._redis_get(key) if self.backend == "redis" else None
+        if entry is None:
+            entry = self._local_get(key)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        record_cache_lookup(self.namespace, entry is not None)
+        return entry
+
+    def put(self, name: str, entry: Dict[str, Any]) -> None:
+        key = f"{self.namespace}:{name}"
+        if self.backend == "redis" and self._redis_put(key, entry):
+            return
+        self._local_put(key, entry)
+
+    def invalidate(self, name_prefix: str) -> None:
+        prefix = f"{self.namespace}:{name_prefix}"
+        with self._lock:
+            for key in [key for key in self._local if key.startswith(prefix)]:
+                del self._local[key]
+        if self.backend != "redis":
+            return
+        try:
+            client = get_redis()
+            stale_keys = list(client.scan_iter(match=f"{prefix}*", count=100))
+            if stale_keys:
+                client.delete(*stale_keys)
+        except Exception as exc:
+            logger.warning("Failed to invalidate %s cache entries for %s: %s", self.namespace, name_prefix, exc)
+
+    def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = get_redis().get(key)
+        except Exception as exc:
+            logger.warning("Chat cache lookup failed, using in-process cache: %s", exc)
+            return None
+        return json.loads(raw) if raw else None
+
+    def _redis_put(self, key: str, entry: Dict[str, Any]) -> bool:
+        try:
+            get_redis().set(key, json.dumps(entry, default=str), ex=self.ttl_seconds)
+            return True
+        except Exception as exc:
+            logger.warning("Chat cache write failed, using in-process cache: %s", exc)
+            return False
+
+    def _local_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = self._local.get(key)
+            if cached is None:
+                return None
+            stored_at, entry = cached
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry
+
+    def _local_put(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic(), entry)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def chat_context_key(meeting_id: str, version: Optional[str]) -> str:
+    # Including the meeting's updated_at means an entry never outlives the SQL row it was built from.
+    return f"{meeting_id}:{version or '-'}"
+
+
+@lru_cache(maxsize=1)
+def get_chat_context_cache() -> Optional[ChatCache]:
+    """Per-meeting compiled chat context: the rendered prompt prefix plus the client context block."""
+    if not settings.CHAT_CONTEXT_CACHE_ENABLED:
+        return None
+    backend = settings.CHAT_CONTEXT_CACHE_BACKEND
+    logger.info("Using %s chat context cache", backend)
+    return ChatCache(
+        "chat:context",
+        backend,
+        settings.CHAT_CONTEXT_CACHE_TTL_SECONDS,
+        settings.CHAT_CONTEXT_CACHE_MAX_ENTRIES,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_chat_summary_cache() -> Optional[ChatCache]:
+    """Per-conversation rolling summaries of older chat turns."""
+    if not settings.CHAT_CONTEXT_CACHE_ENABLED:
+        return None
+    return ChatCache(
+        "chat:summary",
+        settings.CHAT_CONTEXT_CACHE_BACKEND,
+        settings.CHAT_CONTEXT_CACHE_TTL_SECONDS,
+        settings.CHAT_CONTEXT_CACHE_MAX_ENTRIES,
+    )
+
+
+def invalidate_chat_context(meeting_id: str) -> None:
+    cache = get_chat_context_cache()
+    if cache is not None:
+        cache.invalidate(f"{meeting_id}:")
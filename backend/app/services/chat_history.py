@@ -0,0 +1,101 @@
+import json
+import hashlib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from .chat_cache import get_chat_summary_cache
+from .llm_service import summarize_chat_turns
+from .tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Rendered as "Summary of earlier conversation: ..." by _format_chat_history
+SUMMARY_ROLE = "summary of earlier conversation"
+
+
+def conversation_key(meeting_id: str, conversation_id: Optional[str], history: List[Dict[str, str]]) -> Optional[str]:
+    """
+    Identifies a conversation for the summary cache.
+
+    Clients should send a `conversation_id`; without one the conversation is
+    identified by its opening turn, which stays fixed as the history grows.
+    """
+    if conversation_id:
+        return f"{meeting_id}:{conversation_id}"
+    if not history:
+        return None
+    opening = json.dumps(history[0], sort_keys=True)
+    return f"{meeting_id}:{hashlib.sha256(opening.encode('utf-8')).hexdigest()[:16]}"
+
+
+def condense_chat_history(history: List[Dict[str, str]], key: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Bounds the chat history sent to the model.
+
+    The most recent turns (at most CHAT_HISTORY_RECENT_TURNS, within
+    CHAT_HISTORY_RECENT_TOKENS) are kept verbatim. Older turns are folded into a
+    rolling summary in batches of CHAT_HISTORY_SUMMARY_BATCH_TURNS; the summary is
+    cached under `key`, so each fold only summarizes turns not seen before.
+    """
+    turns = [turn for turn in history or [] if (turn.get("content") or "").strip()]
+    recent_count = _recent_turn_count(turns)
+    older = turns[: len(turns) - recent_count]
+    recent = turns[len(turns) - recent_count:]
+    if not older:
+        return recent
+
+    summary, folded = _cached_summary(key, older)
+    pending = older[folded:]
+    if len(pending) >= settings.CHAT_HISTORY_SUMMARY_BATCH_TURNS or _turn_tokens(pending) > settings.CHAT_HISTORY_RECENT_TOKENS:
+        try:
+            summary = summarize_chat_turns(summary, pending, settings.CHAT_HISTORY_SUMMARY_TOKENS)
+            folded = len(older)
+            pending = []
+            _store_summary(key, older, summary)
+        except Exception as exc:
+            # Keep the turns verbatim this time; the next turn retries the fold.
+            logger.warning("Failed to summarize chat history, sending older turns verbatim: %s", exc)
+
+    condensed = [{"role": SUMMARY_ROLE, "content": summary}] if summary else []
+    return condensed + pending + recent
+
+
+def _recent_turn_count(turns: List[Dict[str, str]]) -> int:
+    count = 0
+    tokens = 0
+    for turn in reversed(turns[-settings.CHAT_HISTORY_RECENT_TURNS:]):
+        tokens += count_tokens(turn["content"])
+        # The latest turn is always kept, however long it is.
+        if count and tokens > settings.CHAT_HISTORY_RECENT_TOKENS:
+            break
+        count += 1
+    return count
+
+
+def _turn_tokens(turns: List[Dict[str, str]]) -> int:
+    return sum(count_tokens(turn["content"]) for turn in turns)
+
+
+def _fingerprint(turns: List[Dict[str, str]]) -> str:
+    material = json.dumps([[turn.get("role"), turn.get("content")] for turn in turns])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _cached_summary(key: Optional[str], older: List[Dict[str, str]]) -> Tuple[str, int]:
+    """Returns (summary, number of leading `older` turns it covers)."""
+    cache = get_chat_summary_cache() if key else None
+    entry = cache.get(key) if cache is not None else None
+    if not entry:
+        return "", 0
+    folded = entry.get("folded", 0)
+    # A client may edit or truncate its history; only reuse a summary of the exact same turns.
+    if folded > len(older) or entry.get("fingerprint") != _fingerprint(older[:folded]):
+        return "", 0
+    return entry.get("summary", ""), folded
+
+
+def _store_summary(key: Optional[str], older: List[Dict[str, str]], summary: str) -> None:
+    cache = get_chat_summary_cache() if key else None
+    if cache is not None:
+        cache.put(key, {"summary": summary, "folded": len(older), "fingerprint": _fingerprint(older)})
@@ -1,13 +1,16 @@
 import json
+import time
+import asyncio
 import logging
 import re
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from neo4j import GraphDatabase, basic_auth, Driver
+from neo4j import AsyncDriver, AsyncGraphDatabase, GraphDatabase, basic_auth, Driver
 from neo4j.exceptions import Neo4jError
 
 from app.core.config import settings
+from app.core.metrics import GRAPH_WRITE_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -16,17 +19,37 @@ class Neo4jNotConfigured(Exception):
     pass
 
 
+# Caps concurrent graph writes from the asyncio pipeline.
+_ASYNC_WRITE_SLOTS = asyncio.Semaphore(max(1, settings.ASYNC_NEO4J_CONCURRENCY))
+
+
+def _auth():
+    if settings.NEO4J_USERNAME and settings.NEO4J_PASSWORD:
+        return basic_auth(settings.NEO4J_USERNAME, settings.NEO4J_PASSWORD)
+    return None
+
+
 @lru_cache(maxsize=1)
 def _get_driver() -> Driver:
     if not settings.NEO4J_URI:
         raise Neo4jNotConfigured("NEO4J_URI is not configured")
 
-    auth = None
-    if settings.NEO4J_USERNAME and settings.NEO4J_PASSWORD:
-        auth = basic_auth(settings.NEO4J_USERNAME, settings.NEO4J_PASSWORD)
-
     logger.info("Initialising Neo4j driver for %s", settings.NEO4J_URI)
-    return GraphDatabase.driver(settings.NEO4J_URI, auth=auth)
+    return GraphDatabase.driver(settings.NEO4J_URI, auth=_auth())
+
+
+@lru_cache(maxsize=1)
+def _get_async_driver() -> AsyncDriver:
+    # Created on first use inside the asyncio worker's event loop.
+    if not settings.NEO4J_URI:
+        raise Neo4jNotConfigured("NEO4J_URI is not configured")
+
+    logger.info("Initialising async Neo4j driver for %s", settings.NEO4J_URI)
+    return AsyncGraphDatabase.driver(
+        settings.NEO4J_URI,
+        auth=_auth(),
+        max_connection_pool_size=max(1, settings.ASYNC_NEO4J_CONCURRENCY),
+    )
 
 
 def close_driver():
@@ -215,21 +238,12 @@ def _parse_knowledge_graph(raw_kg: Optional[str]) -> Dict[str, List[Dict[str, An
         return default
 
 
-def upsert_meeting_graph(meeting: Dict[str, Any]) -> None:
+def _meeting_graph_statements(meeting: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
     """
-    Persist meeting level data to Neo4j.
-
-    meeting dict should contain:
-        - id
-        - original_filename
-        - created_at / updated_at
-        - summary, key_points, action_items, sentiment, tags, transcript, knowledge_graph
+    The (cypher, parameters) writes that persist a meeting, in order. Shared by
+    the sync and async drivers; each statement runs in its own write transaction.
     """
-    try:
-        driver = _get_driver()
-    except Neo4jNotConfigured:
-        logger.info("Neo4j not configured - skipping graph persistence for meeting %s", meeting.get("id"))
-        return
+    statements: List[Tuple[str, Dict[str, Any]]] = []
 
     tags = _parse_tags(meeting.get("tags"))
     key_points = _parse_markdown_sections(meeting.get("key_points"))
@@ -286,208 +300,256 @@ def upsert_meeting_graph(meeting: Dict[str, Any]) -> None:
     }
     """
 
-    with driver.session(database=settings.NEO4J_DATABASE) as session:
-        session.execute_write(lambda tx: tx.run(cypher, **payload))
-
-        if tags:
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    MATCH (m:Meeting {id: $meeting_id})-[rel:HAS_TAG]->(:Tag)
-                    DELETE rel
-                    """,
-                    meeting_id=meeting["id"],
-                )
+    statements.append((cypher, payload))
+
+    if tags:
+        statements.append(
+            (
+                """
+                MATCH (m:Meeting {id: $meeting_id})-[rel:HAS_TAG]->(:Tag)
+                DELETE rel
+                """,
+                {"meeting_id": meeting["id"]},
             )
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    UNWIND $tags AS tag
-                    MERGE (t:Tag {name: tag})
-                    MERGE (m:Meeting {id: $meeting_id})
-                    MERGE (m)-[:HAS_TAG]->(t)
-                    """,
-                    tags=tags,
-                    meeting_id=meeting["id"],
-                )
+        )
+        statements.append(
+            (
+                """
+                UNWIND $tags AS tag
+                MERGE (t:Tag {name: tag})
+                MERGE (m:Meeting {id: $meeting_id})
+                MERGE (m)-[:HAS_TAG]->(t)
+                """,
+                {"tags": tags, "meeting_id": meeting["id"]},
             )
+        )
 
-        if key_points:
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    MATCH (m:Meeting {id: $meeting_id})
-                    MERGE (c:InsightCollection {meeting_id: $meeting_id, type: 'KEY_POINTS'})
-                    MERGE (m)-[:HAS_INSIGHTS]->(c)
-                    WITH c, $items AS items
-                    FOREACH (item IN items |
-                        MERGE (kp:Insight {meeting_id: $meeting_id, type: 'KEY_POINT', title: item.title})
-                        SET kp.details = item.details
-                        MERGE (c)-[:INCLUDES]->(kp)
-                    )
-                    """,
-                    meeting_id=meeting["id"],
-                    items=key_points,
+    if key_points:
+        statements.append(
+            (
+                """
+                MATCH (m:Meeting {id: $meeting_id})
+                MERGE (c:InsightCollection {meeting_id: $meeting_id, type: 'KEY_POINTS'})
+                MERGE (m)-[:HAS_INSIGHTS]->(c)
+                WITH c, $items AS items
+                FOREACH (item IN items |
+                    MERGE (kp:Insight {meeting_id: $meeting_id, type: 'KEY_POINT', title: item.title})
+                    SET kp.details = item.details
+                    MERGE (c)-[:INCLUDES]->(kp)
                 )
+                """,
+                {"meeting_id": meeting["id"], "items": key_points},
             )
+        )
 
-        if action_items:
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    MATCH (m:Meeting {id: $meeting_id})
-                    MERGE (c:InsightCollection {meeting_id: $meeting_id, type: 'ACTION_ITEMS'})
-                    MERGE (m)-[:HAS_INSIGHTS]->(c)
-                    WITH c, $items AS items
-                    FOREACH (item IN items |
-                        MERGE (ai:Insight {meeting_id: $meeting_id, type: 'ACTION_ITEM', title: item.title})
-                        SET ai.details = item.details
-                        MERGE (c)-[:INCLUDES]->(ai)
-                    )
-                    """,
-                    meeting_id=meeting["id"],
-                    items=action_items,
+    if action_items:
+        statements.append(
+            (
+                """
+                MATCH (m:Meeting {id: $meeting_id})
+                MERGE (c:InsightCollection {meeting_id: $meeting_id, type: 'ACTION_ITEMS'})
+                MERGE (m)-[:HAS_INSIGHTS]->(c)
+                WITH c, $items AS items
+                FOREACH (item IN items |
+                    MERGE (ai:Insight {meeting_id: $meeting_id, type: 'ACTION_ITEM', title: item.title})
+                    SET ai.details = item.details
+                    MERGE (c)-[:INCLUDES]->(ai)
                 )
+                """,
+                {"meeting_id": meeting["id"], "items": action_items},
             )
+        )
+
+    # Clear existing participant/decision/timeline subgraphs to avoid duplication
+    statements.append(
+        (
+            """
+            MATCH (m:Meeting {id: $meeting_id})
+            OPTIONAL MATCH (m)-[r:HAS_PARTICIPANT]->(p:Participant)
+            DETACH DELETE p
+            """,
+            {"meeting_id": meeting["id"]},
+        )
+    )
+    statements.append(
+        (
+            """
+            MATCH (m:Meeting {id: $meeting_id})
+            OPTIONAL MATCH (m)-[r:HAS_DECISION]->(d:Decision)
+            DETACH DELETE d
+            """,
+            {"meeting_id": meeting["id"]},
+        )
+    )
+    statements.append(
+        (
+            """
+            MATCH (m:Meeting {id: $meeting_id})
+            OPTIONAL MATCH (m)-[r:HAS_TIMELINE]->(t:TimelineEvent)
+            DETACH DELETE t
+            """,
+            {"meeting_id": meeting["id"]},
+        )
+    )
 
-        # Clear existing participant/decision/timeline subgraphs to avoid duplication
-        session.execute_write(
-            lambda tx: tx.run(
+    if topics:
+        statements.append(
+            (
                 """
-                MATCH (m:Meeting {id: $meeting_id})
-                OPTIONAL MATCH (m)-[r:HAS_PARTICIPANT]->(p:Participant)
-                DETACH DELETE p
+                MATCH (m:Meeting {id: $meeting_id})-[rel:HAS_TOPIC]->(:Topic)
+                DELETE rel
                 """,
-                meeting_id=meeting["id"],
+                {"meeting_id": meeting["id"]},
             )
         )
-        session.execute_write(
-            lambda tx: tx.run(
+
+    if nodes:
+        statements.append(
+            (
                 """
-                MATCH (m:Meeting {id: $meeting_id})
-                OPTIONAL MATCH (m)-[r:HAS_DECISION]->(d:Decision)
-                DETACH DELETE d
+                UNWIND $nodes AS node
+                MERGE (c:Concept {meeting_id: $meeting_id, node_id: node.id})
+                SET c.label = node.label
+                MERGE (m:Meeting {id: $meeting_id})
+                MERGE (m)-[:MENTIONS]->(c)
                 """,
-                meeting_id=meeting["id"],
+                {"meeting_id": meeting["id"], "nodes": nodes},
             )
         )
-        session.execute_write(
-            lambda tx: tx.run(
+
+    if edges:
+        statements.append(
+            (
                 """
-                MATCH (m:Meeting {id: $meeting_id})
-                OPTIONAL MATCH (m)-[r:HAS_TIMELINE]->(t:TimelineEvent)
-                DETACH DELETE t
+                UNWIND $edges AS edge
+                MATCH (source:Concept {meeting_id: $meeting_id, node_id: edge.from})
+                MATCH (target:Concept {meeting_id: $meeting_id, node_id: edge.to})
+                MERGE (source)-[r:RELATED_TO {meeting_id: $meeting_id}]->(target)
+                SET r.label = edge.label
                 """,
-                meeting_id=meeting["id"],
+                {"meeting_id": meeting["id"], "edges": edges},
             )
         )
 
-        if topics:
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    MATCH (m:Meeting {id: $meeting_id})-[rel:HAS_TOPIC]->(:Topic)
-                    DELETE rel
-                    """,
-                    meeting_id=meeting["id"],
-                )
+    if participants:
+        statements.append(
+            (
+                """
+                MATCH (m:Meeting {id: $meeting_id})
+                UNWIND $participants AS participant
+                MERGE (p:Participant {participant_id: participant.id, meeting_id: $meeting_id})
+                SET p.name = participant.name,
+                    p.role = participant.role,
+                    p.organization = participant.organization
+                MERGE (m)-[:HAS_PARTICIPANT]->(p)
+                """,
+                {"meeting_id": meeting["id"], "participants": participants},
             )
+        )
 
-        if nodes:
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    UNWIND $nodes AS node
-                    MERGE (c:Concept {meeting_id: $meeting_id, node_id: node.id})
-                    SET c.label = node.label
-                    MERGE (m:Meeting {id: $meeting_id})
-                    MERGE (m)-[:MENTIONS]->(c)
-                    """,
-                    meeting_id=meeting["id"],
-                    nodes=nodes,
-                )
+    if decisions:
+        statements.append(
+            (
+                """
+                MATCH (m:Meeting {id: $meeting_id})
+                UNWIND $decisions AS decision
+                MERGE (d:Decision {decision_id: decision.id, meeting_id: $meeting_id})
+                SET d.title = decision.title,
+                    d.description = decision.description,
+                    d.owner = decision.owner,
+                    d.due_date = decision.due_date
+                MERGE (m)-[:HAS_DECISION]->(d)
+                """,
+                {"meeting_id": meeting["id"], "decisions": decisions},
             )
+        )
 
-        if edges:
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    UNWIND $edges AS edge
-                    MATCH (source:Concept {meeting_id: $meeting_id, node_id: edge.from})
-                    MATCH (target:Concept {meeting_id: $meeting_id, node_id: edge.to})
-                    MERGE (source)-[r:RELATED_TO {meeting_id: $meeting_id}]->(target)
-                    SET r.label = edge.label
-                    """,
-                    meeting_id=meeting["id"],
-                    edges=edges,
-                )
+    if timeline:
+        statements.append(
+            (
+                """
+                MATCH (m:Meeting {id: $meeting_id})
+                UNWIND $timeline AS entry
+                MERGE (t:TimelineEvent {timeline_id: entry.id, meeting_id: $meeting_id})
+                SET t.label = entry.label,
+                    t.summary = entry.summary,
+                    t.start_time = entry.start_time
+                MERGE (m)-[:HAS_TIMELINE]->(t)
+                """,
+                {"meeting_id": meeting["id"], "timeline": timeline},
             )
+        )
 
-        if participants:
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    MATCH (m:Meeting {id: $meeting_id})
-                    UNWIND $participants AS participant
-                    MERGE (p:Participant {participant_id: participant.id, meeting_id: $meeting_id})
-                    SET p.name = participant.name,
-                        p.role = participant.role,
-                        p.organization = participant.organization
-                    MERGE (m)-[:HAS_PARTICIPANT]->(p)
-                    """,
-                    meeting_id=meeting["id"],
-                    participants=participants,
-                )
+    if topics:
+        statements.append(
+            (
+                """
+                MATCH (m:Meeting {id: $meeting_id})
+                UNWIND $topics AS topic
+                MERGE (t:Topic {name: topic.name})
+                MERGE (m)-[:HAS_TOPIC]->(t)
+                """,
+                {"meeting_id": meeting["id"], "topics": topics},
             )
+        )
 
-        if decisions:
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    MATCH (m:Meeting {id: $meeting_id})
-                    UNWIND $decisions AS decision
-                    MERGE (d:Decision {decision_id: decision.id, meeting_id: $meeting_id})
-                    SET d.title = decision.title,
-                        d.description = decision.description,
-                        d.owner = decision.owner,
-                        d.due_date = decision.due_date
-                    MERGE (m)-[:HAS_DECISION]->(d)
-                    """,
-                    meeting_id=meeting["id"],
-                    decisions=decisions,
-                )
-            )
+    return statements
 
-        if timeline:
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    MATCH (m:Meeting {id: $meeting_id})
-                    UNWIND $timeline AS entry
-                    MERGE (t:TimelineEvent {timeline_id: entry.id, meeting_id: $meeting_id})
-                    SET t.label = entry.label,
-                        t.summary = entry.summary,
-                        t.start_time = entry.start_time
-                    MERGE (m)-[:HAS_TIMELINE]->(t)
-                    """,
-                    meeting_id=meeting["id"],
-                    timeline=timeline,
-                )
-            )
 
-        if topics:
-            session.execute_write(
-                lambda tx: tx.run(
-                    """
-                    MATCH (m:Meeting {id: $meeting_id})
-                    UNWIND $topics AS topic
-                    MERGE (t:Topic {name: topic.name})
-                    MERGE (m)-[:HAS_TOPIC]->(t)
-                    """,
-                    meeting_id=meeting["id"],
-                    topics=topics,
-                )
-            )
+def _run_statement(tx, cypher: str, parameters: Dict[str, Any]) -> None:
+    tx.run(cypher, **parameters).consume()
+
+
+async def _arun_statement(tx, cypher: str, parameters: Dict[str, Any]) -> None:
+    result = await tx.run(cypher, **parameters)
+    await result.consume()
+
+
+def _write_statements(driver: Driver, operation: str, statements: List[Tuple[str, Dict[str, Any]]]) -> None:
+    started = time.perf_counter()
+    with driver.session(database=settings.NEO4J_DATABASE) as session:
+        for cypher, parameters in statements:
+            session.execute_write(_run_statement, cypher, parameters)
+    GRAPH_WRITE_SECONDS.labels(operation=operation).observe(time.perf_counter() - started)
+
+
+async def _awrite_statements(driver: AsyncDriver, operation: str, statements: List[Tuple[str, Dict[str, Any]]]) -> None:
+    async with _ASYNC_WRITE_SLOTS:
+        started = time.perf_counter()
+        async with driver.session(database=settings.NEO4J_DATABASE) as session:
+            for cypher, parameters in statements:
+                await session.execute_write(_arun_statement, cypher, parameters)
+        GRAPH_WRITE_SECONDS.labels(operation=operation).observe(time.perf_counter() - started)
+
+
+def upsert_meeting_graph(meeting: Dict[str, Any]) -> None:
+    """
+    Persist meeting level data to Neo4j.
+
+    meeting dict should contain:
+        - id
+        - original_filename
+        - created_at / updated_at
+        - summary, key_points, action_items, sentiment, tags, transcript, knowledge_graph
+    """
+    try:
+        driver = _get_driver()
+    except Neo4jNotConfigured:
+        logger.info("Neo4j not configured - skipping graph persistence for meeting %s", meeting.get("id"))
+        return
+
+    _write_statements(driver, "meeting_upsert", _meeting_graph_statements(meeting))
+
+
+async def aupsert_meeting_graph(meeting: Dict[str, Any]) -> None:
+    """Async variant of upsert_meeting_graph, on the async driver."""
+    try:
+        driver = _get_async_driver()
+    except Neo4jNotConfigured:
+        logger.info("Neo4j not configured - skipping graph persistence for meeting %s", meeting.get("id"))
+        return
+
+    await _awrite_statements(driver, "meeting_upsert", _meeting_graph_statements(meeting))
 
 
 def search_meetings(query: str, limit: int = 5) -> List[Dict[str, Any]]:
@@ -646,3 +708,82 @@ def fetch_meeting_context(meeting_id: str) -> Optional[Dict[str, Any]]:
         )
         return data
 
+
+
+def _transcript_chunk_statements(meeting_id: str, chunks: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    statements: List[Tuple[str, Dict[str, Any]]] = [
+        (
+            """
+            MATCH (:Meeting {id: $meeting_id})-[:HAS_CHUNK]->(c:TranscriptChunk)
+            DETACH DELETE c
+            """,
+            {"meeting_id": meeting_id},
+        )
+    ]
+    if chunks:
+        statements.append(
+            (
+                """
+                MERGE (m:Meeting {id: $meeting_id})
+                WITH m
+                UNWIND $chunks AS chunk
+                CREATE (c:TranscriptChunk {
+                    id: $meeting_id + ':' + toString(chunk.position),
+                    position: chunk.position,
+                    text: chunk.text,
+                    start_time: chunk.start_time,
+                    end_time: chunk.end_time,
+                    embedding: chunk.embedding
+                })
+                MERGE (m)-[:HAS_CHUNK]->(c)
+                """,
+                {"meeting_id": meeting_id, "chunks": chunks},
+            )
+        )
+    return statements
+
+
+def replace_transcript_chunks(meeting_id: str, chunks: List[Dict[str, Any]]) -> bool:
+    """
+    Replaces the meeting's TranscriptChunk nodes. Each chunk dict holds
+    position, text, start_time, end_time and (optionally) embedding.
+
+    Returns False when Neo4j is not configured.
+    """
+    try:
+        driver = _get_driver()
+    except Neo4jNotConfigured:
+        logger.info("Neo4j not configured - skipping transcript chunk persistence for meeting %s", meeting_id)
+        return False
+
+    _write_statements(driver, "transcript_chunks", _transcript_chunk_statements(meeting_id, chunks))
+    return True
+
+
+async def areplace_transcript_chunks(meeting_id: str, chunks: List[Dict[str, Any]]) -> bool:
+    """Async variant of replace_transcript_chunks."""
+    try:
+        driver = _get_async_driver()
+    except Neo4jNotConfigured:
+        logger.info("Neo4j not configured - skipping transcript chunk persistence for meeting %s", meeting_id)
+        return False
+
+    await _awrite_statements(driver, "transcript_chunks", _transcript_chunk_statements(meeting_id, chunks))
+    return True
+
+
+def fetch_transcript_chunks(meeting_id: str) -> Optional[List[Dict[str, Any]]]:
+    """Returns the meeting's transcript chunks in order, or None when Neo4j is not configured."""
+    try:
+        driver = _get_driver()
+    except Neo4jNotConfigured:
+        return None
+
+    cypher = """
+    MATCH (:Meeting {id: $meeting_id})-[:HAS_CHUNK]->(c:TranscriptChunk)
+    RETURN c.position AS position, c.text AS text, c.start_time AS start_time,
+           c.end_time AS end_time, c.embedding AS embedding
+    ORDER BY c.position
+    """
+    with driver.session(database=settings.NEO4J_DATABASE) as session:
+        return [record.data() for record in session.run(cypher, meeting_id=meeting_id)]
@@ -0,0 +1,124 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# backend/app/services/llm_cache.py -> backend/
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_PATH = os.path.join(BACKEND_DIR, "cache", "llm_responses.sqlite3")
+
+
+class LLMResponseCache:
+    """
+    Persistent SQLite cache of LLM completions.
+
+    Keys hash the prompt template, model, temperature, request options and the
+    fully rendered prompt. Entries expire after `ttl_seconds`; once the stored
+    responses exceed `max_bytes` the least recently used ones are evicted.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection per process, shared by worker threads under the lock; WAL lets
+        # several worker processes read and write the same file.
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses (last_access)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(template: str, model: str, temperature: Any, options: Dict[str, Any], rendered: str) -> str:
+        material = json.dumps([template, model, temperature, options, rendered], sort_keys=True, default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                row = None
+            if row:
+                self._conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._conn.commit()
+        record_cache_lookup("llm", row is not None)
+        return row[0] if row else None
+
+    def put(self, key: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response, len(response.encode("utf-8")), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total_bytes <= self.max_bytes:
+            return
+        freed = 0
+        stale_keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM llm_responses ORDER BY last_access"):
+            stale_keys.append((key,))
+            freed += size
+            if total_bytes - freed <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", stale_keys)
+        logger.info("Evicted %d LLM cache entries (%d bytes)", len(stale_keys), freed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    path = settings.LLM_CACHE_PATH or DEFAULT_CACHE_PATH
+    logger.info("Using LLM response cache at %s", path)
+    return LLMResponseCache(path, settings.LLM_CACHE_TTL_HOURS * 3600, settings.LLM_CACHE_MAX_MB * 1024 * 1024)
@@ -1,111 +1,763 @@
+import os
 import json
+import time
+import asyncio
 import logging
-from typing import Any, Dict, List
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from langchain_openai import ChatOpenAI
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_core.prompts import PromptTemplate
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 
 from app.core.config import settings
+from app.core.metrics import LLM_CALL_SECONDS, LLM_TOKENS
 from . import prompts
+from .llm_cache import LLMResponseCache, get_llm_cache
+from .rate_limiter import RateLimiter, get_rate_limiter, usage_tokens
+from .tokens import count_tokens, split_transcript
 
 logger = logging.getLogger(__name__)
 
-def generate_meeting_insights(transcript: str) -> dict:
+
+class InsightGenerationError(Exception):
+    """
+    Some insight prompts failed. `insights` holds the sections that were
+    generated, `failed` the keys of the others.
+    """
+
+    def __init__(self, insights: Dict[str, str], failed: Dict[str, Exception]):
+        self.insights = insights
+        self.failed = list(failed)
+        super().__init__("; ".join(f"{INSIGHT_PROMPTS[key]['label']}: {exc}" for key, exc in failed.items()))
+
+
+def insight_placeholders(keys: List[str], exc: Exception) -> Dict[str, str]:
+    """
+    The sections of `keys` for a batch whose retries are exhausted: those `exc`
+    (an InsightGenerationError) still carries, the placeholder for the rest.
+    """
+    insights = {key: INSIGHT_PROMPTS[key]["fallback"] for key in keys}
+    if isinstance(exc, InsightGenerationError):
+        insights.update({key: value for key, value in exc.insights.items() if key in insights})
+    return insights
+
+# Insight key -> prompt template, log label, the placeholder stored when generation
+# keeps failing and the output format to keep when partial results are merged
+# (map-reduce). The knowledge graph is merged structurally instead of by prompt.
+INSIGHT_PROMPTS: Dict[str, Dict[str, str]] = {
+    "abstract_summary": {
+        "template": prompts.abstract_summary_prompt,
+        "label": "abstract summary",
+        "fallback": "Error: Could not generate summary.",
+        "reduce_format": (
+            'Output Markdown: a first line "## <short descriptive title>", one context sentence, '
+            "then 1–3 short summary paragraphs."
+        ),
+    },
+    "key_points": {
+        "template": prompts.key_points_prompt,
+        "label": "key points",
+        "fallback": "Error: Could not generate key points.",
+        "reduce_format": (
+            'Output Markdown: for each key point, ordered by prominence, a "### <point name>" heading '
+            'followed by "- <detail>" bullet lines.'
+        ),
+    },
+    "action_items": {
+        "template": prompts.action_items_prompt,
+        "label": "action items",
+        "fallback": "Error: Could not generate action items.",
+        "reduce_format": (
+            'Output Markdown: for each action item a "### <number>. <item name>" heading followed by '
+            '"- <detail>" bullet lines, renumbered from 1. If no part has action items, output exactly '
+            '"No explicit action items were identified in this discussion."'
+        ),
+    },
+    "sentiment_analysis": {
+        "template": prompts.sentiment_analysis_prompt,
+        "label": "sentiment analysis",
+        "fallback": "Error: Could not generate sentiment analysis.",
+        "reduce_format": (
+            "Output at most 3 short paragraphs: the prevailing sentiment for the whole meeting and why, "
+            "and how tone shifted between phases."
+        ),
+    },
+    "tags": {
+        "template": prompts.topic_modeling_prompt,
+        "label": "topic tags",
+        "fallback": "Error: Could not generate tags.",
+        "reduce_format": "Output ONLY a single line of 3–6 comma-separated tags covering the whole meeting.",
+    },
+    "knowledge_graph": {
+        "template": prompts.knowledge_graph_prompt,
+        "label": "knowledge graph data",
+        "fallback": json.dumps({"nodes": [], "edges": []}),
+    },
+}
+
+# Caps concurrent LLM requests across all insight, map and reduce threads in the process.
+_LLM_CALL_SLOTS = threading.BoundedSemaphore(max(1, settings.LLM_MAX_CONCURRENCY))
+# The same cap for coroutines of the asyncio pipeline, across all meetings in the process.
+_ASYNC_LLM_CALL_SLOTS = asyncio.Semaphore(max(1, settings.ASYNC_LLM_CONCURRENCY))
+
+INSIGHTS_TEMPERATURE = 0.3
+CHAT_TEMPERATURE = 0.2
+
+
+def get_chat_model(model: Optional[str] = None, temperature: float = INSIGHTS_TEMPERATURE) -> ChatOpenAI:
+    """
+    Returns the process-wide ChatOpenAI client for (model, temperature).
+
+    Clients are created lazily, once per process, and share one pooled keep-alive
+    HTTP client, so repeated calls reuse warm TLS connections.
+    """
+    return _chat_model_registry(model or settings.LLM_MODEL, temperature, os.getpid())
+
+
+@lru_cache(maxsize=None)
+def _chat_model_registry(model: str, temperature: float, pid: int) -> ChatOpenAI:
+    # `pid` keeps forked worker processes from inheriting the parent's sockets.
+    logger.info(f"Initializing OpenAI ChatOpenAI client for {model} (temperature {temperature})")
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        openai_api_key=settings.OPENAI_API_KEY,
+        request_timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
+        # Back off on provider 429s rather than surfacing them as failed insights
+        max_retries=settings.LLM_MAX_RETRIES,
+        http_client=_shared_http_client(pid),
+        http_async_client=_shared_async_http_client(pid),
+    )
+
+
+def get_embeddings_model() -> OpenAIEmbeddings:
+    """Returns the process-wide embeddings client, sharing the pooled HTTP client."""
+    return _embeddings_registry(settings.EMBEDDING_MODEL, os.getpid())
+
+
+@lru_cache(maxsize=None)
+def _embeddings_registry(model: str, pid: int) -> OpenAIEmbeddings:
+    logger.info(f"Initializing OpenAI embeddings client for {model}")
+    return OpenAIEmbeddings(
+        model=model,
+        openai_api_key=settings.OPENAI_API_KEY,
+        request_timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
+        max_retries=settings.LLM_MAX_RETRIES,
+        http_client=_shared_http_client(pid),
+        http_async_client=_shared_async_http_client(pid),
+    )
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.LLM_HTTP_POOL_SIZE,
+        max_keepalive_connections=settings.LLM_HTTP_POOL_SIZE,
+        keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_SECONDS,
+    )
+
+
+@lru_cache(maxsize=None)
+def _shared_http_client(pid: int) -> httpx.Client:
+    return httpx.Client(limits=_http_limits(), timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS)
+
+
+@lru_cache(maxsize=None)
+def _shared_async_http_client(pid: int) -> httpx.AsyncClient:
+    # Used by ainvoke; only the asyncio worker's event loop ever opens connections on it.
+    return httpx.AsyncClient(limits=_http_limits(), timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS)
+
+
+def warm_llm_clients() -> None:
+    """
+    Builds the insight and chat clients and opens a first connection to the
+    provider, so the first real request does not pay for client construction
+    or the TLS handshake. Failures are logged and otherwise ignored.
+    """
+    try:
+        get_chat_model(temperature=INSIGHTS_TEMPERATURE)
+        chat_model = get_chat_model(temperature=CHAT_TEMPERATURE)
+        base_url = (chat_model.openai_api_base or "https://api.openai.com/v1").rstrip("/")
+        _shared_http_client(os.getpid()).get(
+            f"{base_url}/models",
+            headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+            timeout=5,
+        )
+        logger.info("Warmed OpenAI client pool")
+    except Exception as exc:
+        logger.warning(f"Could not warm OpenAI client pool: {exc}")
+
+
+class _KnowledgeGraphSection(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    nodes: List[Dict[str, Any]]
+    edges: List[Dict[str, Any]]
+
+
+class CombinedInsights(BaseModel):
+    """
+    Schema for the single-call insight response. A section that fails
+    validation is set to None instead of failing the whole payload.
+    """
+
+    abstract_summary: Optional[str] = Field(default=None, min_length=1)
+    key_points: Optional[str] = Field(default=None, min_length=1)
+    action_items: Optional[str] = Field(default=None, min_length=1)
+    sentiment_analysis: Optional[str] = Field(default=None, min_length=1)
+    tags: Optional[str] = Field(default=None, min_length=1)
+    knowledge_graph: Optional[_KnowledgeGraphSection] = None
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _join_tag_list(cls, value: Any) -> Any:
+        if isinstance(value, list):
+            return ", ".join(str(tag).strip() for tag in value if str(tag).strip())
+        return value
+
+    @field_validator("*", mode="wrap")
+    @classmethod
+    def _drop_invalid_section(cls, value: Any, handler: Any) -> Any:
+        try:
+            return handler(value)
+        except ValidationError:
+            return None
+
+
+def generate_meeting_insights(transcript: str, keys: Optional[List[str]] = None) -> dict:
     """
     Generates a comprehensive set of insights from a transcript using OpenAI API.
     
+    With LLM_INSIGHTS_MODE="combined" all sections come from one structured-output
+    call and only sections failing validation are regenerated per prompt.
+    Otherwise the prompts run concurrently on a bounded thread pool
+    (LLM_MAX_CONCURRENCY); a failing prompt only affects its own insight. Once
+    every prompt has finished, failures raise InsightGenerationError carrying
+    the generated sections, so the pipeline stage is retried (the response cache
+    keeps the retry to the failed prompts) instead of storing a placeholder.
+    Pass `keys` to generate only those INSIGHT_PROMPTS sections, per prompt.
+    
     Returns a dictionary containing:
     - abstract_summary
     - key_points
     - action_items
     - sentiment_analysis
+    - tags
+    - knowledge_graph
     """
-    logger.info("Initializing OpenAI ChatOpenAI")
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.3,
-        openai_api_key=settings.OPENAI_API_KEY
-    )
+    llm = get_chat_model(temperature=INSIGHTS_TEMPERATURE)
 
-    insights = {}
+    if keys is not None:
+        insights = _generate_insights_per_prompt(llm, transcript, keys)
+    elif settings.LLM_INSIGHTS_MODE == "combined" and _exceeds_token_budget(transcript):
+        logger.info("Transcript exceeds LLM_TRANSCRIPT_TOKEN_BUDGET; using per-prompt map-reduce instead of combined mode")
+        insights = _generate_insights_per_prompt(llm, transcript, list(INSIGHT_PROMPTS))
+    elif settings.LLM_INSIGHTS_MODE == "combined":
+        insights = _generate_combined_insights(llm, transcript)
+    else:
+        insights = _generate_insights_per_prompt(llm, transcript, list(INSIGHT_PROMPTS))
+
+    logger.info("All insights generated successfully.")
+    
+    return insights
+
+
+def _generate_insights_per_prompt(llm: ChatOpenAI, transcript: str, keys: List[str]) -> Dict[str, str]:
+    if not keys:
+        return {}
+    max_workers = max(1, min(settings.LLM_MAX_CONCURRENCY, len(keys)))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {key: pool.submit(_generate_insight, llm, key, transcript) for key in keys}
+    insights: Dict[str, str] = {}
+    failed: Dict[str, Exception] = {}
+    for key, future in futures.items():
+        try:
+            insights[key] = future.result()
+        except Exception as exc:
+            failed[key] = exc
+    if failed:
+        raise InsightGenerationError(insights, failed)
+    return insights
 
-    # --- 1. Generate Abstract Summary ---
-    try:
-        logger.info("Generating abstract summary...")
-        prompt_template = PromptTemplate(template=prompts.abstract_summary_prompt, input_variables=["transcript"])
-        formatted_prompt = prompt_template.format(transcript=transcript)
-        result = llm.invoke(formatted_prompt)
-        insights['abstract_summary'] = result.content if hasattr(result, 'content') else str(result)
-    except Exception as e:
-        logger.error(f"Error generating abstract summary: {e}")
-        insights['abstract_summary'] = "Error: Could not generate summary."
 
-    # --- 2. Generate Key Points ---
+def _generate_combined_insights(llm: ChatOpenAI, transcript: str) -> Dict[str, str]:
+    """
+    Requests every insight section in one JSON-mode call, validates each section
+    against CombinedInsights and falls back to the per-prompt path for the
+    sections that are missing or invalid.
+    """
+    insights: Dict[str, str] = {}
+    formatted_prompt = None
     try:
-        logger.info("Generating key points...")
-        prompt_template = PromptTemplate(template=prompts.key_points_prompt, input_variables=["transcript"])
+        logger.info("Generating all insights in a single structured call...")
+        prompt_template = PromptTemplate(template=prompts.combined_insights_prompt, input_variables=["transcript"])
         formatted_prompt = prompt_template.format(transcript=transcript)
-        result = llm.invoke(formatted_prompt)
-        insights['key_points'] = result.content if hasattr(result, 'content') else str(result)
+        raw = _invoke_llm(
+            llm.bind(response_format={"type": "json_object"}),
+            formatted_prompt,
+            template=prompts.combined_insights_prompt,
+        )
+        insights = _parse_combined_insights(raw)
     except Exception as e:
-        logger.error(f"Error generating key points: {e}")
-        insights['key_points'] = "Error: Could not generate key points."
+        logger.error(f"Error generating combined insights: {e}")
+
+    failed = [key for key in INSIGHT_PROMPTS if key not in insights]
+    if failed:
+        logger.warning(f"Combined insights missing or invalid for {failed}; falling back to per-prompt calls")
+        try:
+            insights.update(_generate_insights_per_prompt(llm, transcript, failed))
+        except InsightGenerationError as exc:
+            exc.insights = {**insights, **exc.insights}
+            raise
+
+    _log_combined_token_savings(transcript, formatted_prompt, failed)
+    return insights
+
+
+def _parse_combined_insights(raw: str) -> Dict[str, str]:
+    sections = CombinedInsights.model_validate(json.loads(_strip_code_fences(raw)))
+    insights: Dict[str, str] = {}
+    for key in INSIGHT_PROMPTS:
+        value = getattr(sections, key)
+        if value is None:
+            continue
+        if key == "knowledge_graph":
+            insights[key] = _normalise_knowledge_graph_payload(json.dumps(value.model_dump()))
+        else:
+            insights[key] = value
+    return insights
+
+
+def _log_combined_token_savings(transcript: str, combined_prompt: Optional[str], fallback_keys: List[str]) -> None:
+    def _prompt_tokens(key: str) -> int:
+        prompt_template = PromptTemplate(template=INSIGHT_PROMPTS[key]["template"], input_variables=["transcript"])
+        return count_tokens(prompt_template.format(transcript=transcript))
+
+    per_prompt_tokens = sum(_prompt_tokens(key) for key in INSIGHT_PROMPTS)
+    combined_tokens = count_tokens(combined_prompt or "") + sum(_prompt_tokens(key) for key in fallback_keys)
+    saved = per_prompt_tokens - combined_tokens
+    logger.info(
+        f"Combined insight mode used {combined_tokens} input tokens vs {per_prompt_tokens} per-prompt "
+        f"({saved} saved, {saved / max(per_prompt_tokens, 1):.0%}; {len(fallback_keys)} sections fell back)"
+    )
 
-    # --- 3. Generate Action Items ---
+
+def _generate_insight(llm: ChatOpenAI, key: str, transcript: str) -> str:
+    """
+    Generates one insight. Transcripts over LLM_TRANSCRIPT_TOKEN_BUDGET are split on
+    turn boundaries, analysed chunk by chunk in parallel (map) and merged (reduce).
+    Errors are logged and raised.
+    """
+    spec = INSIGHT_PROMPTS[key]
     try:
-        logger.info("Generating action items...")
-        prompt_template = PromptTemplate(template=prompts.action_items_prompt, input_variables=["transcript"])
-        formatted_prompt = prompt_template.format(transcript=transcript)
-        result = llm.invoke(formatted_prompt)
-        insights['action_items'] = result.content if hasattr(result, 'content') else str(result)
+        chunks = []
+        if _exceeds_token_budget(transcript):
+            chunks = split_transcript(transcript, settings.LLM_TRANSCRIPT_TOKEN_BUDGET)
+        if len(chunks) > 1:
+            logger.info(f"Generating {spec['label']} with map-reduce over {len(chunks)} transcript chunks...")
+            content = _map_reduce_insight(llm, key, chunks)
+        else:
+            logger.info(f"Generating {spec['label']}...")
+            content = _run_insight_prompt(llm, key, transcript)
+        if key == "knowledge_graph":
+            return _normalise_knowledge_graph_payload(content)
+        return content
     except Exception as e:
-        logger.error(f"Error generating action items: {e}")
-        insights['action_items'] = "Error: Could not generate action items."
+        logger.error(f"Error generating {spec['label']}: {e}")
+        raise
+
+
+async def agenerate_meeting_insights(transcript: str, keys: Optional[List[str]] = None) -> dict:
+    """
+    generate_meeting_insights for the asyncio pipeline. Prompts, map and reduce
+    calls run as coroutines on `ainvoke`, sharing ASYNC_LLM_CONCURRENCY slots
+    with every other meeting in the process.
+    """
+    llm = get_chat_model(temperature=INSIGHTS_TEMPERATURE)
+
+    if keys is not None:
+        return await _agenerate_insights_per_prompt(llm, transcript, keys)
+    if settings.LLM_INSIGHTS_MODE == "combined" and not _exceeds_token_budget(transcript):
+        return await _agenerate_combined_insights(llm, transcript)
+    return await _agenerate_insights_per_prompt(llm, transcript, list(INSIGHT_PROMPTS))
+
+
+async def _agenerate_insights_per_prompt(llm: ChatOpenAI, transcript: str, keys: List[str]) -> Dict[str, str]:
+    results = await asyncio.gather(*(_agenerate_insight(llm, key, transcript) for key in keys), return_exceptions=True)
+    insights = {key: result for key, result in zip(keys, results) if not isinstance(result, BaseException)}
+    failed = {key: result for key, result in zip(keys, results) if isinstance(result, BaseException)}
+    if failed:
+        raise InsightGenerationError(insights, failed)
+    return insights
+
 
-    # --- 4. Generate Sentiment Analysis ---
+async def _agenerate_combined_insights(llm: ChatOpenAI, transcript: str) -> Dict[str, str]:
+    insights: Dict[str, str] = {}
+    formatted_prompt = None
     try:
-        logger.info("Generating sentiment analysis...")
-        prompt_template = PromptTemplate(template=prompts.sentiment_analysis_prompt, input_variables=["transcript"])
+        prompt_template = PromptTemplate(template=prompts.combined_insights_prompt, input_variables=["transcript"])
         formatted_prompt = prompt_template.format(transcript=transcript)
-        result = llm.invoke(formatted_prompt)
-        insights['sentiment_analysis'] = result.content if hasattr(result, 'content') else str(result)
+        raw = await _ainvoke_llm(
+            llm.bind(response_format={"type": "json_object"}),
+            formatted_prompt,
+            template=prompts.combined_insights_prompt,
+        )
+        insights = _parse_combined_insights(raw)
     except Exception as e:
-        logger.error(f"Error generating sentiment analysis: {e}")
-        insights['sentiment_analysis'] = "Error: Could not generate sentiment analysis."
+        logger.error(f"Error generating combined insights: {e}")
 
-    logger.info("All insights generated successfully.")
-    
-    # --- 5. NEW: Topic Modeling (Tags) ---
+    failed = [key for key in INSIGHT_PROMPTS if key not in insights]
+    if failed:
+        logger.warning(f"Combined insights missing or invalid for {failed}; falling back to per-prompt calls")
+        try:
+            insights.update(await _agenerate_insights_per_prompt(llm, transcript, failed))
+        except InsightGenerationError as exc:
+            exc.insights = {**insights, **exc.insights}
+            raise
+
+    _log_combined_token_savings(transcript, formatted_prompt, failed)
+    return insights
+
+
+async def _agenerate_insight(llm: ChatOpenAI, key: str, transcript: str) -> str:
+    spec = INSIGHT_PROMPTS[key]
     try:
-        logger.info("Generating topic tags...")
-        prompt = PromptTemplate(template=prompts.topic_modeling_prompt, input_variables=["transcript"])
-        formatted_prompt = prompt.format(transcript=transcript)
-        result = llm.invoke(formatted_prompt)
-        insights['tags'] = result.content if hasattr(result, 'content') else str(result)
+        chunks = []
+        if _exceeds_token_budget(transcript):
+            chunks = split_transcript(transcript, settings.LLM_TRANSCRIPT_TOKEN_BUDGET)
+        if len(chunks) > 1:
+            logger.info(f"Generating {spec['label']} with map-reduce over {len(chunks)} transcript chunks...")
+            content = await _amap_reduce_insight(llm, key, chunks)
+        else:
+            template = spec["template"]
+            prompt_template = PromptTemplate(template=template, input_variables=["transcript"])
+            content = await _ainvoke_llm(llm, prompt_template.format(transcript=transcript), template=template)
+        if key == "knowledge_graph":
+            return _normalise_knowledge_graph_payload(content)
+        return content
     except Exception as e:
-        logger.error(f"Error generating topic tags: {e}")
-        insights['tags'] = "Error: Could not generate tags."
+        logger.error(f"Error generating {spec['label']}: {e}")
+        raise
+
+
+async def _amap_reduce_insight(llm: ChatOpenAI, key: str, chunks: List[str]) -> str:
+    template = INSIGHT_PROMPTS[key]["template"]
+    prompt_template = PromptTemplate(template=template, input_variables=["transcript"])
+    results = await asyncio.gather(
+        *(_ainvoke_llm(llm, prompt_template.format(transcript=chunk), template=template) for chunk in chunks),
+        return_exceptions=True,
+    )
+    partials = []
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Map step failed for one {INSIGHT_PROMPTS[key]['label']} chunk: {result}")
+        elif result:
+            partials.append(result)
+    if not partials:
+        raise Exception("every transcript chunk failed")
+    if key == "knowledge_graph":
+        return _merge_knowledge_graphs(partials)
+
+    async def _reduce_group(group: List[str]) -> str:
+        if len(group) == 1:
+            return group[0]
+        return await _ainvoke_llm(llm, _reduce_prompt(key, group), template=prompts.insight_reduce_prompt)
+
+    while len(partials) > 1:
+        partials = list(await asyncio.gather(*(_reduce_group(group) for group in _reduce_groups(key, partials))))
+    return partials[0]
+
 
-    # --- 6. NEW: Knowledge Graph ---
+def _invoke_llm(llm: Any, formatted_prompt: str, template: Optional[str] = None) -> str:
+    """
+    Invokes the model, serving repeated requests from the persistent response cache.
+    Calls that pass their prompt `template` are cacheable.
+    """
+    cache, cache_key, cached = _cached_response(llm, formatted_prompt, template)
+    if cached is not None:
+        return cached
+
+    with _observe_llm_call(_prompt_name(template)):
+        limiter, reserved = _acquire_rate_limit(llm, formatted_prompt)
+        try:
+            with _LLM_CALL_SLOTS:
+                result = llm.invoke(formatted_prompt)
+        except Exception:
+            if limiter is not None:
+                limiter.release(reserved)
+            raise
+    _record_token_usage(llm, result)
+    if limiter is not None:
+        limiter.settle(reserved, usage_tokens(result))
+    content = result.content if hasattr(result, 'content') else str(result)
+
+    if cache is not None:
+        cache.put(cache_key, content)
+    return content
+
+
+async def _ainvoke_llm(llm: Any, formatted_prompt: str, template: Optional[str] = None) -> str:
+    """`_invoke_llm` for the asyncio pipeline: `ainvoke`, bounded by ASYNC_LLM_CONCURRENCY."""
+    # The SQLite cache is read and written in threads, off the event loop.
+    cache, cache_key, cached = await asyncio.to_thread(_cached_response, llm, formatted_prompt, template)
+    if cached is not None:
+        return cached
+
+    with _observe_llm_call(_prompt_name(template)):
+        limiter = _rate_limiter_for(llm)
+        reserved = await limiter.aacquire(_estimated_tokens(llm, formatted_prompt)) if limiter is not None else 0
+        try:
+            async with _ASYNC_LLM_CALL_SLOTS:
+                result = await llm.ainvoke(formatted_prompt)
+        except Exception:
+            if limiter is not None:
+                await asyncio.to_thread(limiter.release, reserved)
+            raise
+    _record_token_usage(llm, result)
+    if limiter is not None:
+        await asyncio.to_thread(limiter.settle, reserved, usage_tokens(result))
+    content = result.content if hasattr(result, 'content') else str(result)
+
+    if cache is not None:
+        await asyncio.to_thread(cache.put, cache_key, content)
+    return content
+
+
+@contextmanager
+def _observe_llm_call(prompt: str):
+    started = time.perf_counter()
+    outcome = "error"
     try:
-        logger.info("Generating knowledge graph data...")
-        prompt = PromptTemplate(template=prompts.knowledge_graph_prompt, input_variables=["transcript"])
-        formatted_prompt = prompt.format(transcript=transcript)
-        result = llm.invoke(formatted_prompt)
-        raw = result.content if hasattr(result, 'content') else str(result)
-        insights['knowledge_graph'] = _normalise_knowledge_graph_payload(raw)
-    except Exception as e:
-        logger.error(f"Error generating knowledge graph: {e}")
-        insights['knowledge_graph'] = json.dumps({"nodes": [], "edges": []})
+        yield
+        outcome = "success"
+    finally:
+        LLM_CALL_SECONDS.labels(prompt=prompt, outcome=outcome).observe(time.perf_counter() - started)
 
-    logger.info("All insights generated successfully.")
-    
-    return insights
 
+@lru_cache(maxsize=None)
+def _prompt_name(template: Optional[str]) -> str:
+    """Metric label for a prompt template: the insight key, or the prompt's role."""
+    names = {spec["template"]: key for key, spec in INSIGHT_PROMPTS.items()}
+    names[prompts.combined_insights_prompt] = "combined_insights"
+    names[prompts.insight_reduce_prompt] = "insight_reduce"
+    names[prompts.chat_history_summary_prompt] = "chat_history_summary"
+    return names.get(template, "other")
 
-def _normalise_knowledge_graph_payload(raw: str) -> str:
-    if not raw:
-        return json.dumps({"nodes": [], "edges": []})
+
+def _record_token_usage(llm: Any, result: Any) -> None:
+    base_llm = getattr(llm, "bound", llm)
+    model = getattr(base_llm, "model_name", settings.LLM_MODEL)
+    usage = getattr(result, "usage_metadata", None) or {}
+    token_usage = (getattr(result, "response_metadata", None) or {}).get("token_usage") or {}
+    prompt_tokens = usage.get("input_tokens") or token_usage.get("prompt_tokens")
+    completion_tokens = usage.get("output_tokens") or token_usage.get("completion_tokens")
+    if prompt_tokens:
+        LLM_TOKENS.labels(model=model, kind="prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(model=model, kind="completion").inc(completion_tokens)
+
+
+def _cached_response(
+    llm: Any, formatted_prompt: str, template: Optional[str]
+) -> Tuple[Optional[LLMResponseCache], Optional[str], Optional[str]]:
+    """Returns (cache, key, cached content) for a call; the cache is None when not cacheable."""
+    cache = get_llm_cache() if template is not None else None
+    if cache is None:
+        return None, None, None
+    base_llm = getattr(llm, "bound", llm)
+    cache_key = LLMResponseCache.make_key(
+        template,
+        getattr(base_llm, "model_name", type(base_llm).__name__),
+        getattr(base_llm, "temperature", None),
+        getattr(llm, "kwargs", {}),
+        formatted_prompt,
+    )
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"LLM cache hit ({cache_key[:12]}); hit rate {cache.stats()['hit_ratio']:.0%}")
+    return cache, cache_key, cached
+
+
+def _acquire_rate_limit(llm: Any, formatted_prompt: str) -> Tuple[Optional[RateLimiter], int]:
+    """
+    Blocks until the shared rate limiter admits a call of `formatted_prompt` to `llm`.
+    Returns the limiter (None when disabled) and the tokens reserved for `settle`.
+    """
+    limiter = _rate_limiter_for(llm)
+    if limiter is None:
+        return None, 0
+    return limiter, limiter.acquire(_estimated_tokens(llm, formatted_prompt))
+
+
+def _rate_limiter_for(llm: Any) -> Optional[RateLimiter]:
+    base_llm = getattr(llm, "bound", llm)
+    return get_rate_limiter(
+        getattr(base_llm, "model_name", settings.LLM_MODEL),
+        settings.LLM_RATE_LIMIT_RPM,
+        settings.LLM_RATE_LIMIT_TPM,
+    )
+
+
+def _estimated_tokens(llm: Any, formatted_prompt: str) -> int:
+    completion_tokens = getattr(llm, "kwargs", {}).get("max_tokens") or settings.LLM_RATE_LIMIT_COMPLETION_TOKENS
+    return count_tokens(formatted_prompt) + completion_tokens
+
+
+def embed_documents(texts: List[str]) -> List[List[float]]:
+    """Embeds `texts` through the shared embeddings client, within the embedding rate limit."""
+    limiter = get_rate_limiter(
+        settings.EMBEDDING_MODEL,
+        settings.EMBEDDING_RATE_LIMIT_RPM,
+        settings.EMBEDDING_RATE_LIMIT_TPM,
+    )
+    tokens = sum(count_tokens(text) for text in texts)
+    reserved = limiter.acquire(tokens) if limiter is not None else 0
+    with _observe_llm_call("embedding"):
+        try:
+            vectors = get_embeddings_model().embed_documents(texts)
+        except Exception:
+            if limiter is not None:
+                limiter.release(reserved)
+            raise
+    LLM_TOKENS.labels(model=settings.EMBEDDING_MODEL, kind="embedding").inc(tokens)
+    return vectors
+
+
+def embed_query(text: str) -> List[float]:
+    return embed_documents([text])[0]
+
+
+async def aembed_documents(texts: List[str]) -> List[List[float]]:
+    limiter = get_rate_limiter(
+        settings.EMBEDDING_MODEL,
+        settings.EMBEDDING_RATE_LIMIT_RPM,
+        settings.EMBEDDING_RATE_LIMIT_TPM,
+    )
+    tokens = sum(count_tokens(text) for text in texts)
+    reserved = await limiter.aacquire(tokens) if limiter is not None else 0
+    with _observe_llm_call("embedding"):
+        try:
+            async with _ASYNC_LLM_CALL_SLOTS:
+                vectors = await get_embeddings_model().aembed_documents(texts)
+        except Exception:
+            if limiter is not None:
+                await asyncio.to_thread(limiter.release, reserved)
+            raise
+    LLM_TOKENS.labels(model=settings.EMBEDDING_MODEL, kind="embedding").inc(tokens)
+    return vectors
+
+
+def _exceeds_token_budget(transcript: str) -> bool:
+    return count_tokens(transcript) > settings.LLM_TRANSCRIPT_TOKEN_BUDGET
+
+
+def _run_insight_prompt(llm: ChatOpenAI, key: str, transcript: str) -> str:
+    template = INSIGHT_PROMPTS[key]["template"]
+    prompt_template = PromptTemplate(template=template, input_variables=["transcript"])
+    return _invoke_llm(llm, prompt_template.format(transcript=transcript), template=template)
+
+
+def _map_reduce_insight(llm: ChatOpenAI, key: str, chunks: List[str]) -> str:
+    def _map_chunk(chunk: str) -> Optional[str]:
+        try:
+            return _run_insight_prompt(llm, key, chunk)
+        except Exception as e:
+            logger.warning(f"Map step failed for one {INSIGHT_PROMPTS[key]['label']} chunk: {e}")
+            return None
+
+    partials = [partial for partial in _parallel_map(_map_chunk, chunks) if partial]
+    if not partials:
+        raise Exception("every transcript chunk failed")
+    if key == "knowledge_graph":
+        return _merge_knowledge_graphs(partials)
+    return _reduce_partials(llm, key, partials)
+
+
+def _reduce_partials(llm: ChatOpenAI, key: str, partials: List[str]) -> str:
+    """Merges partial results, in budget-sized groups and as many rounds as needed."""
+    def _reduce_group(group: List[str]) -> str:
+        if len(group) == 1:
+            return group[0]
+        return _invoke_llm(llm, _reduce_prompt(key, group), template=prompts.insight_reduce_prompt)
+
+    while len(partials) > 1:
+        groups = _reduce_groups(key, partials)
+        partials = _parallel_map(_reduce_group, groups)
+    return partials[0]
+
+
+def _reduce_prompt(key: str, group: List[str]) -> str:
+    spec = INSIGHT_PROMPTS[key]
+    prompt_template = PromptTemplate(
+        template=prompts.insight_reduce_prompt,
+        input_variables=["insight_name", "format_instructions", "partials"],
+    )
+    numbered = "\n\n".join(f"--- Part {index} ---\n{partial.strip()}" for index, partial in enumerate(group, 1))
+    return prompt_template.format(
+        insight_name=spec["label"],
+        format_instructions=spec["reduce_format"],
+        partials=numbered,
+    )
+
+
+def _reduce_groups(key: str, partials: List[str]) -> List[List[str]]:
+    groups: List[List[str]] = [[]]
+    group_tokens = 0
+    for partial in partials:
+        partial_tokens = count_tokens(partial)
+        # Always pair at least two partials so every round shrinks the list.
+        if len(groups[-1]) >= 2 and group_tokens + partial_tokens > settings.LLM_TRANSCRIPT_TOKEN_BUDGET:
+            groups.append([])
+            group_tokens = 0
+        groups[-1].append(partial)
+        group_tokens += partial_tokens
+    logger.info(f"Reducing {len(partials)} partial {INSIGHT_PROMPTS[key]['label']} results in {len(groups)} groups...")
+    return groups
+
+
+def _parallel_map(func: Any, items: List[Any]) -> List[Any]:
+    if len(items) == 1:
+        return [func(items[0])]
+    with ThreadPoolExecutor(max_workers=max(1, min(settings.LLM_MAX_CONCURRENCY, len(items)))) as pool:
+        return list(pool.map(func, items))
+
+
+def _merge_knowledge_graphs(partials: List[str]) -> str:
+    """Unions per-chunk knowledge graphs, de-duplicating by id / name / title."""
+    merged: Dict[str, List[Any]] = {
+        "nodes": [], "edges": [], "participants": [], "decisions": [], "timeline": [], "topics": []
+    }
+    seen: Dict[str, set] = {section: set() for section in merged}
+    identity = {
+        "nodes": lambda item: str(item.get("id") or item.get("label") or "").lower(),
+        "edges": lambda item: (str(item.get("from")), str(item.get("to")), str(item.get("label") or "").lower()),
+        "participants": lambda item: str(item.get("name") or "").strip().lower(),
+        "decisions": lambda item: str(item.get("title") or item.get("description") or "").strip().lower(),
+        "timeline": lambda item: (str(item.get("label") or "").lower(), str(item.get("start_time") or "")),
+        "topics": lambda item: str(item).strip().lower(),
+    }
+    for partial in partials:
+        payload = json.loads(_normalise_knowledge_graph_payload(partial))
+        for section in merged:
+            items = payload.get(section)
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if section != "topics" and not isinstance(item, dict):
+                    continue
+                key = identity[section](item)
+                if not key or key in seen[section]:
+                    continue
+                seen[section].add(key)
+                merged[section].append(item)
+    return json.dumps(merged)
+
+
+def _strip_code_fences(raw: str) -> str:
     trimmed = raw.strip()
     # Remove Markdown code fences if present
     if trimmed.startswith("```"):
@@ -113,6 +765,13 @@ def _normalise_knowledge_graph_payload(raw: str) -> str:
         idx = trimmed.find("{")
         if idx != -1:
             trimmed = trimmed[idx:]
+    return trimmed
+
+
+def _normalise_knowledge_graph_payload(raw: str) -> str:
+    if not raw:
+        return json.dumps({"nodes": [], "edges": []})
+    trimmed = _strip_code_fences(raw)
     try:
         payload = json.loads(trimmed)
         if not isinstance(payload, dict):
@@ -144,36 +803,113 @@ def _format_chat_history(history: List[Dict[str, str]]) -> str:
 
 def generate_meeting_chat_response(
     question: str,
-    meeting_context: Dict[str, str | List[Dict[str, str]]],
+    meeting_context: Optional[Dict[str, str | List[Dict[str, str]]]] = None,
     history: List[Dict[str, str]] | None = None,
+    prompt_prefix: Optional[str] = None,
+    transcript_excerpts: Optional[List[Dict[str, Any]]] = None,
 ) -> str:
     """
     Generate a conversational response grounded in meeting context.
+
+    Pass `prompt_prefix` (from `build_chat_context_prefix`) to skip re-rendering the
+    meeting context on every turn, and `transcript_excerpts` (retrieved chunks with
+    start/end timestamps) to ground the answer in what was actually said.
     """
     logger.info("Generating meeting chat response")
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.2,
-        openai_api_key=settings.OPENAI_API_KEY,
+    llm = get_chat_model(temperature=CHAT_TEMPERATURE)
+    formatted_prompt = _build_chat_prompt(question, meeting_context, history, prompt_prefix, transcript_excerpts)
+
+    with _observe_llm_call("chat"):
+        limiter, reserved = _acquire_rate_limit(llm, formatted_prompt)
+        try:
+            result = llm.invoke(formatted_prompt)
+        except Exception:
+            if limiter is not None:
+                limiter.release(reserved)
+            raise
+    _record_token_usage(llm, result)
+    if limiter is not None:
+        limiter.settle(reserved, usage_tokens(result))
+    return result.content if hasattr(result, "content") else str(result)
+
+
+def stream_meeting_chat_response(
+    question: str,
+    meeting_context: Optional[Dict[str, str | List[Dict[str, str]]]] = None,
+    history: List[Dict[str, str]] | None = None,
+    prompt_prefix: Optional[str] = None,
+    transcript_excerpts: Optional[List[Dict[str, Any]]] = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of `generate_meeting_chat_response`.
+
+    Yields text fragments as the model produces them; joining them gives the full reply.
+    """
+    logger.info("Streaming meeting chat response")
+    llm = get_chat_model(temperature=CHAT_TEMPERATURE)
+    formatted_prompt = _build_chat_prompt(question, meeting_context, history, prompt_prefix, transcript_excerpts)
+
+    limiter, reserved = _acquire_rate_limit(llm, formatted_prompt)
+    streamed = []
+    try:
+        with _observe_llm_call("chat_stream"):
+            for chunk in llm.stream(formatted_prompt):
+                text = chunk.content if hasattr(chunk, "content") else str(chunk)
+                if text:
+                    streamed.append(text)
+                    yield text
+    finally:
+        # Also settles streams that failed or were abandoned: only what was produced is charged.
+        if limiter is not None:
+            limiter.settle(reserved, count_tokens(formatted_prompt) + count_tokens("".join(streamed)))
+    model = getattr(llm, "model_name", settings.LLM_MODEL)
+    LLM_TOKENS.labels(model=model, kind="prompt").inc(count_tokens(formatted_prompt))
+    LLM_TOKENS.labels(model=model, kind="completion").inc(count_tokens("".join(streamed)))
+
+
+def summarize_chat_turns(existing_summary: str, turns: List[Dict[str, str]], max_tokens: int) -> str:
+    """
+    Folds `turns` into `existing_summary`, returning a summary of about `max_tokens` tokens.
+    """
+    prompt_template = PromptTemplate(
+        template=prompts.chat_history_summary_prompt,
+        input_variables=["existing_summary", "new_turns", "max_words"],
+    )
+    formatted_prompt = prompt_template.format(
+        existing_summary=existing_summary or "(empty)",
+        new_turns=_format_chat_history(turns),
+        # Roughly 0.75 English words per token
+        max_words=max(20, int(max_tokens * 0.75)),
     )
+    llm = get_chat_model(temperature=0.0).bind(max_tokens=max_tokens)
+    return _invoke_llm(llm, formatted_prompt, template=prompts.chat_history_summary_prompt).strip()
+
+
+def build_chat_context_prefix(meeting_context: Dict[str, str | List[Dict[str, str]]]) -> str:
+    """
+    Renders the meeting-specific part of the chat prompt.
 
+    The result only depends on the meeting, so callers can cache it and reuse it
+    for every turn of every conversation about that meeting.
+    """
     prompt_template = PromptTemplate(
-        template=prompts.meeting_chat_prompt,
+        template=prompts.meeting_chat_context_prompt,
         input_variables=[
             "meeting_title",
             "original_filename",
             "created_at",
             "tags",
+            "topics",
+            "participants",
             "summary",
             "key_points",
             "action_items",
+            "decisions",
+            "timeline",
             "structured_concepts",
-            "chat_history",
-            "question",
         ],
     )
 
-    chat_history = _format_chat_history(history or [])
     topics_text = ", ".join(meeting_context.get("topics", [])) if isinstance(meeting_context.get("topics"), list) else (meeting_context.get("topics") or "None")
     participants_text = _format_participants(meeting_context.get("participants"))
     decisions_text = _format_decisions(meeting_context.get("decisions"))
@@ -181,7 +917,7 @@ def generate_meeting_chat_response(
     structured_concepts = meeting_context.get("concepts") or []
     structured_concepts_text = "\n".join(structured_concepts) if isinstance(structured_concepts, list) else str(structured_concepts or "")
 
-    formatted_prompt = prompt_template.format(
+    return prompt_template.format(
         meeting_title=meeting_context.get("title") or meeting_context.get("original_filename") or "Untitled Meeting",
         original_filename=meeting_context.get("original_filename", "Unknown"),
         created_at=meeting_context.get("created_at") or meeting_context.get("date") or "Unknown date",
@@ -194,12 +930,42 @@ def generate_meeting_chat_response(
         decisions=decisions_text,
         timeline=timeline_text,
         structured_concepts=structured_concepts_text or "No concepts captured.",
-        chat_history=chat_history,
+    )
+
+
+def _build_chat_prompt(
+    question: str,
+    meeting_context: Optional[Dict[str, str | List[Dict[str, str]]]] = None,
+    history: List[Dict[str, str]] | None = None,
+    prompt_prefix: Optional[str] = None,
+    transcript_excerpts: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    if prompt_prefix is None:
+        prompt_prefix = build_chat_context_prefix(meeting_context or {})
+
+    # The prefix is already rendered, so it is concatenated rather than re-templated.
+    turn = PromptTemplate(
+        template=prompts.meeting_chat_turn_prompt,
+        input_variables=["transcript_excerpts", "chat_history", "question"],
+    ).format(
+        transcript_excerpts=_format_transcript_excerpts(transcript_excerpts),
+        chat_history=_format_chat_history(history or []),
         question=question,
     )
+    return prompt_prefix + turn
 
-    result = llm.invoke(formatted_prompt)
-    return result.content if hasattr(result, "content") else str(result)
+
+def _format_transcript_excerpts(excerpts: Any) -> str:
+    if not isinstance(excerpts, list) or not excerpts:
+        return "No transcript excerpts retrieved."
+    blocks = []
+    for excerpt in excerpts:
+        if not isinstance(excerpt, dict) or not excerpt.get("text"):
+            continue
+        start = excerpt.get("start_time") or "??:??"
+        end = excerpt.get("end_time") or start
+        blocks.append(f"<excerpt time=\"[{start}-{end}]\">\n{excerpt['text']}\n</excerpt>")
+    return "\n".join(blocks) if blocks else "No transcript excerpts retrieved."
 
 
 def _format_participants(participants: Any) -> str:
@@ -0,0 +1,206 @@
+import json
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.db.database import SessionLocal
+from .scheduling_service import deadline_offset_seconds, priority_for_meeting
+
+logger = logging.getLogger(__name__)
+
+# Meetings waiting for the asyncio executor, scored by virtual deadline
+_QUEUE_KEY = "pipeline:queue"
+# meeting_id -> job JSON for queued meetings
+_JOBS_KEY = "pipeline:jobs"
+# meeting_id -> job JSON for meetings a worker has claimed but not finished
+_IN_FLIGHT_PREFIX = "pipeline:in-flight:"
+# Per meeting: the worker running it, with a TTL the worker keeps refreshing
+# (ASYNC_PIPELINE_CLAIM_TTL_SECONDS), so a dead worker's claims lapse
+_RUNNING_PREFIX = "pipeline:running:"
+
+# Records the job, but only queues it when no worker is running the meeting; a
+# running meeting is queued again when its worker releases it.
+_ENQUEUE_LUA = """
+local existing = redis.call('HGET', KEYS[2], ARGV[1])
+local job
+if existing then
+    job = cjson.decode(existing)
+    job['force'] = job['force'] or ARGV[3] == '1'
+else
+    job = {force = ARGV[3] == '1', score = tonumber(ARGV[2])}
+end
+if ARGV[4] ~= '' then
+    job['clone_from'] = ARGV[4]
+end
+-- An index-only job widens to a full run when one is requested meanwhile
+job['index_only'] = (not existing or job['index_only'] == true) and ARGV[5] == '1'
+redis.call('HSET', KEYS[2], ARGV[1], cjson.encode(job))
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    return {0, tostring(job['score'])}
+end
+redis.call('ZADD', KEYS[1], 'NX', job['score'], ARGV[1])
+return {1, tostring(job['score'])}
+"""
+
+# Pops the most urgent meeting and records it as in flight for the worker in one
+# step, so a worker that dies between the two never loses a meeting.
+_CLAIM_LUA = """
+local popped = redis.call('ZPOPMIN', KEYS[1])
+if #popped == 0 then
+    return nil
+end
+local job = redis.call('HGET', KEYS[2], popped[1])
+if not job then
+    job = cjson.encode({force = false, score = tonumber(popped[2])})
+end
+redis.call('HDEL', KEYS[2], popped[1])
+redis.call('HSET', KEYS[3], popped[1], job)
+redis.call('SET', ARGV[1] .. popped[1], ARGV[2], 'EX', ARGV[3])
+return {popped[1], job}
+"""
+
+# Drops the worker's claim on a meeting and queues the job recorded for it
+# meanwhile, if any. ARGV[3], when set, is recorded first (re-queueing an
+# unfinished run). A claim another worker has taken over is left alone.
+_RELEASE_LUA = """
+redis.call('HDEL', KEYS[1], ARGV[1])
+local owner = redis.call('GET', KEYS[2])
+if owner and owner ~= ARGV[2] then
+    return 0
+end
+redis.call('DEL', KEYS[2])
+if ARGV[3] ~= '' then
+    redis.call('HSETNX', KEYS[3], ARGV[1], ARGV[3])
+end
+local job = redis.call('HGET', KEYS[3], ARGV[1])
+if not job then
+    return 0
+end
+redis.call('ZADD', KEYS[4], 'NX', cjson.decode(job)['score'], ARGV[1])
+return 1
+"""
+
+_enqueue_script = None
+_claim_script = None
+_release_script = None
+
+
+def enqueue_pipeline_job(
+    meeting_id: str,
+    force: bool = False,
+    priority: Optional[int] = None,
+    clone_from: Optional[str] = None,
+    index_only: bool = False,
+) -> float:
+    """
+    Queues a meeting for the asyncio executor and returns its score.
+
+    The score is a virtual deadline: now, plus how far the meeting's duration lane
+    sits behind the short lane in PRIORITY_AGING_SECONDS steps. Ordering by it is
+    the same shortest-job-first with aging as the Celery priorities, without
+    having to rescore waiting meetings. A meeting already queued keeps its place;
+    `force` sticks once requested. A meeting a worker is running is not queued
+    a second time alongside it, but once that run is finished. `clone_from`
+    queues a clone of that completed meeting's results instead of a pipeline
+    run; `index_only` only rebuilds its transcript chunk index.
+    """
+    if priority is None and settings.PRIORITY_LANES_ENABLED:
+        db: Session = SessionLocal()
+        try:
+            priority = priority_for_meeting(db, meeting_id)
+        finally:
+            db.close()
+    score = time.time() + (deadline_offset_seconds(priority) if priority is not None else 0.0)
+
+    global _enqueue_script
+    if _enqueue_script is None:
+        _enqueue_script = get_redis().register_script(_ENQUEUE_LUA)
+    queued, score = _enqueue_script(
+        keys=[_QUEUE_KEY, _JOBS_KEY, _running_key(meeting_id)],
+        args=[meeting_id, repr(score), int(force), clone_from or "", int(index_only)],
+    )
+    score = float(score)
+    if queued:
+        logger.info("Queued meeting %s for the asyncio pipeline (force=%s, score=%.0f)", meeting_id, force, score)
+    else:
+        logger.info("Meeting %s is being processed; queued to run again once it finishes", meeting_id)
+    return score
+
+
+def claim_pipeline_job(worker: str) -> Optional[Dict[str, Any]]:
+    """Takes the most urgent queued meeting for `worker`, or None when the queue is empty."""
+    global _claim_script
+    if _claim_script is None:
+        _claim_script = get_redis().register_script(_CLAIM_LUA)
+    claimed = _claim_script(
+        keys=[_QUEUE_KEY, _JOBS_KEY, _in_flight_key(worker)],
+        args=[_RUNNING_PREFIX, worker, _claim_ttl()],
+    )
+    if not claimed:
+        return None
+    meeting_id, job = claimed
+    if isinstance(meeting_id, bytes):
+        meeting_id = meeting_id.decode()
+    return {"meeting_id": meeting_id, **json.loads(job)}
+
+
+def finish_pipeline_job(worker: str, meeting_id: str) -> None:
+    if _release(worker, meeting_id):
+        logger.info("Re-queued meeting %s, requested again while it was running", meeting_id)
+
+
+def refresh_pipeline_claims(worker: str) -> None:
+    """Extends `worker`'s claims on the meetings it is running; call well within ASYNC_PIPELINE_CLAIM_TTL_SECONDS."""
+    client = get_redis()
+    pipe = client.pipeline()
+    for meeting_id in client.hkeys(_in_flight_key(worker)):
+        meeting_id = meeting_id.decode() if isinstance(meeting_id, bytes) else meeting_id
+        pipe.expire(_running_key(meeting_id), _claim_ttl())
+    pipe.execute()
+
+
+def requeue_in_flight(worker: str) -> List[str]:
+    """
+    Puts meetings a previous run of `worker` claimed but never finished back on
+    the queue with their original scores; returns their ids.
+    """
+    requeued = []
+    for meeting_id, job in get_redis().hgetall(_in_flight_key(worker)).items():
+        meeting_id = meeting_id.decode() if isinstance(meeting_id, bytes) else meeting_id
+        if _release(worker, meeting_id, job):
+            requeued.append(meeting_id)
+    if requeued:
+        logger.warning("Re-queued %d meetings left in flight by worker %s", len(requeued), worker)
+    return requeued
+
+
+def pipeline_queue_depth() -> int:
+    return int(get_redis().zcard(_QUEUE_KEY))
+
+
+def _in_flight_key(worker: str) -> str:
+    return f"{_IN_FLIGHT_PREFIX}{worker}"
+
+
+def _running_key(meeting_id: str) -> str:
+    return f"{_RUNNING_PREFIX}{meeting_id}"
+
+
+def _claim_ttl() -> int:
+    return max(1, int(settings.ASYNC_PIPELINE_CLAIM_TTL_SECONDS))
+
+
+def _release(worker: str, meeting_id: str, job: Any = "") -> bool:
+    global _release_script
+    if _release_script is None:
+        _release_script = get_redis().register_script(_RELEASE_LUA)
+    return bool(
+        _release_script(
+            keys=[_in_flight_key(worker), _running_key(meeting_id), _JOBS_KEY, _QUEUE_KEY],
+            args=[meeting_id, worker, job],
+        )
+    )
@@ -0,0 +1,138 @@
+import json
+import time
+import base64
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.core.celery_app import PRIORITY_SEPARATOR, celery_app
+from app.core.config import settings
+from app.db.database import SessionLocal
+from .scheduling_service import priority_for_meeting
+
+logger = logging.getLogger(__name__)
+
+# Held by the worker running the current pass, so one pass runs per interval
+_LOCK_KEY = "pipeline:aging-lock"
+
+# Moves one message between priority lists, unless a worker consumed it since it
+# was read. Pushed to the consuming end, as it has waited longer than the
+# messages already there.
+_PROMOTE_LUA = """
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then
+    return 0
+end
+redis.call('RPUSH', KEYS[2], ARGV[2])
+return 1
+"""
+
+_promote_script = None
+_aging_thread: Optional[threading.Thread] = None
+
+
+@lru_cache(maxsize=1)
+def _broker_client() -> Optional[redis.Redis]:
+    url = celery_app.conf.broker_url
+    if not url.startswith(("redis://", "rediss://")):
+        return None
+    return redis.Redis.from_url(
+        url,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    )
+
+
+def _priority_list(queue: str, step: int) -> str:
+    return f"{queue}{PRIORITY_SEPARATOR}{step}" if step else queue
+
+
+def _message_meeting_id(message: Dict[str, Any]) -> Optional[str]:
+    headers = message.get("headers") or {}
+    if not str(headers.get("task") or "").startswith("pipeline.") or message.get("content-type") != "application/json":
+        return None
+    body = message.get("body")
+    if (message.get("properties") or {}).get("body_encoding") == "base64":
+        body = base64.b64decode(body)
+    payload = json.loads(body)
+    task_kwargs = payload[1] if isinstance(payload, list) else payload.get("kwargs", {})
+    return (task_kwargs or {}).get("meeting_id")
+
+
+def promote_aged_tasks() -> int:
+    """
+    Re-prioritises pipeline tasks already waiting on the broker.
+
+    A task's priority is set when it is published, so a long meeting queued at
+    a low priority would otherwise keep it while short uploads are served
+    ahead of it. Each waiting pipeline task is moved to the priority its
+    meeting has aged into since (see `meeting_priority`). Returns the number of
+    tasks moved; only the Redis broker is supported.
+    """
+    global _promote_script
+    client = _broker_client()
+    if client is None:
+        return 0
+    if _promote_script is None:
+        _promote_script = client.register_script(_PROMOTE_LUA)
+
+    steps = sorted(celery_app.conf.broker_transport_options.get("priority_steps") or [0])
+    priorities: Dict[str, Optional[int]] = {}
+    moved = 0
+    db: Session = SessionLocal()
+    try:
+        for queue in (queue.name for queue in celery_app.conf.task_queues):
+            for step in steps[1:]:
+                source = _priority_list(queue, step)
+                for raw in client.lrange(source, 0, -1):
+                    try:
+                        message = json.loads(raw)
+                        meeting_id = _message_meeting_id(message)
+                    except Exception as exc:
+                        logger.debug("Skipping unreadable message in %r: %s", source, exc)
+                        continue
+                    if not meeting_id:
+                        continue
+                    if meeting_id not in priorities:
+                        priorities[meeting_id] = priority_for_meeting(db, meeting_id)
+                    priority = priorities[meeting_id]
+                    if priority is None or priority >= step:
+                        continue
+                    target = max(candidate for candidate in steps if candidate <= priority)
+                    message["properties"]["priority"] = priority
+                    moved += _promote_script(
+                        keys=[source, _priority_list(queue, target)], args=[raw, json.dumps(message)]
+                    )
+    finally:
+        db.close()
+    return moved
+
+
+def _run_aging_loop(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            client = _broker_client()
+            if client is None or not client.set(_LOCK_KEY, 1, nx=True, ex=max(1, int(interval))):
+                continue
+            moved = promote_aged_tasks()
+            if moved:
+                logger.info("Promoted %d waiting pipeline tasks to their aged priority", moved)
+        except Exception as exc:
+            logger.warning("Priority aging pass failed: %s", exc)
+
+
+def start_priority_aging() -> None:
+    """Starts the periodic aging pass in this process (once); workers share it through a Redis lock."""
+    global _aging_thread
+    if _aging_thread is not None or not settings.PRIORITY_LANES_ENABLED or settings.PRIORITY_AGING_SECONDS <= 0:
+        return
+    if _broker_client() is None:
+        return
+    interval = max(1.0, settings.PRIORITY_AGING_CHECK_SECONDS)
+    _aging_thread = threading.Thread(target=_run_aging_loop, args=(interval,), name="priority-aging", daemon=True)
+    _aging_thread.start()
+    logger.info("Re-prioritising waiting pipeline tasks every %.0fs", interval)
@@ -1,127 +1,788 @@
 import os
+import json
+import time
 import uuid
 import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from billiard.process import current_process
+from celery import Task, chain, chord
+from celery.signals import before_task_publish, worker_process_init, worker_ready
 from sqlalchemy.orm import Session
 
 from app.db.database import SessionLocal
-from app.db.models import Meeting, MeetingStatus
+from app.db.models import Meeting, MeetingStage, MeetingStatus, StageStatus
 from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.metrics import AUDIO_PREPROCESS_BYTES, PIPELINE_STAGE_SECONDS, start_metrics_exporter
 
-from .transcription_service import transcribe_audio_file, merge_transcription_and_diarization
-from .llm_service import generate_meeting_insights
-from .graph_service import upsert_meeting_graph
+from .audio_service import preprocess_audio
+from .transcription_service import (
+    transcribe_audio_file,
+    transcribe_audio_file_chunked,
+    merge_transcription_and_diarization,
+)
+from .llm_service import INSIGHT_PROMPTS, generate_meeting_insights, insight_placeholders, warm_llm_clients
+from .graph_service import fetch_transcript_chunks, replace_transcript_chunks, upsert_meeting_graph
+from .retrieval_service import index_meeting_transcript
+from .scheduling_service import priority_for_meeting
+from .priority_aging import start_priority_aging
+from .chat_cache import invalidate_chat_context
+from .progress_service import PIPELINE_STAGE, increment_progress_counter, publish_progress
+from .pipeline_queue import enqueue_pipeline_job
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(
-    name="process_meeting_file",
-    bind=True,
-    autoretry_for=(Exception,),
-    retry_kwargs={"max_retries": 3, "countdown": 60},
-)
-def process_meeting_file(self, meeting_id: str):
+@worker_process_init.connect
+@worker_ready.connect
+def _warm_worker_clients(**kwargs):
+    # worker_process_init fires in prefork children, worker_ready in eventlet/solo workers.
+    warm_llm_clients()
+
+
+@worker_process_init.connect
+def _start_child_metrics_exporter(**kwargs):
+    # Prefork children each keep their own metrics, on the ports after the worker's.
+    if settings.METRICS_WORKER_PORT:
+        start_metrics_exporter(settings.METRICS_WORKER_PORT + 1 + (current_process().index or 0))
+
+
+@worker_ready.connect
+def _start_metrics_exporter(**kwargs):
+    start_metrics_exporter(settings.METRICS_WORKER_PORT)
+
+
+@worker_ready.connect
+def _start_priority_aging(**kwargs):
+    # Priorities are set at publish; this keeps raising those of waiting tasks.
+    start_priority_aging()
+
+
+@before_task_publish.connect
+def _assign_priority_lane(sender=None, body=None, properties=None, **kwargs):
+    # Every stage is published separately (chain links, chord callbacks, retries),
+    # so each one is prioritised by the meeting's duration lane and age at that moment.
+    if not settings.PRIORITY_LANES_ENABLED or not (sender or "").startswith("pipeline.") or properties is None:
+        return
+    task_kwargs = body[1] if isinstance(body, (tuple, list)) else (body or {}).get("kwargs", {})
+    meeting_id = (task_kwargs or {}).get("meeting_id")
+    if not meeting_id:
+        return
+    db: Session = SessionLocal()
+    try:
+        priority = priority_for_meeting(db, meeting_id)
+    except Exception as exc:
+        logger.warning(f"Could not compute priority for meeting {meeting_id}: {exc}")
+        return
+    finally:
+        db.close()
+    if priority is not None:
+        properties["priority"] = priority
+
+
+class PipelineTask(Task):
     """
-    The main Celery task that orchestrates the entire AI pipeline:
-    1. Transcribes audio with Deepgram API (includes diarization)
-    2. Formats transcript with speaker labels
-    3. Generates AI insights from the final transcript
-    4. Stores structured insights in the Neo4j knowledge graph
+    Base class for pipeline stage tasks. Stage tasks take `meeting_id` as a keyword
+    argument. A failing stage is retried on its own (earlier stages are
+    checkpointed and not repeated); once its retries are exhausted the meeting is
+    marked FAILED so it never sits in PROCESSING after the workflow has stopped.
     """
-    logger.info(f"Starting AI pipeline for meeting_id: {meeting_id}")
 
+    autoretry_for = (Exception,)
+    # A missing meeting will not appear on retry
+    dont_autoretry_for = (ValueError,)
+    retry_kwargs = {"max_retries": 3, "countdown": 60}
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        meeting_id = kwargs.get("meeting_id")
+        logger.error(f"Pipeline stage {self.name} failed for meeting {meeting_id}: {exc}")
+        if meeting_id:
+            mark_meeting_failed(meeting_id, exc)
+
+
+def mark_meeting_failed(meeting_id: str, exc: Exception) -> None:
+    """Marks an unfinished meeting FAILED and ends its progress stream."""
     db: Session = SessionLocal()
+    try:
+        meeting = db.query(Meeting).filter(Meeting.id == uuid.UUID(meeting_id)).first()
+        if meeting and meeting.status != MeetingStatus.COMPLETED:
+            meeting.status = MeetingStatus.FAILED
+            db.commit()
+            publish_progress(meeting_id, PIPELINE_STAGE, "failed", error=str(exc)[:500])
+    except Exception as status_exc:
+        logger.error(f"Failed to mark meeting {meeting_id} as FAILED: {status_exc}")
+    finally:
+        db.close()
+
+
+# MeetingStage.queue for stages run by the asyncio executor (async_worker.py)
+ASYNC_EXECUTOR_QUEUE = "asyncio"
+
+
+@contextmanager
+def _record_stage(db: Session, task: Optional[Task], meeting_id: str, stage: str):
+    """
+    Records a MeetingStage row with the stage's queue, timing and outcome.
+    `task` is None for stages run by the asyncio executor.
+    """
+    delivery_info = (getattr(task.request, "delivery_info", None) or {}) if task is not None else {}
+    row = MeetingStage(
+        meeting_id=uuid.UUID(meeting_id),
+        stage=stage,
+        queue=delivery_info.get("routing_key") if task is not None else ASYNC_EXECUTOR_QUEUE,
+        task_id=task.request.id if task is not None else None,
+        status=StageStatus.RUNNING,
+        started_at=datetime.utcnow(),
+    )
+    db.add(row)
+    db.commit()
+    publish_progress(meeting_id, stage, "running")
+
+    started = time.perf_counter()
+    try:
+        yield row
+        row.status = StageStatus.COMPLETED
+    except Exception as exc:
+        db.rollback()
+        row.status = StageStatus.FAILED
+        row.error = str(exc)[:2000]
+        raise
+    finally:
+        row.finished_at = datetime.utcnow()
+        row.duration_seconds = time.perf_counter() - started
+        db.commit()
+        PIPELINE_STAGE_SECONDS.labels(
+            stage=stage, queue=row.queue or "none", status=row.status.value.lower()
+        ).observe(row.duration_seconds)
+        publish_progress(meeting_id, stage, row.status.value.lower(), duration_seconds=row.duration_seconds)
+        logger.info(
+            "Stage %s for meeting %s %s in %.2fs",
+            stage,
+            meeting_id,
+            row.status.value.lower(),
+            row.duration_seconds,
+        )
+
+
+def _get_meeting(db: Session, meeting_id: str) -> Meeting:
     meeting = db.query(Meeting).filter(Meeting.id == uuid.UUID(meeting_id)).first()
     if not meeting:
-        logger.error(f"Meeting with id {meeting_id} not found in database.")
+        raise ValueError(f"Meeting with id {meeting_id} not found in database.")
+    return meeting
+
+
+def _completed_stage(db: Session, meeting_id: str, stage: str) -> Optional[MeetingStage]:
+    return (
+        db.query(MeetingStage)
+        .filter(
+            MeetingStage.meeting_id == uuid.UUID(meeting_id),
+            MeetingStage.stage == stage,
+            MeetingStage.status == StageStatus.COMPLETED,
+        )
+        .order_by(MeetingStage.finished_at.desc())
+        .first()
+    )
+
+
+def _stage_output(db: Session, meeting_id: str, stage: str) -> Optional[Dict[str, Any]]:
+    row = _completed_stage(db, meeting_id, stage)
+    return json.loads(row.output) if row and row.output else None
+
+
+def _checkpointed_insights(db: Session, meeting_id: str) -> Dict[str, str]:
+    """Merges the outputs of every completed insight stage (per-prompt or combined)."""
+    rows = (
+        db.query(MeetingStage)
+        .filter(
+            MeetingStage.meeting_id == uuid.UUID(meeting_id),
+            MeetingStage.stage.like("insight%"),
+            MeetingStage.status == StageStatus.COMPLETED,
+        )
+        .order_by(MeetingStage.finished_at)
+        .all()
+    )
+    insights: Dict[str, str] = {}
+    for row in rows:
+        if row.output:
+            insights.update(json.loads(row.output))
+    return insights
+
+
+def failed_insight_keys(db: Session, meeting_id: str) -> List[str]:
+    """
+    Insight sections whose stage failed without a completed checkpoint since:
+    a completed meeting stores placeholders for them until it is resumed.
+    """
+    checkpoint = _checkpointed_insights(db, meeting_id)
+    stages = (
+        db.query(MeetingStage.stage)
+        .filter(
+            MeetingStage.meeting_id == uuid.UUID(meeting_id),
+            MeetingStage.stage.like("insight%"),
+            MeetingStage.status == StageStatus.FAILED,
+        )
+        .distinct()
+    )
+    keys: List[str] = []
+    for (stage,) in stages:
+        stage_keys = list(INSIGHT_PROMPTS) if stage == "insights" else [stage.split(":", 1)[1]]
+        keys.extend(key for key in stage_keys if key not in checkpoint and key not in keys)
+    return keys
+
+
+# Insight key -> Meeting column
+_INSIGHT_COLUMNS = {
+    "abstract_summary": "summary",
+    "key_points": "key_points",
+    "action_items": "action_items",
+    "sentiment_analysis": "sentiment",
+    "tags": "tags",
+    "knowledge_graph": "knowledge_graph",
+}
+
+
+def _insight_batches() -> List[List[str]]:
+    # Combined mode is a single structured call, so it stays one task.
+    if settings.LLM_INSIGHTS_MODE == "combined":
+        return [list(INSIGHT_PROMPTS)]
+    return [[key] for key in INSIGHT_PROMPTS]
+
+
+def build_meeting_workflow(meeting_id: str, force: bool = False):
+    """
+    The meeting pipeline as a Celery canvas:
+
+        preprocess -> transcribe -> chord(insight per prompt) -> persist
+
+    Each stage is routed to its own queue (see `task_routes` in celery_app).
+    Stages with a completed checkpoint are left out (transcription) or return
+    their checkpointed output (insights, graph sync), unless `force` is set.
+    """
+    db: Session = SessionLocal()
+    try:
+        transcribed = not force and _is_transcribed(db, meeting_id)
+    finally:
         db.close()
-        return
 
-    original_file_path = meeting.file_path
+    steps = []
+    if not transcribed:
+        steps.append(preprocess_meeting_audio.si(meeting_id=meeting_id, force=force))
+        steps.append(transcribe_meeting.si(meeting_id=meeting_id, force=force))
+    steps.append(
+        chord(
+            [generate_meeting_insight.si(meeting_id=meeting_id, keys=keys, force=force) for keys in _insight_batches()],
+            persist_meeting_insights.s(meeting_id=meeting_id, force=force),
+        )
+    )
+    return chain(*steps)
+
+
+def _is_transcribed(db: Session, meeting_id: str) -> bool:
+    meeting = _get_meeting(db, meeting_id)
+    return bool(meeting.transcript) and _completed_stage(db, meeting_id, "transcribe") is not None
+
+
+@celery_app.task(name="process_meeting_file")
+def process_meeting_file(meeting_id: str, force: bool = False):
+    """
+    Starts (or resumes) the staged workflow for a meeting.
+    0. Re-encodes the upload to compact mono speech audio with FFmpeg (audio queue)
+    1. Transcribes audio with Deepgram API, including diarization (transcription queue)
+    2. Formats transcript with speaker labels (transcription queue)
+    3. Generates AI insights, one task per prompt (llm queue)
+    4. Stores insights in SQL and the Neo4j knowledge graph and indexes
+       transcript chunks for chat retrieval (graph queue)
+
+    Completed stages are checkpointed in meeting_stages, so running this again
+    after a failure only redoes the unfinished stages; `force` redoes everything.
+    """
+    logger.info(f"Starting AI pipeline for meeting_id: {meeting_id}")
+    workflow = build_meeting_workflow(meeting_id, force=force).apply_async()
+    return {"status": "queued", "meeting_id": meeting_id, "workflow_id": workflow.id}
+
+
+def enqueue_meeting_processing(meeting_id: str, force: bool = False) -> str:
+    """
+    Queues a meeting on the configured executor (PIPELINE_EXECUTOR) and returns
+    an id for logging: the Celery task id, or the asyncio queue name.
+    """
+    if settings.PIPELINE_EXECUTOR == "asyncio":
+        enqueue_pipeline_job(meeting_id, force=force)
+        return ASYNC_EXECUTOR_QUEUE
+    return process_meeting_file.delay(meeting_id, force=force).id
+
 
+@celery_app.task(name="pipeline.preprocess", bind=True, base=PipelineTask)
+def preprocess_meeting_audio(self, meeting_id: str, force: bool = False) -> Dict[str, Any]:
+    db: Session = SessionLocal()
     try:
+        meeting = _get_meeting(db, meeting_id)
         meeting.status = MeetingStatus.PROCESSING
         db.commit()
         logger.info(f"Status updated to PROCESSING for meeting {meeting_id}")
 
-        # --- Step 1: Transcribe with Deepgram (includes diarization) ---
-        logger.info(f"Starting Deepgram transcription with diarization for {meeting.file_path}")
-        transcription_df = transcribe_audio_file(meeting.file_path)
+        checkpoint = _reusable_preprocess(db, meeting_id, force)
+        if checkpoint:
+            return checkpoint
 
-        # --- Step 2: Merge transcription and diarization (Deepgram provides both) ---
-        logger.info("Merging transcription and diarization results...")
-        speaker_labeled_transcript = merge_transcription_and_diarization(transcription_df)
-        meeting.transcript = speaker_labeled_transcript
-        db.commit()
-        logger.info(f"Successfully created speaker-labeled transcript for meeting {meeting_id}")
+        with _record_stage(db, self, meeting_id, "preprocess") as stage:
+            # --- Step 0: Strip video and re-encode to mono speech audio ---
+            audio = preprocess_audio(meeting.file_path, encoded_audio_prefix(meeting))
+            _record_preprocessed(meeting_id, audio)
+            stage.output = json.dumps(audio)
+        return audio
+    finally:
+        db.close()
 
-        # --- Step 3: Generate AI Insights ---
-        logger.info("Generating AI insights...")
-        insights = generate_meeting_insights(meeting.transcript)
 
-        meeting.summary = insights.get("abstract_summary")
-        meeting.key_points = insights.get("key_points")
-        meeting.action_items = insights.get("action_items")
-        meeting.sentiment = insights.get("sentiment_analysis")
-        meeting.tags = insights.get("tags")
-        meeting.knowledge_graph = insights.get("knowledge_graph")
+def _reusable_preprocess(db: Session, meeting_id: str, force: bool) -> Optional[Dict[str, Any]]:
+    checkpoint = None if force else _stage_output(db, meeting_id, "preprocess")
+    if checkpoint and os.path.exists(checkpoint["path"]):
+        logger.info(f"Reusing preprocessed audio for meeting {meeting_id}")
+        return checkpoint
+    return None
 
-        db.commit()
-        logger.info(f"Successfully generated AI insights for meeting {meeting_id}")
 
-        # --- Step 4: Persist to knowledge graph ---
+def encoded_audio_prefix(meeting: Meeting) -> str:
+    # Per meeting: concurrent re-uploads of one recording share the upload file.
+    return os.path.join(os.path.dirname(meeting.file_path), str(meeting.id))
+
+
+def _record_preprocessed(meeting_id: str, audio: Dict[str, Any]) -> None:
+    AUDIO_PREPROCESS_BYTES.labels(direction="input").inc(audio.get("input_bytes") or 0)
+    AUDIO_PREPROCESS_BYTES.labels(direction="output").inc(audio.get("output_bytes") or 0)
+    if audio["encoded"]:
+        logger.info(
+            "Preprocessed audio for meeting %s: %d -> %d bytes (%.1fx smaller, %s) in %.2fs",
+            meeting_id,
+            audio["input_bytes"],
+            audio["output_bytes"],
+            audio["input_bytes"] / max(audio["output_bytes"], 1),
+            audio["codec"],
+            audio["encode_seconds"],
+        )
+
+
+def _transcription_audio(db: Session, meeting: Meeting) -> Dict[str, Any]:
+    """The preprocessed audio checkpoint, or the original upload when there is none."""
+    audio = _stage_output(db, str(meeting.id), "preprocess") or {"path": meeting.file_path, "encoded": False}
+    if not os.path.exists(audio["path"]):
+        audio = {"path": meeting.file_path, "encoded": False}
+    return audio
+
+
+@celery_app.task(name="pipeline.transcribe", bind=True, base=PipelineTask)
+def transcribe_meeting(self, meeting_id: str, force: bool = False) -> str:
+    db: Session = SessionLocal()
+    try:
+        meeting = _get_meeting(db, meeting_id)
+        if not force and _is_transcribed(db, meeting_id):
+            logger.info(f"Transcript for meeting {meeting_id} already checkpointed; skipping transcription")
+            return meeting_id
+
+        audio = _transcription_audio(db, meeting)
+
+        with _record_stage(db, self, meeting_id, "transcribe"):
+            # --- Step 1: Transcribe with Deepgram (includes diarization) ---
+            logger.info(f"Starting Deepgram transcription with diarization for {audio['path']}")
+            if settings.TRANSCRIPTION_CHUNKING_ENABLED:
+                word_table = transcribe_audio_file_chunked(
+                    audio["path"],
+                    on_progress=lambda done, total: publish_progress(meeting_id, "transcribe", "running", done / total),
+                )
+            else:
+                word_table = transcribe_audio_file(audio["path"])
+
+            # --- Step 2: Merge transcription and diarization (Deepgram provides both) ---
+            logger.info("Merging transcription and diarization results...")
+            meeting.transcript = merge_transcription_and_diarization(word_table)
+            db.commit()
+            logger.info(f"Successfully created speaker-labeled transcript for meeting {meeting_id}")
+
+        # The encoded audio is only needed for transcription; it is kept after a
+        # failure so a retry can reuse it.
+        if audio["encoded"]:
+            _remove_file(audio["path"], "encoded audio")
+        return meeting_id
+    finally:
+        db.close()
+
+
+@celery_app.task(name="pipeline.insight", bind=True, base=PipelineTask)
+def generate_meeting_insight(self, meeting_id: str, keys: List[str], force: bool = False) -> Dict[str, str]:
+    db: Session = SessionLocal()
+    try:
+        meeting = _get_meeting(db, meeting_id)
+        if not force:
+            checkpoint = _checkpointed_insights(db, meeting_id)
+            if all(key in checkpoint for key in keys):
+                logger.info(f"Reusing checkpointed insights {', '.join(keys)} for meeting {meeting_id}")
+                _publish_insight_progress(meeting_id, self.request.root_id, keys)
+                return {key: checkpoint[key] for key in keys}
+
         try:
-            upsert_meeting_graph(
-                {
-                    "id": str(meeting.id),
-                    "original_filename": meeting.original_filename,
-                    "saved_filename": meeting.saved_filename,
-                    "created_at": meeting.created_at.isoformat() if meeting.created_at else None,
-                    "updated_at": meeting.updated_at.isoformat() if meeting.updated_at else None,
-                    "status": meeting.status.value if meeting.status else None,
-                    "summary": meeting.summary,
-                    "key_points": meeting.key_points,
-                    "action_items": meeting.action_items,
-                    "sentiment": meeting.sentiment,
-                    "tags": meeting.tags,
-                    "transcript": meeting.transcript,
-                    "knowledge_graph": meeting.knowledge_graph,
-                }
-            )
-            logger.info("Synced meeting %s to Neo4j graph", meeting_id)
-        except Exception as graph_exc:
-            logger.error(
-                "Failed to persist meeting %s to Neo4j graph: %s",
-                meeting_id,
-                graph_exc,
-            )
+            with _record_stage(db, self, meeting_id, _insight_stage_name(keys)) as stage:
+                # --- Step 3: Generate AI Insights ---
+                logger.info(f"Generating AI insights {', '.join(keys)} for meeting {meeting_id}")
+                if len(keys) == len(INSIGHT_PROMPTS):
+                    insights = generate_meeting_insights(meeting.transcript)
+                else:
+                    insights = generate_meeting_insights(meeting.transcript, keys=keys)
+                stage.output = json.dumps(insights)
+        except Exception as exc:
+            if isinstance(exc, ValueError) or self.request.retries < self.retry_kwargs["max_retries"]:
+                raise
+            # Out of retries: the stage stays FAILED (so a resume regenerates it) and
+            # the meeting completes with placeholders instead of failing the chord.
+            logger.error(f"Giving up on insights {', '.join(keys)} for meeting {meeting_id}: {exc}")
+            insights = insight_placeholders(keys, exc)
+        _publish_insight_progress(meeting_id, self.request.root_id, keys)
+        return insights
+    finally:
+        db.close()
+
+
+def _insight_stage_name(keys: List[str]) -> str:
+    return f"insight:{keys[0]}" if len(keys) == 1 else "insights"
 
-        # --- Final Step: Mark as COMPLETED ---
-        meeting.status = MeetingStatus.COMPLETED
+
+def _publish_insight_progress(meeting_id: str, run_id: Optional[str], keys: List[str]) -> None:
+    # Insight stages of one run share its id (the workflow's root task id), which scopes the counter.
+    done = increment_progress_counter(meeting_id, run_id, len(keys))
+    if done is None:
+        return
+    total = len(INSIGHT_PROMPTS)
+    publish_progress(
+        meeting_id,
+        "insights",
+        "running",
+        min(done, total) / total,
+        message=f"Generating insights {min(done, total)}/{total}",
+    )
+
+
+@celery_app.task(name="pipeline.persist", bind=True, base=PipelineTask)
+def persist_meeting_insights(
+    self,
+    insight_parts: List[Dict[str, str]],
+    meeting_id: str,
+    force: bool = False,
+) -> Dict[str, str]:
+    db: Session = SessionLocal()
+    try:
+        meeting = _get_meeting(db, meeting_id)
+        insights: Dict[str, str] = {}
+        for part in insight_parts:
+            insights.update(part or {})
+
+        _persist_insights(db, self, meeting, insights)
+
+        # --- Step 4: Persist to knowledge graph ---
+        # Graph sync and chunk indexing are checkpointed separately and are not fatal:
+        # a failure is recorded on its stage and retried on the next resume.
+        if force or _graph_sync_is_stale(db, meeting_id):
+            try:
+                _sync_meeting_graph(db, self, meeting)
+            except Exception as graph_exc:
+                logger.error(
+                    "Failed to persist meeting %s to Neo4j graph: %s",
+                    meeting_id,
+                    graph_exc,
+                )
+
+        # --- Step 5: Index timestamped transcript chunks for chat retrieval ---
+        # Chunks only depend on the transcript, so they are rebuilt when it changed.
+        if settings.CHAT_RETRIEVAL_ENABLED and _chunk_index_is_stale(db, meeting_id):
+            try:
+                _index_meeting_chunks(db, self, meeting)
+            except Exception as index_exc:
+                logger.error("Failed to index transcript chunks for meeting %s: %s", meeting_id, index_exc)
+
+        _complete_meeting(db, meeting)
+        return {"status": "success", "meeting_id": meeting_id}
+    finally:
+        db.close()
+
+
+def _persist_insights(db: Session, task: Optional[Task], meeting: Meeting, insights: Dict[str, str]) -> None:
+    with _record_stage(db, task, str(meeting.id), "persist"):
+        # A partial (backfill) run only carries the prompts it re-ran
+        for key, column in _INSIGHT_COLUMNS.items():
+            if key in insights:
+                setattr(meeting, column, insights[key])
         db.commit()
-        logger.info(f"Pipeline finished successfully for meeting {meeting_id}.")
+        logger.info(f"Successfully generated AI insights for meeting {meeting.id}")
 
-    except Exception as e:
-        logger.error(f"An error occurred in the pipeline for meeting {meeting_id}: {e}", exc_info=True)
-        if meeting:
-            meeting.status = MeetingStatus.FAILED
-            db.commit()
 
+def _complete_meeting(db: Session, meeting: Meeting) -> None:
+    # --- Final Step: Mark as COMPLETED ---
+    meeting.status = MeetingStatus.COMPLETED
+    # The first completion only: re-runs (resume, backfill) would skew the latency stats.
+    if meeting.completed_at is None:
+        meeting.completed_at = datetime.utcnow()
+    db.commit()
+    publish_progress(str(meeting.id), PIPELINE_STAGE, "completed")
+    logger.info(f"Pipeline finished successfully for meeting {meeting.id}.")
+
+    _remove_upload(db, meeting)
+
+
+def _remove_upload(db: Session, meeting: Meeting) -> None:
+    # Uploads are stored by content hash, so re-uploads still being processed may share the file.
+    shared = (
+        db.query(Meeting.id)
+        .filter(
+            Meeting.file_path == meeting.file_path,
+            Meeting.id != meeting.id,
+            Meeting.status != MeetingStatus.COMPLETED,
+        )
+        .first()
+    )
+    if shared:
+        logger.info(f"Keeping upload {meeting.file_path}, still needed by meeting {shared.id}")
+        return
+    _remove_file(meeting.file_path, "temporary file")
+
+
+def find_completed_duplicate(db: Session, content_hash: str) -> Optional[Meeting]:
+    """The most recently completed meeting whose upload had the same SHA-256, if any."""
+    return (
+        db.query(Meeting)
+        .filter(Meeting.content_hash == content_hash, Meeting.status == MeetingStatus.COMPLETED)
+        .order_by(Meeting.completed_at.desc())
+        .first()
+    )
+
+
+def enqueue_meeting_clone(meeting_id: str, source_meeting_id: str) -> str:
+    """
+    Queues the cloning of a completed meeting's results into a new upload of the
+    same recording on the configured executor; returns an id as
+    enqueue_meeting_processing does.
+    """
+    if settings.PIPELINE_EXECUTOR == "asyncio":
+        enqueue_pipeline_job(meeting_id, clone_from=source_meeting_id)
+        return ASYNC_EXECUTOR_QUEUE
+    return clone_meeting.delay(meeting_id=meeting_id, source_meeting_id=source_meeting_id).id
+
+
+@celery_app.task(name="pipeline.clone", bind=True, base=PipelineTask)
+def clone_meeting(self, meeting_id: str, source_meeting_id: str) -> str:
+    """Completes a duplicate upload from an earlier meeting's results (see clone_meeting_results)."""
+    db: Session = SessionLocal()
+    try:
+        meeting = _get_meeting(db, meeting_id)
+        source = _get_meeting(db, source_meeting_id)
+        meeting.status = MeetingStatus.PROCESSING
+        db.commit()
+        clone_meeting_results(db, self, meeting, source)
+        return meeting_id
     finally:
+        db.close()
+
+
+def clone_meeting_results(db: Session, task: Optional[Task], meeting: Meeting, source: Meeting) -> None:
+    """
+    Completes a meeting from the results of `source`, a completed meeting of the
+    same recording, instead of running the pipeline: the transcript and insights
+    are copied, the meeting is synced to the graph and the source's transcript
+    chunks (with their embeddings) are copied, so no Deepgram, LLM or embedding
+    call is made. Graph sync and chunk copy are not fatal, as in the pipeline;
+    chat queues indexing for a meeting it finds without chunks. The upload is
+    kept until then, so a failed clone can still be resumed as a normal run.
+    """
+    meeting_id = str(meeting.id)
+    with _record_stage(db, task, meeting_id, "clone") as stage:
+        meeting.transcript = source.transcript
+        for column in _INSIGHT_COLUMNS.values():
+            setattr(meeting, column, getattr(source, column))
+        if meeting.duration_seconds is None:
+            meeting.duration_seconds = source.duration_seconds
+        stage.output = json.dumps({"source_meeting_id": str(source.id)})
+    logger.info(f"Cloned results of meeting {source.id} into meeting {meeting_id}")
+
+    try:
+        with _record_stage(db, task, meeting_id, "graph_sync"):
+            upsert_meeting_graph(_graph_payload(meeting))
+    except Exception as graph_exc:
+        logger.error("Failed to persist meeting %s to Neo4j graph: %s", meeting_id, graph_exc)
+
+    if settings.CHAT_RETRIEVAL_ENABLED:
         try:
-            if (
-                meeting
-                and meeting.status == MeetingStatus.COMPLETED
-                and original_file_path
-                and os.path.exists(original_file_path)
-            ):
-                os.remove(original_file_path)
-                logger.info(f"Removed temporary file at {original_file_path} after successful processing.")
-        except Exception as cleanup_error:
-            logger.warning(f"Failed to remove temporary file at {original_file_path}: {cleanup_error}")
-        finally:
-            db.close()
-
-    return {"status": "success", "meeting_id": meeting_id}
+            chunks = fetch_transcript_chunks(str(source.id))
+            if chunks:
+                with _record_stage(db, task, meeting_id, "index_chunks"):
+                    replace_transcript_chunks(meeting_id, chunks)
+        except Exception as index_exc:
+            logger.error("Failed to copy transcript chunks for meeting %s: %s", meeting_id, index_exc)
+
+    _complete_meeting(db, meeting)
+
+
+@celery_app.task(name="pipeline.graph_sync", bind=True, base=PipelineTask)
+def sync_meeting_graph(self, meeting_id: str) -> str:
+    """Re-syncs a processed meeting to the Neo4j graph (backfills after a graph schema change)."""
+    db: Session = SessionLocal()
+    try:
+        _sync_meeting_graph(db, self, _get_meeting(db, meeting_id))
+        return meeting_id
+    finally:
+        db.close()
+
+
+def enqueue_meeting_indexing(meeting_id: str) -> str:
+    """
+    Queues a rebuild of a meeting's transcript chunk index on the configured
+    executor; returns an id as enqueue_meeting_processing does.
+    """
+    if settings.PIPELINE_EXECUTOR == "asyncio":
+        enqueue_pipeline_job(meeting_id, index_only=True)
+        return ASYNC_EXECUTOR_QUEUE
+    return index_meeting_chunks.delay(meeting_id=meeting_id).id
+
+
+@celery_app.task(name="pipeline.index_chunks", bind=True, base=PipelineTask)
+def index_meeting_chunks(self, meeting_id: str) -> str:
+    """Rebuilds a meeting's transcript chunk index for chat retrieval."""
+    db: Session = SessionLocal()
+    try:
+        _index_meeting_chunks(db, self, _get_meeting(db, meeting_id))
+        return meeting_id
+    finally:
+        db.close()
+
+
+def _sync_meeting_graph(db: Session, task: Task, meeting: Meeting) -> None:
+    with _record_stage(db, task, str(meeting.id), "graph_sync"):
+        upsert_meeting_graph(_graph_payload(meeting))
+    # Only pipeline writes change the graph (the API's syncs re-write the same
+    # data), so only they drop the compiled chat context built from it.
+    invalidate_chat_context(str(meeting.id))
+    logger.info("Synced meeting %s to Neo4j graph", meeting.id)
+
+
+def _graph_payload(meeting: Meeting) -> Dict[str, Any]:
+    return {
+        "id": str(meeting.id),
+        "original_filename": meeting.original_filename,
+        "saved_filename": meeting.saved_filename,
+        "created_at": meeting.created_at.isoformat() if meeting.created_at else None,
+        "updated_at": meeting.updated_at.isoformat() if meeting.updated_at else None,
+        "status": meeting.status.value if meeting.status else None,
+        "summary": meeting.summary,
+        "key_points": meeting.key_points,
+        "action_items": meeting.action_items,
+        "sentiment": meeting.sentiment,
+        "tags": meeting.tags,
+        "transcript": meeting.transcript,
+        "knowledge_graph": meeting.knowledge_graph,
+    }
+
+
+def _index_meeting_chunks(db: Session, task: Task, meeting: Meeting) -> None:
+    with _record_stage(db, task, str(meeting.id), "index_chunks"):
+        index_meeting_transcript(str(meeting.id), meeting.transcript)
+
+
+def _graph_sync_is_stale(db: Session, meeting_id: str) -> bool:
+    # Insights regenerated since the last sync (e.g. a resumed failed prompt) change the graph.
+    synced = _completed_stage(db, meeting_id, "graph_sync")
+    if synced is None:
+        return True
+    generated = (
+        db.query(MeetingStage.finished_at)
+        .filter(
+            MeetingStage.meeting_id == uuid.UUID(meeting_id),
+            MeetingStage.stage.like("insight%"),
+            MeetingStage.status == StageStatus.COMPLETED,
+        )
+        .order_by(MeetingStage.finished_at.desc())
+        .first()
+    )
+    return generated is not None and generated.finished_at > synced.finished_at
+
+
+def _chunk_index_is_stale(db: Session, meeting_id: str) -> bool:
+    indexed = _completed_stage(db, meeting_id, "index_chunks")
+    if indexed is None:
+        return True
+    transcribed = _completed_stage(db, meeting_id, "transcribe")
+    return transcribed is not None and transcribed.finished_at > indexed.finished_at
+
+
+# Stage names accepted by build_reprocess_workflow, besides individual prompt keys
+REPROCESS_STAGES = ("transcribe", "insights", "graph", "index")
+
+
+def build_reprocess_workflow(meeting_id: str, stages: List[str]):
+    """
+    Re-runs selected stages of an already processed meeting:
+
+    - "transcribe": the whole pipeline, forced (needs the uploaded file)
+    - "insights" or individual prompt keys (e.g. "tags"): those prompts, then
+      persist, which also re-syncs the graph
+    - "graph": only the Neo4j graph sync
+    - "index": only the transcript chunk index
+    """
+    unknown = set(stages) - set(REPROCESS_STAGES) - set(INSIGHT_PROMPTS)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+    if "transcribe" in stages:
+        return build_meeting_workflow(meeting_id, force=True)
+
+    steps = []
+    keys = [key for key in INSIGHT_PROMPTS if "insights" in stages or key in stages]
+    if keys:
+        batches = _insight_batches() if len(keys) == len(INSIGHT_PROMPTS) else [[key] for key in keys]
+        steps.append(
+            chord(
+                [generate_meeting_insight.si(meeting_id=meeting_id, keys=batch, force=True) for batch in batches],
+                persist_meeting_insights.s(meeting_id=meeting_id, force=True),
+            )
+        )
+    elif "graph" in stages:
+        steps.append(sync_meeting_graph.si(meeting_id=meeting_id))
+    if "index" in stages:
+        steps.append(index_meeting_chunks.si(meeting_id=meeting_id))
+    return chain(*steps)
+
+
+def get_stage_states(db: Session, meeting_id: str) -> List[Dict[str, Any]]:
+    """
+    Latest execution of each stage for a meeting, with its attempt count, in
+    pipeline order.
+    """
+    rows = (
+        db.query(MeetingStage)
+        .filter(MeetingStage.meeting_id == uuid.UUID(meeting_id))
+        .order_by(MeetingStage.started_at, MeetingStage.id)
+        .all()
+    )
+    states: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        attempts = states[row.stage]["attempts"] + 1 if row.stage in states else 1
+        states[row.stage] = {
+            "stage": row.stage,
+            "status": row.status,
+            "queue": row.queue,
+            "attempts": attempts,
+            "started_at": row.started_at,
+            "finished_at": row.finished_at,
+            "duration_seconds": row.duration_seconds,
+            "error": row.error,
+        }
+    return list(states.values())
+
+
+def _remove_file(path: Optional[str], description: str) -> None:
+    try:
+        if path and os.path.exists(path):
+            os.remove(path)
+            logger.info(f"Removed {description} at {path}")
+    except Exception as cleanup_error:
+        logger.warning(f"Failed to remove {description} at {path}: {cleanup_error}")
@@ -0,0 +1,191 @@
+import json
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.redis_client import get_redis, redis_url
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL_PREFIX = "meeting:progress:"
+_LAST_EVENT_PREFIX = "meeting:progress-last:"
+_COUNTER_PREFIX = "meeting:progress-count:"
+_EVENT_TTL_SECONDS = 24 * 3600
+
+# Stage name (or prefix, for "insight:<key>") -> label shown to users
+STAGE_LABELS = {
+    "preprocess": "Preparing audio",
+    "transcribe": "Transcribing",
+    "insight": "Generating insights",
+    "insights": "Generating insights",
+    "persist": "Saving insights",
+    "graph_sync": "Updating knowledge graph",
+    "index_chunks": "Indexing transcript",
+    "pipeline": "Processing",
+}
+
+# Stage name of the event that ends a meeting's stream
+PIPELINE_STAGE = "pipeline"
+
+
+def progress_channel(meeting_id: str) -> str:
+    return f"{_CHANNEL_PREFIX}{meeting_id}"
+
+
+def stage_label(stage: str) -> str:
+    return STAGE_LABELS.get(stage) or STAGE_LABELS.get(stage.split(":", 1)[0], stage)
+
+
+def publish_progress(
+    meeting_id: str,
+    stage: str,
+    status: str,
+    progress: Optional[float] = None,
+    message: Optional[str] = None,
+    **extra: Any,
+) -> None:
+    """
+    Publishes a stage progress event for a meeting, e.g. ("transcribe", "running", 0.4).
+
+    The latest event is also kept under a key so clients that connect mid-stage
+    start from the current state. Progress is best effort: failures are logged
+    and never affect the pipeline.
+    """
+    if not settings.PROGRESS_EVENTS_ENABLED:
+        return
+    event = {
+        "meeting_id": meeting_id,
+        "stage": stage,
+        "status": status,
+        "progress": None if progress is None else round(min(max(progress, 0.0), 1.0), 3),
+        "message": message or _default_message(stage, status, progress),
+        "timestamp": time.time(),
+        **extra,
+    }
+    payload = json.dumps(event, default=str)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.set(f"{_LAST_EVENT_PREFIX}{meeting_id}", payload, ex=_EVENT_TTL_SECONDS)
+        pipe.publish(progress_channel(meeting_id), payload)
+        pipe.execute()
+    except Exception as exc:
+        logger.debug("Failed to publish progress for meeting %s: %s", meeting_id, exc)
+
+
+def increment_progress_counter(meeting_id: str, run_id: Optional[str], amount: int = 1) -> Optional[int]:
+    """Counts finished units (e.g. insight prompts) within one workflow run."""
+    if not settings.PROGRESS_EVENTS_ENABLED or not run_id:
+        return None
+    key = f"{_COUNTER_PREFIX}{meeting_id}:{run_id}"
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.incrby(key, amount)
+        pipe.expire(key, _EVENT_TTL_SECONDS)
+        return int(pipe.execute()[0])
+    except Exception as exc:
+        logger.debug("Failed to count progress for meeting %s: %s", meeting_id, exc)
+        return None
+
+
+def is_terminal(event: Dict[str, Any]) -> bool:
+    return event.get("stage") == PIPELINE_STAGE and event.get("status") in ("completed", "failed")
+
+
+def _default_message(stage: str, status: str, progress: Optional[float]) -> str:
+    label = stage_label(stage)
+    if status == "running":
+        return f"{label} {progress:.0%}" if progress is not None else label
+    return f"{label} {status}"
+
+
+class ProgressBroadcaster:
+    """
+    Fans progress events out to SSE clients of one API process.
+
+    A single pattern subscription per process receives every meeting's events and
+    hands them to per-client asyncio queues, so Redis sees one connection however
+    many clients are watching.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._client = None
+
+    def subscribe(self, meeting_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        self._subscribers.setdefault(meeting_id, set()).add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, meeting_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(meeting_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[meeting_id]
+
+    async def last_event(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self._redis().get(f"{_LAST_EVENT_PREFIX}{meeting_id}")
+        except Exception as exc:
+            logger.warning("Failed to read last progress event for meeting %s: %s", meeting_id, exc)
+            return None
+        return json.loads(raw) if raw else None
+
+    def _redis(self):
+        if self._client is None:
+            self._client = aioredis.Redis.from_url(
+                redis_url(),
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+                health_check_interval=30,
+            )
+        return self._client
+
+    async def _listen(self) -> None:
+        while self._subscribers:
+            pubsub = self._redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(f"{_CHANNEL_PREFIX}*")
+                while self._subscribers:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message:
+                        self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Progress subscription failed, reconnecting: %s", exc)
+                await asyncio.sleep(2)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        channel = message.get("channel")
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        queues = self._subscribers.get((channel or "")[len(_CHANNEL_PREFIX):])
+        if not queues:
+            return
+        try:
+            event = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        for queue in list(queues):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client only needs the newest state; drop its oldest event.
+                queue.get_nowait()
+                queue.put_nowait(event)
+
+
+progress_broadcaster = ProgressBroadcaster()
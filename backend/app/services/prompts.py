@@ -145,7 +145,57 @@ Example schema:
 </transcript>
 """
 
-meeting_chat_prompt = """
+combined_insights_prompt = """
+You are an expert meeting analyst. The transcript can come from any conversational setting (executive sync, product demo, interview, town hall, training, informal discussion).
+
+Produce every analysis below from this single transcript and return ONLY a valid JSON object with exactly these keys:
+
+- "abstract_summary": Markdown string. First line "## <short descriptive title>", then one context sentence (who is talking with whom, about what, and why), then 1–3 short summary paragraphs covering the narrative arc, outcomes and noteworthy observations. If little happened, say so briefly.
+- "key_points": Markdown string. For each salient theme, ordered by prominence: a "### <point name>" heading followed by 1–3 "- <detail>" bullet lines.
+- "action_items": Markdown string. For each concrete commitment, assignment, deadline or next step: a "### <number>. <item name>" heading followed by "- <detail>" bullet lines (owners and timing when known; mark uncommitted ideas as "Proposed"). If there are none, the exact sentence "No explicit action items were identified in this discussion."
+- "sentiment_analysis": Plain text, at most 3 short paragraphs: the prevailing sentiment (positive / negative / neutral / mixed) and why, notable shifts in tone, and the cues behind the assessment.
+- "tags": A single string of 3–6 concise comma-separated topic tags (no generic filler such as "Meeting").
+- "knowledge_graph": JSON object with "nodes" (objects with `id`, `label`), "edges" (objects with `from`, `to`, `label`), "participants" (`name`, optional `role`, `organization`), "decisions" (`title`, `description`, optional `owner`, `due_date`), "timeline" (`label`, optional `start_time`, `summary`) and "topics" (strings). Use concise lowercase hyphenated ids and empty arrays for sections without data.
+
+Do not fabricate content that is not supported by the transcript.
+
+<transcript>
+{transcript}
+</transcript>
+"""
+
+insight_reduce_prompt = """
+You are an expert meeting analyst. A long meeting transcript was split into consecutive parts and the same analysis ({insight_name}) was produced for each part separately, in chronological order.
+
+Task:
+Merge the partial analyses below into ONE {insight_name} for the whole meeting.
+
+Guidelines:
+- Remove duplicates and merge overlapping items, keeping the most specific details (names, owners, dates, numbers).
+- Keep the overall narrative and chronology coherent; do not mention that the meeting was split into parts.
+- Do not invent content that is absent from the partial analyses.
+- {format_instructions}
+
+<partial-analyses>
+{partials}
+</partial-analyses>
+"""
+
+chat_history_summary_prompt = """
+You maintain a running summary of a conversation between a user and an assistant about a recorded meeting.
+
+Current summary (may be empty):
+{existing_summary}
+
+New conversation turns to fold in:
+{new_turns}
+
+Rewrite the summary so it also covers the new turns. Keep the questions asked, the facts and answers given,
+and anything the user said they care about. Drop pleasantries and repetition.
+Respond with the summary only, in at most {max_words} words.
+"""
+
+meeting_chat_context_prompt = """
 You are a seasoned AI meeting analyst helping a user ask questions about previously recorded meetings.
 
 Context:
@@ -168,6 +218,13 @@ Context:
 {timeline}
 - **Structured Concepts:** 
 {structured_concepts}
+"""
+
+# Split so the meeting context can be rendered once and cached per meeting;
+# meeting_chat_context_prompt + meeting_chat_turn_prompt == meeting_chat_prompt.
+meeting_chat_turn_prompt = """
+Relevant transcript excerpts (timestamps are [mm:ss] from the start of the recording):
+{transcript_excerpts}
 
 Conversation history so far:
 {chat_history}
@@ -178,6 +235,9 @@ User question:
 Instructions:
 1. Answer using only the provided context. If the answer is unavailable, say so explicitly.
 2. Reference specific meeting details (e.g., speakers, topics, dates) when relevant.
-3. Be concise yet informative; use bullet points only when clarifying lists.
-4. If the user asks a follow-up, respect the conversation context and previous answers.
-"""
\ No newline at end of file
+3. When you rely on a transcript excerpt, cite its timestamp range, e.g. [12:30-13:05].
+4. Be concise yet informative; use bullet points only when clarifying lists.
+5. If the user asks a follow-up, respect the conversation context and previous answers.
+"""
+
+meeting_chat_prompt = meeting_chat_context_prompt + meeting_chat_turn_prompt
@@ -0,0 +1,184 @@
+import time
+import random
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Two token buckets (requests and tokens) checked and debited atomically. Levels
+# refill continuously at `rate` per second up to `capacity`; the clock is Redis'
+# own, so every worker sees the same buckets regardless of host clock skew.
+# Returns "0" when the cost was debited, otherwise the seconds to wait before retrying.
+# `force` debits unconditionally (levels may go negative); negative costs refund.
+_TOKEN_BUCKET_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local force = ARGV[7] == '1'
+
+local function current_level(key, rate, capacity)
+    local bucket = redis.call('HMGET', key, 'level', 'ts')
+    local level = tonumber(bucket[1])
+    if level == nil then
+        return capacity
+    end
+    return math.min(capacity, level + math.max(0, now - tonumber(bucket[2])) * rate)
+end
+
+local request_rate, request_capacity, request_cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local token_rate, token_capacity, token_cost = tonumber(ARGV[4]), tonumber(ARGV[5]), tonumber(ARGV[6])
+local request_level = current_level(KEYS[1], request_rate, request_capacity)
+local token_level = current_level(KEYS[2], token_rate, token_capacity)
+
+local wait = 0
+if not force then
+    if request_level < request_cost then
+        wait = math.max(wait, (request_cost - request_level) / request_rate)
+    end
+    if token_level < token_cost then
+        wait = math.max(wait, (token_cost - token_level) / token_rate)
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+
+redis.call('HSET', KEYS[1], 'level', request_level - request_cost, 'ts', now)
+redis.call('HSET', KEYS[2], 'level', token_level - token_cost, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 3600)
+redis.call('EXPIRE', KEYS[2], 3600)
+return '0'
+"""
+
+
+class RateLimiter:
+    """
+    Distributed request + token rate limiter for one model, shared through Redis.
+
+    `acquire` blocks (queues) until both buckets can cover the call, so bursts
+    from many workers are smoothed to the provider quota instead of failing with
+    429s. Call `settle` afterwards with the real token usage so estimates do not
+    drift, or `release` if the call failed. If Redis is unavailable the limiter
+    fails open.
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: float, burst_seconds: float):
+        self.name = name
+        self.request_rate = requests_per_minute / 60.0
+        self.token_rate = tokens_per_minute / 60.0
+        self.request_capacity = max(1.0, self.request_rate * burst_seconds)
+        self.token_capacity = max(1.0, self.token_rate * burst_seconds)
+        self._keys = [f"llm:ratelimit:{name}:requests", f"llm:ratelimit:{name}:tokens"]
+        self._script = None
+        self._bypass_until = 0.0
+
+    def _call(self, request_cost: float, token_cost: float, force: bool) -> float:
+        if self._script is None:
+            self._script = get_redis().register_script(_TOKEN_BUCKET_LUA)
+        wait = self._script(
+            keys=self._keys,
+            args=[
+                self.request_rate,
+                self.request_capacity,
+                request_cost,
+                self.token_rate,
+                self.token_capacity,
+                token_cost,
+                "1" if force else "0",
+            ],
+        )
+        return float(wait)
+
+    def acquire(self, estimated_tokens: int) -> int:
+        """
+        Blocks until one request and `estimated_tokens` tokens are available.
+        Returns the number of tokens reserved, to pass to `settle`.
+        """
+        # A single call larger than the bucket could never be admitted; charge it the full bucket.
+        tokens = int(min(max(estimated_tokens, 1), self.token_capacity))
+        started = time.monotonic()
+        if started < self._bypass_until:
+            return 0
+        while True:
+            try:
+                wait = self._call(1, tokens, force=False)
+            except Exception as exc:
+                # Don't pay a Redis timeout on every call while it is down.
+                self._bypass_until = time.monotonic() + 30
+                logger.warning("Rate limiter %s unavailable, proceeding unthrottled for 30s: %s", self.name, exc)
+                return 0
+            if wait <= 0:
+                waited = time.monotonic() - started
+                if waited > 1:
+                    logger.info("Rate limiter %s queued a call for %.1fs", self.name, waited)
+                return tokens
+            if time.monotonic() - started > settings.LLM_RATE_LIMIT_MAX_WAIT_SECONDS:
+                logger.warning(
+                    "Rate limiter %s: waited over %ss, proceeding without a reservation",
+                    self.name,
+                    settings.LLM_RATE_LIMIT_MAX_WAIT_SECONDS,
+                )
+                return 0
+            # Jitter keeps waiting workers from retrying in lockstep.
+            time.sleep(min(wait, 5.0) + random.uniform(0, 0.25))
+
+    async def aacquire(self, estimated_tokens: int) -> int:
+        """`acquire` for the asyncio pipeline: waits without blocking the event loop."""
+        tokens = int(min(max(estimated_tokens, 1), self.token_capacity))
+        started = time.monotonic()
+        if started < self._bypass_until:
+            return 0
+        while True:
+            try:
+                wait = await asyncio.to_thread(self._call, 1, tokens, False)
+            except Exception as exc:
+                self._bypass_until = time.monotonic() + 30
+                logger.warning("Rate limiter %s unavailable, proceeding unthrottled for 30s: %s", self.name, exc)
+                return 0
+            if wait <= 0:
+                return tokens
+            if time.monotonic() - started > settings.LLM_RATE_LIMIT_MAX_WAIT_SECONDS:
+                logger.warning(
+                    "Rate limiter %s: waited over %ss, proceeding without a reservation",
+                    self.name,
+                    settings.LLM_RATE_LIMIT_MAX_WAIT_SECONDS,
+                )
+                return 0
+            await asyncio.sleep(min(wait, 5.0) + random.uniform(0, 0.25))
+
+    def settle(self, reserved_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Corrects the token bucket once the real usage of a call is known."""
+        if not reserved_tokens or actual_tokens is None or actual_tokens == reserved_tokens:
+            return
+        try:
+            self._call(0, actual_tokens - reserved_tokens, force=True)
+        except Exception as exc:
+            logger.debug("Rate limiter %s could not settle usage: %s", self.name, exc)
+
+    def release(self, reserved_tokens: int) -> None:
+        """Refunds the tokens reserved for a call that failed; the request itself still counts."""
+        self.settle(reserved_tokens, 0)
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(name: str, requests_per_minute: float, tokens_per_minute: float) -> Optional[RateLimiter]:
+    if not settings.LLM_RATE_LIMIT_ENABLED:
+        return None
+    logger.info(
+        "Rate limiting %s to %s requests/min and %s tokens/min", name, requests_per_minute, tokens_per_minute
+    )
+    return RateLimiter(name, requests_per_minute, tokens_per_minute, settings.LLM_RATE_LIMIT_BURST_SECONDS)
+
+
+def usage_tokens(result: Any) -> Optional[int]:
+    """Total tokens reported on a LangChain chat result, if the provider returned usage."""
+    usage = getattr(result, "usage_metadata", None)
+    if usage and usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    token_usage = (getattr(result, "response_metadata", None) or {}).get("token_usage") or {}
+    total = token_usage.get("total_tokens")
+    return int(total) if total else None
@@ -0,0 +1,244 @@
+import re
+import math
+import uuid
+import logging
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from .graph_service import areplace_transcript_chunks, fetch_transcript_chunks, replace_transcript_chunks
+from .llm_service import aembed_documents, embed_documents, embed_query
+from .tokens import split_transcript
+
+logger = logging.getLogger(__name__)
+
+_TIMESTAMP_PATTERN = re.compile(r"^\[(\d+:\d{2})\]")
+_TERM_PATTERN = re.compile(r"[a-z0-9']+")
+# Terms too common in meeting talk to say anything about relevance
+_STOPWORDS = frozenset(
+    "a about an and are as at be but by did do does for from had has have how i in is it its just like me my of "
+    "okay on or so um uh yeah "
+    "that the their them they this to was we were what when where which who why will with you your".split()
+)
+
+
+class TranscriptChunkIndex:
+    """
+    Timestamped transcript chunks for one meeting, with optional embeddings.
+
+    `embeddings` is an L2-normalised float32 matrix (one row per chunk), so cosine
+    similarity is a single matrix-vector product. Without embeddings, search falls
+    back to TF-IDF term overlap.
+    """
+
+    __slots__ = ("chunks", "embeddings", "_term_counts", "_idf")
+
+    def __init__(self, chunks: List[Dict[str, Any]], embeddings: Optional[np.ndarray] = None):
+        self.chunks = chunks
+        self.embeddings = embeddings
+        self._term_counts: Optional[List[Counter]] = None
+        self._idf: Optional[Dict[str, float]] = None
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def search(self, question: str, top_k: int) -> List[Dict[str, Any]]:
+        """Returns up to `top_k` chunks relevant to `question`, in transcript order."""
+        if not self.chunks or top_k <= 0:
+            return []
+
+        scores = self._semantic_scores(question) if self.embeddings is not None else None
+        if scores is not None:
+            candidates = np.arange(len(self.chunks))
+        else:
+            scores = self._lexical_scores(question)
+            # Chunks sharing no terms with the question are not evidence of anything
+            candidates = np.flatnonzero(scores > 0)
+        if not len(candidates):
+            return []
+
+        top_k = min(top_k, len(candidates))
+        best = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        return [self.chunks[position] for position in sorted(best.tolist())]
+
+    def _semantic_scores(self, question: str) -> Optional[np.ndarray]:
+        try:
+            query = np.asarray(embed_query(question), dtype=np.float32)
+        except Exception as exc:
+            logger.warning("Question embedding failed, using lexical retrieval: %s", exc)
+            return None
+        norm = np.linalg.norm(query)
+        if not norm:
+            return None
+        return self.embeddings @ (query / norm)
+
+    def _lexical_scores(self, question: str) -> np.ndarray:
+        if self._term_counts is None:
+            self._term_counts = [Counter(_terms(chunk["text"])) for chunk in self.chunks]
+            document_frequency = Counter(term for counts in self._term_counts for term in counts)
+            total = len(self._term_counts)
+            self._idf = {term: math.log(1 + total / count) for term, count in document_frequency.items()}
+
+        query_terms = set(_terms(question))
+        return np.array(
+            [
+                sum(math.log1p(counts[term]) * self._idf[term] for term in query_terms if term in counts)
+                for counts in self._term_counts
+            ],
+            dtype=np.float32,
+        )
+
+
+def _terms(text: str) -> List[str]:
+    return [term for term in _TERM_PATTERN.findall(text.lower()) if term not in _STOPWORDS and len(term) > 1]
+
+
+def build_transcript_chunks(transcript: str) -> List[Dict[str, Any]]:
+    """Splits a speaker-labelled transcript into ordered chunks with start/end timestamps."""
+    chunks = []
+    for position, text in enumerate(split_transcript(transcript, settings.CHAT_RETRIEVAL_CHUNK_TOKENS)):
+        timestamps = [match.group(1) for match in map(_TIMESTAMP_PATTERN.match, text.splitlines()) if match]
+        chunks.append(
+            {
+                "position": position,
+                "text": text.strip(),
+                "start_time": timestamps[0] if timestamps else None,
+                "end_time": timestamps[-1] if timestamps else None,
+            }
+        )
+    return chunks
+
+
+def _embed_chunks(chunks: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+    if not chunks:
+        return None
+    try:
+        vectors = embed_documents([chunk["text"] for chunk in chunks])
+    except Exception as exc:
+        logger.warning("Transcript chunk embedding failed, retrieval will be lexical: %s", exc)
+        return None
+    return _normalise_rows(np.asarray(vectors, dtype=np.float32))
+
+
+def _normalise_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def index_meeting_transcript(meeting_id: str, transcript: Optional[str]) -> TranscriptChunkIndex:
+    """
+    Chunks and embeds a transcript and stores the chunks as TranscriptChunk nodes.
+    """
+    chunks = build_transcript_chunks(transcript or "")
+    embeddings = _embed_chunks(chunks)
+    stored = [
+        {**chunk, "embedding": embeddings[row].tolist() if embeddings is not None else None}
+        for row, chunk in enumerate(chunks)
+    ]
+    try:
+        if replace_transcript_chunks(meeting_id, stored):
+            logger.info("Indexed %d transcript chunks for meeting %s", len(chunks), meeting_id)
+    except Exception as exc:
+        logger.error("Failed to persist transcript chunks for meeting %s: %s", meeting_id, exc)
+    return TranscriptChunkIndex(chunks, embeddings)
+
+
+async def aindex_meeting_transcript(meeting_id: str, transcript: Optional[str]) -> int:
+    """index_meeting_transcript for the asyncio pipeline; returns the number of chunks stored."""
+    chunks = build_transcript_chunks(transcript or "")
+    embeddings = None
+    if chunks:
+        try:
+            vectors = await aembed_documents([chunk["text"] for chunk in chunks])
+            embeddings = _normalise_rows(np.asarray(vectors, dtype=np.float32))
+        except Exception as exc:
+            logger.warning("Transcript chunk embedding failed, retrieval will be lexical: %s", exc)
+    stored = [
+        {**chunk, "embedding": embeddings[row].tolist() if embeddings is not None else None}
+        for row, chunk in enumerate(chunks)
+    ]
+    try:
+        if await areplace_transcript_chunks(meeting_id, stored):
+            logger.info("Indexed %d transcript chunks for meeting %s", len(chunks), meeting_id)
+    except Exception as exc:
+        logger.error("Failed to persist transcript chunks for meeting %s: %s", meeting_id, exc)
+    return len(chunks)
+
+
+class _ChunksNotIndexed(Exception):
+    """The meeting has no stored chunk index (raised so lru_cache does not keep the miss)."""
+
+
+@lru_cache(maxsize=32)
+def _stored_chunk_index(meeting_id: str, version: Optional[str]) -> TranscriptChunkIndex:
+    # `version` (the meeting's updated_at) keys out indexes loaded for an older transcript.
+    stored = fetch_transcript_chunks(meeting_id)
+    if not stored:
+        raise _ChunksNotIndexed(meeting_id)
+
+    chunks = [{key: record[key] for key in ("position", "text", "start_time", "end_time")} for record in stored]
+    vectors = [record.get("embedding") for record in stored]
+    embeddings = None
+    if all(vectors):
+        embeddings = _normalise_rows(np.asarray(vectors, dtype=np.float32))
+    return TranscriptChunkIndex(chunks, embeddings)
+
+
+# Meetings this process has asked the pipeline to index
+_index_requested = set()
+
+
+@lru_cache(maxsize=32)
+def _unindexed_chunk_index(meeting_id: str, version: Optional[str]) -> TranscriptChunkIndex:
+    """
+    Lexical index for a meeting without stored chunks (processed before chunk
+    indexing, or no Neo4j), cached like stored indexes. Embedding is left to the
+    pipeline's index_chunks stage, queued once per meeting on the configured
+    executor, rather than done inside the chat request.
+    """
+    from app.db.database import SessionLocal
+    from app.db.models import Meeting
+
+    db = SessionLocal()
+    try:
+        row = db.query(Meeting.transcript).filter(Meeting.id == uuid.UUID(meeting_id)).first()
+    finally:
+        db.close()
+    transcript = row.transcript if row else None
+
+    if transcript and settings.NEO4J_URI:
+        _request_chunk_indexing(meeting_id)
+    return TranscriptChunkIndex(build_transcript_chunks(transcript or ""))
+
+
+def _request_chunk_indexing(meeting_id: str) -> None:
+    from .processing_service import enqueue_meeting_indexing
+
+    if meeting_id in _index_requested:
+        return
+    try:
+        enqueue_meeting_indexing(meeting_id)
+    except Exception as exc:
+        logger.warning("Could not queue chunk indexing for meeting %s: %s", meeting_id, exc)
+        return
+    _index_requested.add(meeting_id)
+    logger.info("Queued transcript chunk indexing for meeting %s", meeting_id)
+
+
+def retrieve_transcript_excerpts(meeting_id: str, version: Optional[str], question: str) -> List[Dict[str, Any]]:
+    """Returns the top CHAT_RETRIEVAL_TOP_K transcript chunks for a chat question."""
+    if not settings.CHAT_RETRIEVAL_ENABLED:
+        return []
+    try:
+        try:
+            index = _stored_chunk_index(meeting_id, version)
+        except _ChunksNotIndexed:
+            index = _unindexed_chunk_index(meeting_id, version)
+        return index.search(question, settings.CHAT_RETRIEVAL_TOP_K)
+    except Exception as exc:
+        logger.error("Transcript retrieval failed for meeting %s: %s", meeting_id, exc, exc_info=True)
+        return []
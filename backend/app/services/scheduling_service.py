@@ -0,0 +1,105 @@
+import uuid
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Meeting, MeetingStatus
+
+logger = logging.getLogger(__name__)
+
+LANES = ("short", "medium", "long", "unknown")
+
+# Celery/Redis priority per lane; 0 is served first. Short jobs leave room
+# below them for aged meetings to overtake.
+_LANE_PRIORITIES = {"short": 2, "medium": 5, "long": 8, "unknown": 5}
+
+
+def duration_lane(duration_seconds: Optional[float]) -> str:
+    if duration_seconds is None:
+        return "unknown"
+    minutes = duration_seconds / 60
+    if minutes <= settings.PRIORITY_SHORT_MAX_MINUTES:
+        return "short"
+    if minutes <= settings.PRIORITY_MEDIUM_MAX_MINUTES:
+        return "medium"
+    return "long"
+
+
+def meeting_priority(
+    duration_seconds: Optional[float],
+    queued_since: Optional[datetime],
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Priority for a meeting's pipeline tasks: its duration lane, raised one step
+    for every PRIORITY_AGING_SECONDS it has been waiting so long recordings are
+    not starved by a steady stream of short ones.
+    """
+    priority = _LANE_PRIORITIES[duration_lane(duration_seconds)]
+    if queued_since is not None and settings.PRIORITY_AGING_SECONDS > 0:
+        waited = ((now or datetime.utcnow()) - queued_since).total_seconds()
+        priority -= int(max(waited, 0) // settings.PRIORITY_AGING_SECONDS)
+    return max(priority, 0)
+
+
+def deadline_offset_seconds(priority: int) -> float:
+    """
+    A priority as a virtual deadline offset for score-ordered queues: seconds
+    after a freshly queued short meeting at which it falls due.
+    """
+    return (priority - _LANE_PRIORITIES["short"]) * settings.PRIORITY_AGING_SECONDS
+
+
+def priority_for_meeting(db: Session, meeting_id: str) -> Optional[int]:
+    meeting = (
+        db.query(Meeting.duration_seconds, Meeting.created_at, Meeting.completed_at)
+        .filter(Meeting.id == uuid.UUID(meeting_id))
+        .first()
+    )
+    if meeting is None:
+        return None
+    # Re-runs of finished meetings (backfills) keep their lane but are not aged
+    # from an upload that may be months old.
+    queued_since = meeting.created_at if meeting.completed_at is None else None
+    return meeting_priority(meeting.duration_seconds, queued_since)
+
+
+def completion_latency_stats(db: Session, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Upload-to-completion latency percentiles per duration lane, over completed
+    meetings (optionally only those completed after `since`).
+    """
+    query = db.query(Meeting.duration_seconds, Meeting.created_at, Meeting.completed_at).filter(
+        Meeting.status == MeetingStatus.COMPLETED,
+        Meeting.completed_at.isnot(None),
+        Meeting.created_at.isnot(None),
+    )
+    if since is not None:
+        query = query.filter(Meeting.completed_at >= since)
+
+    latencies: Dict[str, List[float]] = {lane: [] for lane in LANES}
+    for duration, created_at, completed_at in query.all():
+        latencies[duration_lane(duration)].append((completed_at - created_at).total_seconds())
+
+    stats = []
+    for lane in LANES:
+        values = np.asarray(latencies[lane], dtype=np.float64)
+        if not len(values):
+            stats.append({"lane": lane, "count": 0, "p50_seconds": None, "p95_seconds": None, "mean_seconds": None})
+            continue
+        p50, p95 = np.percentile(values, [50, 95])
+        stats.append(
+            {
+                "lane": lane,
+                "count": int(len(values)),
+                "p50_seconds": float(p50),
+                "p95_seconds": float(p95),
+                "mean_seconds": float(values.mean()),
+            }
+        )
+    return stats
+
@@ -0,0 +1,95 @@
+import logging
+from functools import lru_cache
+from typing import List
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "o200k_base"
+# Rough English average used when no tokenizer can be loaded
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as exc:
+        # tiktoken downloads its BPE files on first use; offline hosts fall back to an estimate.
+        logger.warning("Could not load a tiktoken encoding for %s, estimating token counts: %s", model, exc)
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """Counts tokens locally with tiktoken, without calling the provider."""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return max(1, len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def split_transcript(transcript: str, max_tokens: int, model: str = "gpt-4o-mini") -> List[str]:
+    """
+    Splits a speaker-labelled transcript into chunks of at most `max_tokens`.
+
+    Chunks break on turn (line) boundaries; a single turn longer than the budget
+    is split on word boundaries and each piece keeps the turn's
+    "[mm:ss] SPEAKER_n:" label.
+    """
+    if not transcript:
+        return []
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    def _flush() -> None:
+        nonlocal current, current_tokens
+        if current:
+            chunks.append("\n".join(current) + "\n")
+        current, current_tokens = [], 0
+
+    for line in transcript.splitlines():
+        if not line.strip():
+            continue
+        line_tokens = count_tokens(line, model) + 1
+        if line_tokens > max_tokens:
+            _flush()
+            for piece in _split_long_turn(line, max_tokens, model):
+                chunks.append(piece + "\n")
+            continue
+        if current_tokens + line_tokens > max_tokens:
+            _flush()
+        current.append(line)
+        current_tokens += line_tokens
+
+    _flush()
+    return chunks
+
+
+def _split_long_turn(line: str, max_tokens: int, model: str) -> List[str]:
+    label, separator, text = line.partition(": ")
+    if not separator:
+        label, text = "", line
+    prefix = f"{label}: " if label else ""
+    budget = max(1, max_tokens - count_tokens(prefix, model))
+
+    pieces: List[str] = []
+    words: List[str] = []
+    words_tokens = 0
+    for word in text.split():
+        word_tokens = count_tokens(" " + word, model)
+        if words and words_tokens + word_tokens > budget:
+            pieces.append(prefix + " ".join(words))
+            words, words_tokens = [], 0
+        words.append(word)
+        words_tokens += word_tokens
+    if words:
+        pieces.append(prefix + " ".join(words))
+    return pieces
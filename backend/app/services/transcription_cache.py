@@ -0,0 +1,132 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# backend/app/services/transcription_cache.py -> backend/
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_DIRECTORY = os.path.join(BACKEND_DIR, "cache", "transcriptions")
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class TranscriptionCache:
+    """
+    Content-addressed on-disk cache of raw transcription responses.
+
+    Entries are gzip-compressed JSON files named after the SHA-256 of the audio
+    bytes plus the request parameters. Reads refresh an entry's mtime, and writes
+    evict least-recently-used entries once the directory exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key_for(self, file_path: str, params: Dict[str, Any]) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as audio_file:
+            for chunk in iter(lambda: audio_file.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path_for(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as cached_file:
+                response = json.load(cached_file)
+            os.utime(path)
+        except FileNotFoundError:
+            response = None
+        except Exception as exc:
+            logger.warning("Discarding unreadable transcription cache entry %s: %s", path, exc)
+            self._remove(path)
+            response = None
+
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        record_cache_lookup("transcription", response is not None)
+        return response
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        path = self._path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with gzip.open(temp_path, "wt", encoding="utf-8") as cached_file:
+                json.dump(response, cached_file)
+            os.replace(temp_path, path)
+        except Exception as exc:
+            logger.warning("Failed to write transcription cache entry %s: %s", path, exc)
+            self._remove(temp_path)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total_bytes = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json.gz"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_bytes += stat.st_size
+
+        if total_bytes <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            self._remove(path)
+            total_bytes -= size
+            logger.info("Evicted transcription cache entry %s", os.path.basename(path))
+            if total_bytes <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_transcription_cache() -> Optional[TranscriptionCache]:
+    if not settings.TRANSCRIPTION_CACHE_ENABLED:
+        return None
+    directory = settings.TRANSCRIPTION_CACHE_DIR or DEFAULT_CACHE_DIRECTORY
+    logger.info("Using transcription cache at %s", directory)
+    return TranscriptionCache(directory, settings.TRANSCRIPTION_CACHE_MAX_MB * 1024 * 1024)
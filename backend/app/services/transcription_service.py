@@ -1,110 +1,448 @@
 import os
+import shutil
+import asyncio
+import random
 import logging
+import tempfile
+import threading
+import httpx
 import requests
-from typing import List, Dict
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional, Tuple
+import numpy as np
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from app.core.config import settings
+from app.core.metrics import DEEPGRAM_REQUEST_SECONDS, DEEPGRAM_RETRIES, DEEPGRAM_UPLOAD_BYTES
+from . import audio_service
+from .transcription_cache import get_transcription_cache
+from .word_table import WordTable
 
 logger = logging.getLogger(__name__)
 
-def transcribe_audio_file(input_file_path: str) -> pd.DataFrame:
+_DEEPGRAM_URL = "https://api.deepgram.com/v1/listen?diarize=true&punctuate=true&utterances=true"
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+_UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+# Caps concurrent Deepgram requests from the asyncio pipeline, across all meetings.
+_ASYNC_DEEPGRAM_SLOTS = asyncio.Semaphore(max(1, settings.ASYNC_DEEPGRAM_CONCURRENCY))
+
+def transcribe_audio_file(input_file_path: str, allow_empty: bool = False) -> WordTable:
     """
     Transcribes an audio/video file using Deepgram API with speaker diarization.
     
     Args:
         input_file_path: The path to the audio or video file.
+        allow_empty: Return an empty table instead of failing when no words are recognised.
     
     Returns:
-        DataFrame with columns: start, end, word, speaker, confidence
+        WordTable with columns: start, end, word, speaker, confidence
     """
     logger.info(f"Starting Deepgram transcription with diarization for {input_file_path}")
     
-    if not hasattr(settings, 'DEEPGRAM_API_KEY') or not settings.DEEPGRAM_API_KEY:
-        raise Exception("DEEPGRAM_API_KEY is not set in environment variables")
+    url, headers = _deepgram_request(input_file_path)
+    file_size = os.path.getsize(input_file_path)
+    
+    cache = get_transcription_cache()
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.key_for(input_file_path, {"url": url, "content_type": headers['Content-Type']})
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            logger.info(f"Transcription cache hit for {input_file_path} ({cache_key[:12]}), skipping Deepgram request")
+            return _parse_deepgram_response(cached_result, allow_empty=allow_empty)
     
-    url = "https://api.deepgram.com/v1/listen?diarize=true&punctuate=true&utterances=true"
+    timeout = _request_timeout(input_file_path)
+    session = _get_http_session()
+    started = time.perf_counter()
+    outcome = "error"
     
+    try:
+        logger.info(f"Streaming {file_size} bytes to Deepgram API (read timeout {timeout[1]:.0f}s)...")
+        # The file object is streamed in fixed-size blocks, so the recording is never held
+        # in memory in full. The retry policy rewinds it before every retried attempt.
+        DEEPGRAM_UPLOAD_BYTES.inc(file_size)
+        with open(input_file_path, 'rb') as audio_stream:
+            response = session.post(url, headers=headers, data=audio_stream, timeout=timeout)
+        _record_retries(response)
+        response.raise_for_status()
+        
+        result = response.json()
+        outcome = "success"
+        logger.info("Deepgram API response received successfully")
+        if cache is not None:
+            cache.put(cache_key, result)
+        
+        return _parse_deepgram_response(result, allow_empty=allow_empty)
+        
+    except requests.exceptions.ConnectionError as e:
+        DEEPGRAM_RETRIES.inc(settings.DEEPGRAM_MAX_RETRIES)
+        error_msg = str(e)
+        if "Failed to resolve" in error_msg or "Lookup timed out" in error_msg:
+            raise Exception(
+                f"Failed to connect to Deepgram API after {settings.DEEPGRAM_MAX_RETRIES} retries. "
+                f"DNS resolution failed - please check your internet connection and DNS settings. "
+                f"Error: {str(e)}"
+            )
+        logger.error(f"Connection error to Deepgram API: {e}")
+        raise Exception(f"Deepgram API connection failed after {settings.DEEPGRAM_MAX_RETRIES} retries: {str(e)}")
+        
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Deepgram API request failed: {e}")
+        if hasattr(e, 'response') and e.response is not None:
+            logger.error(f"Response status: {e.response.status_code}, Response: {e.response.text}")
+            # 4xx errors (client errors) are never retried by the policy
+            if 400 <= e.response.status_code < 500 and e.response.status_code != 429:
+                outcome = "client_error"
+                raise Exception(f"Deepgram API client error: {str(e)}")
+        raise Exception(f"Deepgram API request failed after {settings.DEEPGRAM_MAX_RETRIES} retries: {str(e)}")
+        
+    except Exception as e:
+        logger.error(f"Error processing Deepgram response: {e}", exc_info=True)
+        raise Exception(f"Failed to process Deepgram transcription: {str(e)}")
+    
+    finally:
+        DEEPGRAM_REQUEST_SECONDS.labels(outcome=outcome).observe(time.perf_counter() - started)
+
+def _deepgram_request(input_file_path: str) -> Tuple[str, Dict[str, str]]:
+    if not hasattr(settings, 'DEEPGRAM_API_KEY') or not settings.DEEPGRAM_API_KEY:
+        raise Exception("DEEPGRAM_API_KEY is not set in environment variables")
     headers = {
         'Authorization': f'Token {settings.DEEPGRAM_API_KEY}',
+        'Content-Type': _get_content_type(input_file_path) or 'application/octet-stream',
     }
+    return _DEEPGRAM_URL, headers
+
+async def atranscribe_audio_file(input_file_path: str, allow_empty: bool = False) -> WordTable:
+    """
+    transcribe_audio_file for the asyncio pipeline.
     
-    # Retry configuration
-    max_retries = 3
-    retry_delay = 2  # seconds
+    Uses a pooled httpx.AsyncClient bounded by ASYNC_DEEPGRAM_CONCURRENCY. Connection
+    errors, timeouts and 429/5xx responses are retried with the same backoff as the
+    sync session, honouring Retry-After.
+    """
+    logger.info(f"Starting async Deepgram transcription with diarization for {input_file_path}")
     
-    with open(input_file_path, 'rb') as audio_file:
-        audio_data = audio_file.read()
-        content_type = _get_content_type(input_file_path)
-        if content_type:
-            headers['Content-Type'] = content_type
-        else:
-            headers['Content-Type'] = 'application/octet-stream'
+    url, headers = _deepgram_request(input_file_path)
     
-    last_exception = None
+    cache = get_transcription_cache()
+    cache_key = None
+    if cache is not None:
+        cache_key = await asyncio.to_thread(
+            cache.key_for, input_file_path, {"url": url, "content_type": headers['Content-Type']}
+        )
+        # Decompressing a cached response (and compressing and evicting on put) runs in threads too.
+        cached_result = await asyncio.to_thread(cache.get, cache_key)
+        if cached_result is not None:
+            logger.info(f"Transcription cache hit for {input_file_path} ({cache_key[:12]}), skipping Deepgram request")
+            return _parse_deepgram_response(cached_result, allow_empty=allow_empty)
     
-    for attempt in range(max_retries):
-        try:
-            logger.info(f"Sending audio to Deepgram API... (attempt {attempt + 1}/{max_retries})")
-            response = requests.post(url, headers=headers, data=audio_data, timeout=300)
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.info("Deepgram API response received successfully")
-            
-            return _parse_deepgram_response(result)
-            
-        except requests.exceptions.ConnectionError as e:
-            last_exception = e
-            error_msg = str(e)
-            if "Failed to resolve" in error_msg or "Lookup timed out" in error_msg:
-                logger.warning(f"DNS resolution failed for api.deepgram.com (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise Exception(
-                        f"Failed to connect to Deepgram API after {max_retries} attempts. "
-                        f"DNS resolution failed - please check your internet connection and DNS settings. "
-                        f"Error: {str(e)}"
+    connect_timeout, read_timeout = await audio_service.run_bounded(_request_timeout, input_file_path)
+    timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+    client = _get_async_http_client()
+    started = time.perf_counter()
+    outcome = "error"
+    
+    try:
+        for attempt in range(settings.DEEPGRAM_MAX_RETRIES + 1):
+            retry_after = None
+            try:
+                async with _ASYNC_DEEPGRAM_SLOTS:
+                    response = await client.post(
+                        url, headers=headers, content=_read_blocks(input_file_path), timeout=timeout
                     )
-            else:
-                logger.error(f"Connection error to Deepgram API: {e}")
-                if attempt < max_retries - 1:
-                    wait_time = retry_delay * (2 ** attempt)
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise Exception(f"Deepgram API connection failed after {max_retries} attempts: {str(e)}")
-                    
-        except requests.exceptions.RequestException as e:
-            last_exception = e
-            logger.error(f"Deepgram API request failed (attempt {attempt + 1}/{max_retries}): {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response status: {e.response.status_code}, Response: {e.response.text}")
-            
-            # Don't retry on 4xx errors (client errors)
-            if hasattr(e, 'response') and e.response is not None and 400 <= e.response.status_code < 500:
-                raise Exception(f"Deepgram API client error: {str(e)}")
-            
-            if attempt < max_retries - 1:
-                wait_time = retry_delay * (2 ** attempt)
-                logger.info(f"Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
+                if response.status_code not in _RETRY_STATUSES:
+                    break
+                error = f"HTTP {response.status_code}"
+                retry_after = _retry_after_seconds(response)
+            except httpx.TransportError as e:
+                error = str(e) or type(e).__name__
+            if attempt == settings.DEEPGRAM_MAX_RETRIES:
+                raise Exception(f"Deepgram API request failed after {settings.DEEPGRAM_MAX_RETRIES} retries: {error}")
+            DEEPGRAM_RETRIES.inc()
+            delay = retry_after if retry_after is not None else _backoff_seconds(attempt)
+            logger.warning(f"Deepgram request failed ({error}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        
+        if 400 <= response.status_code < 500:
+            outcome = "client_error"
+            logger.error(f"Response status: {response.status_code}, Response: {response.text}")
+            raise Exception(f"Deepgram API client error: HTTP {response.status_code}")
+        response.raise_for_status()
+        
+        result = response.json()
+        outcome = "success"
+        logger.info("Deepgram API response received successfully")
+        if cache is not None:
+            await asyncio.to_thread(cache.put, cache_key, result)
+        
+        return _parse_deepgram_response(result, allow_empty=allow_empty)
+    
+    finally:
+        DEEPGRAM_REQUEST_SECONDS.labels(outcome=outcome).observe(time.perf_counter() - started)
+
+async def _read_blocks(path: str):
+    # A fresh generator per attempt, so retries always stream the file from the start.
+    with open(path, 'rb') as audio_stream:
+        while True:
+            block = await asyncio.to_thread(audio_stream.read, _UPLOAD_BLOCK_SIZE)
+            if not block:
+                return
+            DEEPGRAM_UPLOAD_BYTES.inc(len(block))
+            yield block
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    try:
+        return max(float(response.headers["Retry-After"]), 0.0)
+    except (KeyError, ValueError):
+        return None
+
+def _backoff_seconds(attempt: int) -> float:
+    return settings.DEEPGRAM_RETRY_BACKOFF_SECONDS * (2 ** attempt) * random.uniform(0.5, 1.0)
+
+@lru_cache(maxsize=1)
+def _get_async_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.ASYNC_DEEPGRAM_CONCURRENCY,
+            max_keepalive_connections=settings.ASYNC_DEEPGRAM_CONCURRENCY,
+        ),
+    )
+
+@lru_cache(maxsize=1)
+def _get_http_session() -> requests.Session:
+    """
+    Process-wide Deepgram HTTP session with keep-alive connection pooling.
+    
+    Retries are declared once on the adapter: connection errors, read errors and
+    429/5xx responses are retried with exponential backoff, honouring Retry-After.
+    """
+    retry_policy = Retry(
+        total=settings.DEEPGRAM_MAX_RETRIES,
+        connect=settings.DEEPGRAM_MAX_RETRIES,
+        read=settings.DEEPGRAM_MAX_RETRIES,
+        status=settings.DEEPGRAM_MAX_RETRIES,
+        backoff_factor=settings.DEEPGRAM_RETRY_BACKOFF_SECONDS,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.DEEPGRAM_POOL_SIZE,
+        max_retries=retry_policy,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def _request_timeout(input_file_path: str) -> Tuple[float, float]:
+    """(connect, read) timeout with the read timeout scaled to the recording length."""
+    duration = audio_service.probe_duration(input_file_path)
+    if duration is None:
+        read_timeout = settings.DEEPGRAM_READ_TIMEOUT_FALLBACK_SECONDS
+    else:
+        read_timeout = (
+            settings.DEEPGRAM_READ_TIMEOUT_BASE_SECONDS
+            + settings.DEEPGRAM_READ_TIMEOUT_PER_MINUTE_SECONDS * duration / 60
+        )
+    read_timeout = min(read_timeout, settings.DEEPGRAM_READ_TIMEOUT_MAX_SECONDS)
+    return settings.DEEPGRAM_CONNECT_TIMEOUT_SECONDS, read_timeout
+
+def _record_retries(response: requests.Response) -> None:
+    retries = getattr(response.raw, "retries", None)
+    history = getattr(retries, "history", None) or ()
+    if history:
+        DEEPGRAM_RETRIES.inc(len(history))
+        logger.warning(f"Deepgram request needed {len(history)} retries: {[str(entry) for entry in history]}")
+
+def transcribe_audio_file_chunked(
+    input_file_path: str,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> WordTable:
+    """
+    Transcribes a long recording as parallel segments and stitches the results.
+    
+    The recording is cut near silences into segments of TRANSCRIPTION_CHUNK_MINUTES.
+    Each segment also carries TRANSCRIPTION_CHUNK_OVERLAP_SECONDS of the next one.
+    Segments are transcribed by a pool of TRANSCRIPTION_CHUNK_CONCURRENCY workers.
+    The overlapping words are used to map each segment's speaker ids onto the
+    previous segment's, and are then dropped so every word appears once.
+    Recordings shorter than two segments are sent as a single request.
+    `on_progress(done, total)` is called as segments finish.
+    """
+    target_seconds = settings.TRANSCRIPTION_CHUNK_MINUTES * 60
+    duration = audio_service.probe_duration(input_file_path)
+    if not duration or duration < 2 * target_seconds:
+        return transcribe_audio_file(input_file_path)
+    
+    overlap = settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS
+    silences = audio_service.detect_silences(input_file_path)
+    segments = audio_service.plan_segments(duration, silences, target_seconds)
+    logger.info(
+        f"Transcribing {duration:.0f}s recording as {len(segments)} segments "
+        f"({len(silences)} silences found, concurrency {settings.TRANSCRIPTION_CHUNK_CONCURRENCY})"
+    )
+    
+    segment_dir = tempfile.mkdtemp(prefix="segments-", dir=os.path.dirname(os.path.abspath(input_file_path)))
+    extension = audio_service.segment_extension()
+    progress_lock = threading.Lock()
+    finished = [0]
+    
+    def _transcribe_segment(index: int) -> WordTable:
+        start, end = segments[index]
+        end = min(end + overlap, duration)
+        segment_path = os.path.join(segment_dir, f"{index:04d}{extension}")
+        audio_service.extract_segment(input_file_path, start, end - start, segment_path)
+        try:
+            table = transcribe_audio_file(segment_path, allow_empty=True).with_time_offset(start)
+        finally:
+            os.remove(segment_path)
+        if on_progress is not None:
+            with progress_lock:
+                finished[0] += 1
+                done = finished[0]
+            try:
+                on_progress(done, len(segments))
+            except Exception as exc:
+                logger.debug(f"Progress callback failed: {exc}")
+        return table
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, settings.TRANSCRIPTION_CHUNK_CONCURRENCY)) as pool:
+            tables = list(pool.map(_transcribe_segment, range(len(segments))))
+    finally:
+        shutil.rmtree(segment_dir, ignore_errors=True)
+    
+    word_table = _stitch_segments(tables, [start for start, _ in segments])
+    if word_table.is_empty:
+        raise Exception("No words found in Deepgram response")
+    return word_table
+
+async def atranscribe_audio_file_chunked(
+    input_file_path: str,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> WordTable:
+    """
+    transcribe_audio_file_chunked for the asyncio pipeline. Segments are cut with
+    ffmpeg in threads and transcribed as coroutines; the Deepgram and ffmpeg
+    semaphores bound them rather than TRANSCRIPTION_CHUNK_CONCURRENCY.
+    """
+    target_seconds = settings.TRANSCRIPTION_CHUNK_MINUTES * 60
+    duration = await audio_service.run_bounded(audio_service.probe_duration, input_file_path)
+    if not duration or duration < 2 * target_seconds:
+        return await atranscribe_audio_file(input_file_path)
+    
+    overlap = settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS
+    silences = await audio_service.run_bounded(audio_service.detect_silences, input_file_path)
+    segments = audio_service.plan_segments(duration, silences, target_seconds)
+    logger.info(
+        f"Transcribing {duration:.0f}s recording as {len(segments)} segments ({len(silences)} silences found)"
+    )
+    
+    segment_dir = tempfile.mkdtemp(prefix="segments-", dir=os.path.dirname(os.path.abspath(input_file_path)))
+    extension = audio_service.segment_extension()
+    finished = [0]
+    
+    async def _transcribe_segment(index: int) -> WordTable:
+        start, end = segments[index]
+        end = min(end + overlap, duration)
+        segment_path = os.path.join(segment_dir, f"{index:04d}{extension}")
+        await audio_service.run_bounded(audio_service.extract_segment, input_file_path, start, end - start, segment_path)
+        try:
+            table = (await atranscribe_audio_file(segment_path, allow_empty=True)).with_time_offset(start)
+        finally:
+            os.remove(segment_path)
+        finished[0] += 1
+        if on_progress is not None:
+            try:
+                on_progress(finished[0], len(segments))
+            except Exception as exc:
+                logger.debug(f"Progress callback failed: {exc}")
+        return table
+    
+    try:
+        # Let every segment settle before the directory is removed under them.
+        tables = await asyncio.gather(
+            *(_transcribe_segment(index) for index in range(len(segments))), return_exceptions=True
+        )
+    finally:
+        shutil.rmtree(segment_dir, ignore_errors=True)
+    for table in tables:
+        if isinstance(table, BaseException):
+            raise table
+    
+    word_table = _stitch_segments(list(tables), [start for start, _ in segments])
+    if word_table.is_empty:
+        raise Exception("No words found in Deepgram response")
+    return word_table
+
+def _stitch_segments(tables: List[WordTable], cut_points: List[float]) -> WordTable:
+    """
+    Joins per-segment word tables (already shifted to absolute time) into one table.
+    
+    Segment i owns the words in [cut_points[i], cut_points[i + 1]). Words the
+    previous segment also heard in its overlap tail vote on which global speaker
+    each of segment i's local speakers corresponds to. Speakers with no votes are
+    given fresh global ids.
+    """
+    stitched: List[WordTable] = []
+    next_speaker_id = 0
+    previous_tail: Optional[WordTable] = None
+    
+    for index, table in enumerate(tables):
+        segment_end = cut_points[index + 1] if index + 1 < len(cut_points) else np.inf
+        owned = table.take((table.start >= cut_points[index]) & (table.start < segment_end))
+        
+        votes = _overlap_speaker_votes(previous_tail, table) if previous_tail is not None else {}
+        mapping: Dict[int, int] = {}
+        used = set()
+        for (local_id, global_id), _ in sorted(votes.items(), key=lambda item: -item[1]):
+            if local_id in mapping or global_id in used:
                 continue
-            else:
-                raise Exception(f"Deepgram API request failed after {max_retries} attempts: {str(e)}")
-                
-        except Exception as e:
-            logger.error(f"Error processing Deepgram response: {e}", exc_info=True)
-            raise Exception(f"Failed to process Deepgram transcription: {str(e)}")
+            mapping[local_id] = global_id
+            used.add(global_id)
+        for local_id in sorted(set(table.speaker.tolist())):
+            if local_id not in mapping:
+                mapping[local_id] = next_speaker_id
+                next_speaker_id += 1
+            next_speaker_id = max(next_speaker_id, mapping[local_id] + 1)
+        
+        stitched.append(owned.with_speakers(mapping))
+        previous_tail = table.take(table.start >= segment_end).with_speakers(mapping)
+    
+    return WordTable.concat(stitched)
+
+def _overlap_speaker_votes(
+    previous_tail: WordTable,
+    table: WordTable,
+    tolerance: float = 0.3,
+) -> Dict[Tuple[int, int], int]:
+    """Counts (local speaker, previous global speaker) pairs for words heard by both segments."""
+    if previous_tail.is_empty or table.is_empty:
+        return {}
+    tail_end = float(previous_tail.start.max()) + tolerance
+    head = table.take(table.start <= tail_end)
+    if head.is_empty:
+        return {}
     
-    # Should not reach here, but just in case
-    if last_exception:
-        raise Exception(f"Deepgram API request failed after {max_retries} attempts: {str(last_exception)}")
+    tail_words = [word.strip().lower() for word in previous_tail.words()]
+    tail_starts = previous_tail.start
+    tail_speakers = previous_tail.speaker.tolist()
+    votes: Dict[Tuple[int, int], int] = {}
+    for word, start, speaker in zip(head.words(), head.start.tolist(), head.speaker.tolist()):
+        word = word.strip().lower()
+        if not word:
+            continue
+        nearest = int(np.argmin(np.abs(tail_starts - start)))
+        if abs(float(tail_starts[nearest]) - start) <= tolerance and tail_words[nearest] == word:
+            key = (speaker, tail_speakers[nearest])
+            votes[key] = votes.get(key, 0) + 1
+    return votes
 
 def _get_content_type(file_path: str) -> str:
     """Determine content type from file extension"""
@@ -115,96 +453,84 @@ def _get_content_type(file_path: str) -> str:
         '.m4a': 'audio/m4a',
         '.mp4': 'video/mp4',
         '.webm': 'video/webm',
+        '.ogg': 'audio/ogg',
+        '.flac': 'audio/flac',
     }
     return content_types.get(ext, None)
 
-def _parse_deepgram_response(response: Dict) -> pd.DataFrame:
+def _parse_deepgram_response(response: Dict, allow_empty: bool = False) -> WordTable:
     """
-    Parse Deepgram API response into a pandas DataFrame.
+    Parse Deepgram API response into a columnar WordTable.
     
-    Returns DataFrame with: start, end, word, speaker, confidence
+    Returns WordTable with: start, end, word, speaker, confidence
     """
-    words_data = []
-    
     try:
         if 'results' not in response or 'channels' not in response['results']:
             raise Exception("Invalid Deepgram API response format")
         
-        for channel in response['results']['channels']:
-            if 'alternatives' not in channel or len(channel['alternatives']) == 0:
-                continue
-            
-            alternative = channel['alternatives'][0]
-            if 'words' not in alternative:
-                continue
-            
-            for word_info in alternative['words']:
-                words_data.append({
-                    'start': word_info.get('start', 0),
-                    'end': word_info.get('end', 0),
-                    'word': word_info.get('word', ''),
-                    'speaker': word_info.get('speaker', 0),
-                    'confidence': word_info.get('confidence', 0)
-                })
+        def _iter_words():
+            for channel in response['results']['channels']:
+                if 'alternatives' not in channel or len(channel['alternatives']) == 0:
+                    continue
+                
+                alternative = channel['alternatives'][0]
+                if 'words' not in alternative:
+                    continue
+                
+                yield from alternative['words']
+        
+        word_table = WordTable.from_words(_iter_words())
         
-        if not words_data:
+        if word_table.is_empty and not allow_empty:
             raise Exception("No words found in Deepgram response")
         
-        df = pd.DataFrame(words_data)
-        logger.info(f"Parsed {len(df)} words from Deepgram response")
-        return df
+        logger.info(f"Parsed {len(word_table)} words from Deepgram response ({word_table.nbytes} bytes)")
+        return word_table
         
     except Exception as e:
         logger.error(f"Error parsing Deepgram response: {e}")
         logger.error(f"Response structure: {list(response.keys()) if isinstance(response, dict) else 'Not a dict'}")
         raise Exception(f"Failed to parse Deepgram response: {str(e)}")
 
-def merge_transcription_and_diarization(transcription_df: pd.DataFrame, diarization=None) -> str:
+def merge_transcription_and_diarization(word_table: WordTable, diarization=None) -> str:
     """
-    Merges Deepgram transcription DataFrame (which includes diarization) into formatted transcript.
+    Merges Deepgram transcription WordTable (which includes diarization) into formatted transcript.
     The diarization parameter is kept for compatibility but ignored since Deepgram provides speaker labels.
     
     Args:
-        transcription_df: DataFrame with columns: start, end, word, speaker, confidence
-        diarization: Not used (kept for compatibility), Deepgram provides speaker info in transcription_df
+        word_table: WordTable with columns: start, end, word, speaker, confidence
+        diarization: Not used (kept for compatibility), Deepgram provides speaker info in word_table
     
     Returns:
         Formatted transcript string with timestamps and speaker labels
     """
-    if transcription_df.empty:
+    if word_table.is_empty:
         return ""
     
-    transcript = ""
-    current_speaker = None
-    current_words = []
-    current_start = None
+    # Strip each distinct word once, then drop rows whose word is blank.
+    vocabulary = np.array([word.strip() for word in word_table.vocabulary], dtype=object)
+    keep = (vocabulary != '')[word_table.word_ids]
+    word_ids = word_table.word_ids[keep]
+    speakers = word_table.speaker[keep].astype(np.int64)
+    starts = word_table.start[keep].astype(np.float64)
+    if len(word_ids) == 0:
+        return ""
     
-    for _, row in transcription_df.iterrows():
-        speaker = int(row['speaker']) if pd.notna(row['speaker']) else 0
-        word = str(row['word']).strip()
-        
-        if not word:
-            continue
-        
-        start_time = float(row['start'])
-        
-        if speaker != current_speaker:
-            if current_speaker is not None and current_words:
-                start_min = int(current_start // 60)
-                start_sec = int(current_start % 60)
-                text = ' '.join(current_words)
-                transcript += f"[{start_min:02d}:{start_sec:02d}] SPEAKER_{current_speaker}: {text}\n"
-            
-            current_speaker = speaker
-            current_words = [word]
-            current_start = start_time
-        else:
-            current_words.append(word)
-    
-    if current_speaker is not None and current_words:
-        start_min = int(current_start // 60)
-        start_sec = int(current_start % 60)
-        text = ' '.join(current_words)
-        transcript += f"[{start_min:02d}:{start_sec:02d}] SPEAKER_{current_speaker}: {text}\n"
-    
-    return transcript
+    # Run-length group the speaker column: a new turn starts wherever the speaker changes.
+    change_points = np.flatnonzero(speakers[1:] != speakers[:-1]) + 1
+    turn_starts = np.concatenate(([0], change_points))
+    turn_ends = np.append(change_points, len(word_ids))
+    
+    turn_times = starts[turn_starts]
+    start_mins = np.floor_divide(turn_times, 60).astype(np.int64).tolist()
+    start_secs = np.mod(turn_times, 60).astype(np.int64).tolist()
+    turn_speakers = speakers[turn_starts].tolist()
+    
+    word_list = vocabulary[word_ids].tolist()
+    lines = [
+        f"[{start_min:02d}:{start_sec:02d}] SPEAKER_{speaker}: {' '.join(word_list[begin:end])}\n"
+        for start_min, start_sec, speaker, begin, end in zip(
+            start_mins, start_secs, turn_speakers, turn_starts.tolist(), turn_ends.tolist()
+        )
+    ]
+    return "".join(lines)
@@ -0,0 +1,216 @@
+import logging
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class WordTable:
+    """
+    Compact columnar table of word-level transcription results.
+
+    Columns are typed NumPy arrays (float32 start/end/confidence, int16 speaker).
+    Word text is interned: every distinct word is stored once in a UTF-8 buffer
+    addressed by offsets, and each row holds an int32 id into that vocabulary.
+    """
+
+    __slots__ = (
+        "start",
+        "end",
+        "speaker",
+        "confidence",
+        "word_ids",
+        "vocab_buffer",
+        "vocab_offsets",
+        "_vocab",
+    )
+
+    def __init__(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        speaker: np.ndarray,
+        confidence: np.ndarray,
+        word_ids: np.ndarray,
+        vocab_buffer: bytes,
+        vocab_offsets: np.ndarray,
+    ):
+        self.start = start
+        self.end = end
+        self.speaker = speaker
+        self.confidence = confidence
+        self.word_ids = word_ids
+        self.vocab_buffer = vocab_buffer
+        self.vocab_offsets = vocab_offsets
+        self._vocab: Optional[List[str]] = None
+
+    @classmethod
+    def from_words(cls, words: Iterable[Dict[str, Any]]) -> "WordTable":
+        """Build a table from Deepgram-style word dicts (start, end, word, speaker, confidence)."""
+        starts = array("f")
+        ends = array("f")
+        speakers = array("h")
+        confidences = array("f")
+        word_ids = array("i")
+        vocab_index: Dict[str, int] = {}
+
+        for word_info in words:
+            starts.append(word_info.get("start", 0) or 0)
+            ends.append(word_info.get("end", 0) or 0)
+            speakers.append(int(word_info.get("speaker", 0) or 0))
+            confidences.append(word_info.get("confidence", 0) or 0)
+            text = str(word_info.get("word", ""))
+            word_id = vocab_index.get(text)
+            if word_id is None:
+                word_id = len(vocab_index)
+                vocab_index[text] = word_id
+            word_ids.append(word_id)
+
+        return cls._from_columns(starts, ends, speakers, confidences, word_ids, list(vocab_index))
+
+    @classmethod
+    def empty(cls) -> "WordTable":
+        return cls.from_words([])
+
+    @classmethod
+    def _from_columns(
+        cls,
+        starts: Sequence[float],
+        ends: Sequence[float],
+        speakers: Sequence[int],
+        confidences: Sequence[float],
+        word_ids: Sequence[int],
+        vocabulary: List[str],
+    ) -> "WordTable":
+        encoded = [text.encode("utf-8") for text in vocabulary]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int32)
+        if encoded:
+            np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+        table = cls(
+            start=np.asarray(starts, dtype=np.float32),
+            end=np.asarray(ends, dtype=np.float32),
+            speaker=np.asarray(speakers, dtype=np.int16),
+            confidence=np.asarray(confidences, dtype=np.float32),
+            word_ids=np.asarray(word_ids, dtype=np.int32),
+            vocab_buffer=b"".join(encoded),
+            vocab_offsets=offsets,
+        )
+        table._vocab = list(vocabulary)
+        return table
+
+    @classmethod
+    def concat(cls, tables: Sequence["WordTable"]) -> "WordTable":
+        """Concatenate tables row-wise, re-interning their vocabularies into one buffer."""
+        tables = [table for table in tables if not table.is_empty]
+        if not tables:
+            return cls.empty()
+        if len(tables) == 1:
+            return tables[0]
+
+        vocab_index: Dict[str, int] = {}
+        remapped_ids = []
+        for table in tables:
+            lookup = np.empty(len(table.vocabulary), dtype=np.int32)
+            for local_id, text in enumerate(table.vocabulary):
+                global_id = vocab_index.get(text)
+                if global_id is None:
+                    global_id = len(vocab_index)
+                    vocab_index[text] = global_id
+                lookup[local_id] = global_id
+            remapped_ids.append(lookup[table.word_ids])
+
+        return cls._from_columns(
+            np.concatenate([table.start for table in tables]),
+            np.concatenate([table.end for table in tables]),
+            np.concatenate([table.speaker for table in tables]),
+            np.concatenate([table.confidence for table in tables]),
+            np.concatenate(remapped_ids),
+            list(vocab_index),
+        )
+
+    def _with_columns(self, **columns: np.ndarray) -> "WordTable":
+        table = WordTable(
+            start=columns.get("start", self.start),
+            end=columns.get("end", self.end),
+            speaker=columns.get("speaker", self.speaker),
+            confidence=columns.get("confidence", self.confidence),
+            word_ids=columns.get("word_ids", self.word_ids),
+            vocab_buffer=self.vocab_buffer,
+            vocab_offsets=self.vocab_offsets,
+        )
+        table._vocab = self._vocab
+        return table
+
+    def take(self, rows: np.ndarray) -> "WordTable":
+        """Select rows by boolean mask or integer index; the vocabulary is shared."""
+        return self._with_columns(
+            start=self.start[rows],
+            end=self.end[rows],
+            speaker=self.speaker[rows],
+            confidence=self.confidence[rows],
+            word_ids=self.word_ids[rows],
+        )
+
+    def with_time_offset(self, seconds: float) -> "WordTable":
+        offset = np.float32(seconds)
+        return self._with_columns(start=self.start + offset, end=self.end + offset)
+
+    def with_speakers(self, mapping: Dict[int, int]) -> "WordTable":
+        """Relabel speakers; ids missing from `mapping` are kept as-is."""
+        if self.is_empty or not mapping:
+            return self
+        lookup = np.arange(int(self.speaker.max()) + 1, dtype=np.int16)
+        for local_id, new_id in mapping.items():
+            if 0 <= local_id < len(lookup):
+                lookup[local_id] = new_id
+        return self._with_columns(speaker=lookup[self.speaker])
+
+    def __len__(self) -> int:
+        return len(self.word_ids)
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.start.nbytes
+            + self.end.nbytes
+            + self.speaker.nbytes
+            + self.confidence.nbytes
+            + self.word_ids.nbytes
+            + len(self.vocab_buffer)
+            + self.vocab_offsets.nbytes
+        )
+
+    @property
+    def vocabulary(self) -> List[str]:
+        """Distinct words, indexed by the values in ``word_ids``."""
+        if self._vocab is None:
+            offsets = self.vocab_offsets.tolist()
+            buffer = self.vocab_buffer
+            self._vocab = [
+                buffer[begin:end].decode("utf-8") for begin, end in zip(offsets[:-1], offsets[1:])
+            ]
+        return self._vocab
+
+    def words(self) -> List[str]:
+        vocabulary = self.vocabulary
+        return [vocabulary[word_id] for word_id in self.word_ids.tolist()]
+
+    def to_dataframe(self):
+        """Return the table as a pandas DataFrame (start, end, word, speaker, confidence)."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "start": self.start,
+                "end": self.end,
+                "word": self.words(),
+                "speaker": self.speaker,
+                "confidence": self.confidence,
+            }
+        )
@@ -0,0 +1,134 @@
+"""
+Asyncio pipeline executor, used instead of the Celery workers when PIPELINE_EXECUTOR=asyncio.
+
+    python async_worker.py --concurrency 24 --name worker-1
+
+Claims meetings from the Redis pipeline queue (shortest job first, with aging)
+and runs up to `--concurrency` of them at once in one event loop. Calls to
+ffmpeg, Deepgram, the LLM and Neo4j are bounded by the ASYNC_*_CONCURRENCY
+settings. Meetings a previous run of the same `--name` left unfinished are
+re-queued at startup. A meeting requested again while it is running is run
+again after it finishes, never twice at once. Duplicate uploads are completed
+from the earlier meeting's results instead, and chat's requests to index a
+meeting's transcript chunks only run that step. SIGTERM/SIGINT stop claiming
+and let running meetings finish. Metrics are exported on METRICS_WORKER_PORT.
+"""
+import os
+import sys
+import signal
+import socket
+import asyncio
+import argparse
+import logging
+from typing import List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app.core.config import settings
+from app.core.metrics import start_metrics_exporter
+from app.services.async_pipeline import run_meeting_clone, run_meeting_indexing, run_meeting_pipeline
+from app.services.pipeline_queue import (
+    claim_pipeline_job,
+    finish_pipeline_job,
+    refresh_pipeline_claims,
+    requeue_in_flight,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("async_worker")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the meeting pipeline on an asyncio event loop.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.ASYNC_PIPELINE_MAX_MEETINGS,
+        help=f"Meetings in flight (default: ASYNC_PIPELINE_MAX_MEETINGS, {settings.ASYNC_PIPELINE_MAX_MEETINGS})",
+    )
+    parser.add_argument(
+        "--name",
+        default=socket.gethostname(),
+        help="Stable worker name; unfinished meetings of this name are re-queued at startup (default: hostname)",
+    )
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between checks of an empty queue")
+    return parser.parse_args(argv)
+
+
+async def _run_job(worker: str, job: dict, slots: asyncio.Semaphore) -> None:
+    meeting_id = job["meeting_id"]
+    try:
+        if job.get("clone_from"):
+            await run_meeting_clone(meeting_id, job["clone_from"])
+        elif job.get("index_only"):
+            await run_meeting_indexing(meeting_id)
+        else:
+            await run_meeting_pipeline(meeting_id, force=job.get("force", False))
+    except Exception as exc:
+        logger.error("Meeting %s failed: %s", meeting_id, exc)
+    finally:
+        try:
+            await asyncio.to_thread(finish_pipeline_job, worker, meeting_id)
+        except Exception as exc:
+            logger.warning("Could not release meeting %s: %s", meeting_id, exc)
+        slots.release()
+
+
+async def _keep_claims(worker: str) -> None:
+    interval = max(1.0, settings.ASYNC_PIPELINE_CLAIM_TTL_SECONDS / 3)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(refresh_pipeline_claims, worker)
+        except Exception as exc:
+            logger.warning("Could not refresh claims on running meetings: %s", exc)
+
+
+async def run_worker(worker: str, concurrency: int, poll_interval: float) -> None:
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopping.set)
+
+    await asyncio.to_thread(requeue_in_flight, worker)
+    logger.info("Async worker %s started with %d meeting slots", worker, concurrency)
+
+    slots = asyncio.Semaphore(concurrency)
+    running = set()
+    keeper = asyncio.create_task(_keep_claims(worker))
+    while not stopping.is_set():
+        await slots.acquire()
+        if stopping.is_set():
+            slots.release()
+            break
+        try:
+            job = await asyncio.to_thread(claim_pipeline_job, worker)
+        except Exception as exc:
+            logger.warning("Could not claim from the pipeline queue: %s", exc)
+            job = None
+        if job is None:
+            slots.release()
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        task = asyncio.create_task(_run_job(worker, job, slots))
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+    logger.info("Stopping: waiting for %d running meetings", len(running))
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+    keeper.cancel()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    start_metrics_exporter(settings.METRICS_WORKER_PORT)
+    asyncio.run(run_worker(args.name, max(1, args.concurrency), args.poll_interval))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
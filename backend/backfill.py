@@ -0,0 +1,188 @@
+"""
+Bulk reprocessing of meetings, e.g. after a prompt or graph schema change.
+
+    python backfill.py --status COMPLETED --since 2025-01-01 --stages tags graph --concurrency 8
+
+Selects meetings by status and/or creation date, enqueues them on the Celery
+pipeline with at most `--concurrency` in flight, and reports throughput and ETA.
+Needs a running worker consuming the pipeline queues and a result backend.
+"""
+import os
+import sys
+import time
+import uuid
+import argparse
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app.db.database import SessionLocal
+from app.db.models import Meeting, MeetingStatus
+from app.services.llm_service import INSIGHT_PROMPTS
+from app.services.processing_service import REPROCESS_STAGES, build_reprocess_workflow
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("backfill")
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date {value!r}, expected YYYY-MM-DD[THH:MM]")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-run pipeline stages for many meetings.")
+    parser.add_argument(
+        "--status",
+        nargs="+",
+        choices=[status.value for status in MeetingStatus],
+        help="Only meetings in these statuses (default: COMPLETED)",
+    )
+    parser.add_argument("--since", type=_parse_date, help="Only meetings created at or after this date")
+    parser.add_argument("--until", type=_parse_date, help="Only meetings created before this date")
+    parser.add_argument("--meeting-id", nargs="+", dest="meeting_ids", help="Only these meetings")
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        default=["insights"],
+        choices=list(REPROCESS_STAGES) + list(INSIGHT_PROMPTS),
+        help=(
+            "Stages to re-run: transcribe (whole pipeline), insights, a single prompt key, graph, index. "
+            "transcribe needs the uploaded file, which is removed once a meeting completes; "
+            "meetings without it are skipped"
+        ),
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum meetings in flight (default: 4)")
+    parser.add_argument("--limit", type=int, help="Process at most this many meetings")
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds before a meeting counts as failed")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between progress checks")
+    parser.add_argument("--dry-run", action="store_true", help="List the selected meetings and exit")
+    return parser.parse_args(argv)
+
+
+def select_meetings(args: argparse.Namespace) -> List[str]:
+    db = SessionLocal()
+    try:
+        query = db.query(Meeting.id, Meeting.file_path)
+        statuses = [MeetingStatus(value) for value in args.status or [MeetingStatus.COMPLETED.value]]
+        query = query.filter(Meeting.status.in_(statuses))
+        if args.since:
+            query = query.filter(Meeting.created_at >= args.since)
+        if args.until:
+            query = query.filter(Meeting.created_at < args.until)
+        if args.meeting_ids:
+            query = query.filter(Meeting.id.in_([uuid.UUID(value) for value in args.meeting_ids]))
+        rows = query.order_by(Meeting.created_at).all()
+        if "transcribe" in args.stages:
+            # Preprocessing would fail on these and flip the meeting to FAILED.
+            available = [row for row in rows if row.file_path and os.path.exists(row.file_path)]
+            if len(available) < len(rows):
+                logger.warning("Skipping %d meetings whose uploaded file was removed", len(rows) - len(available))
+            rows = available
+        if args.limit:
+            rows = rows[:args.limit]
+        return [str(row.id) for row in rows]
+    finally:
+        db.close()
+
+
+def _outcome(result) -> Optional[str]:
+    """'succeeded' / 'failed' once the workflow has finished, else None."""
+    # A failure earlier in a chain leaves the last task pending forever, so walk the parents.
+    node = result
+    while node is not None:
+        if node.failed():
+            return "failed"
+        node = node.parent
+    return "succeeded" if result.successful() else None
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+def run_backfill(meeting_ids: List[str], stages: List[str], concurrency: int, timeout: float, poll_interval: float) -> int:
+    """Enqueues the meetings with bounded concurrency; returns the number that failed."""
+    pending = list(reversed(meeting_ids))
+    in_flight = {}
+    succeeded = failed = 0
+    total = len(meeting_ids)
+    started = time.monotonic()
+
+    while pending or in_flight:
+        while pending and len(in_flight) < concurrency:
+            meeting_id = pending.pop()
+            try:
+                in_flight[meeting_id] = (build_reprocess_workflow(meeting_id, stages).apply_async(), time.monotonic())
+            except Exception as exc:
+                logger.error("Failed to enqueue meeting %s: %s", meeting_id, exc)
+                failed += 1
+
+        time.sleep(poll_interval)
+        finished = 0
+        for meeting_id, (result, enqueued_at) in list(in_flight.items()):
+            try:
+                outcome = _outcome(result)
+            except Exception as exc:
+                logger.warning("Could not read result for meeting %s: %s", meeting_id, exc)
+                outcome = None
+            if outcome is None and time.monotonic() - enqueued_at > timeout:
+                logger.error("Meeting %s timed out after %ss", meeting_id, timeout)
+                outcome = "failed"
+            if outcome is None:
+                continue
+            del in_flight[meeting_id]
+            finished += 1
+            if outcome == "succeeded":
+                succeeded += 1
+            else:
+                failed += 1
+                logger.error("Meeting %s failed", meeting_id)
+
+        if finished:
+            done = succeeded + failed
+            elapsed = time.monotonic() - started
+            rate = done / elapsed
+            eta = (total - done) / rate if rate else 0
+            logger.info(
+                "%d/%d done (%d failed), %d in flight, %.1f meetings/min, elapsed %s, ETA %s",
+                done,
+                total,
+                failed,
+                len(in_flight),
+                rate * 60,
+                _format_duration(elapsed),
+                _format_duration(eta),
+            )
+
+    logger.info(
+        "Backfill finished: %d succeeded, %d failed in %s",
+        succeeded,
+        failed,
+        _format_duration(time.monotonic() - started),
+    )
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    meeting_ids = select_meetings(args)
+    logger.info("Selected %d meetings; stages: %s", len(meeting_ids), ", ".join(args.stages))
+    if args.dry_run:
+        for meeting_id in meeting_ids:
+            print(meeting_id)
+        return 0
+    if not meeting_ids:
+        return 0
+    failed = run_backfill(meeting_ids, args.stages, max(1, args.concurrency), args.timeout, args.poll_interval)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
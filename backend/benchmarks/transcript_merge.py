@@ -0,0 +1,125 @@
+"""
+Throughput of transcript assembly: merge_transcription_and_diarization vs. the
+original row-by-row loop over a DataFrame.
+
+    python benchmarks/transcript_merge.py --words 10000 50000 200000
+
+Builds synthetic Deepgram word lists (speaker turns of random length, some
+empty words), checks that both implementations produce the same transcript and
+reports the best of `--repeat` timings for each. The original loop is kept
+here verbatim as the reference.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from upload_memory import BENCHMARK_SETTINGS
+
+for _name, _value in BENCHMARK_SETTINGS.items():
+    os.environ.setdefault(_name, _value)
+
+from app.services.transcription_service import merge_transcription_and_diarization
+from app.services.word_table import WordTable
+
+_VOCABULARY = ["the", "roadmap", "we", "should", "ship", "on", "friday", "budget", "okay", "next", "quarter", "agreed", ""]
+
+
+def original_merge(transcription_df: pd.DataFrame) -> str:
+    """merge_transcription_and_diarization before vectorisation."""
+    if transcription_df.empty:
+        return ""
+
+    transcript = ""
+    current_speaker = None
+    current_words = []
+    current_start = None
+
+    for _, row in transcription_df.iterrows():
+        speaker = int(row['speaker']) if pd.notna(row['speaker']) else 0
+        word = str(row['word']).strip()
+
+        if not word:
+            continue
+
+        start_time = float(row['start'])
+
+        if speaker != current_speaker:
+            if current_speaker is not None and current_words:
+                start_min = int(current_start // 60)
+                start_sec = int(current_start % 60)
+                text = ' '.join(current_words)
+                transcript += f"[{start_min:02d}:{start_sec:02d}] SPEAKER_{current_speaker}: {text}\n"
+
+            current_speaker = speaker
+            current_words = [word]
+            current_start = start_time
+        else:
+            current_words.append(word)
+
+    if current_speaker is not None and current_words:
+        start_min = int(current_start // 60)
+        start_sec = int(current_start % 60)
+        text = ' '.join(current_words)
+        transcript += f"[{start_min:02d}:{start_sec:02d}] SPEAKER_{current_speaker}: {text}\n"
+
+    return transcript
+
+
+def synthetic_words(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    words = []
+    speaker, turn_left, clock = 0, 0, 0.0
+    for _ in range(count):
+        if turn_left == 0:
+            speaker = rng.randrange(4)
+            turn_left = rng.randint(1, 60)
+        turn_left -= 1
+        # Quarter-second steps are exact in float32, as WordTable stores them.
+        clock += rng.choice((0.25, 0.5, 0.75))
+        words.append(
+            {"start": clock, "end": clock + 0.25, "word": rng.choice(_VOCABULARY), "speaker": speaker, "confidence": 0.9}
+        )
+    return words
+
+
+def _best_of(repeat: int, run: Callable[[], str]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time transcript assembly against the original loop.")
+    parser.add_argument("--words", nargs="+", type=int, default=[10000, 50000, 200000], help="Word counts to test")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per implementation (best is reported)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    print(f"{'words':>8} {'original':>10} {'current':>10} {'speedup':>8}")
+    for count in args.words:
+        words = synthetic_words(count)
+        frame = pd.DataFrame(words)
+        table = WordTable.from_words(words)
+        if original_merge(frame) != merge_transcription_and_diarization(table):
+            print(f"Outputs differ for {count} words", file=sys.stderr)
+            return 1
+        original = _best_of(args.repeat, lambda: original_merge(frame))
+        current = _best_of(args.repeat, lambda: merge_transcription_and_diarization(table))
+        print(f"{count:>8} {original:>9.3f}s {current:>9.3f}s {original / current:>7.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
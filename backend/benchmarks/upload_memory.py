@@ -0,0 +1,126 @@
+"""
+Peak memory of sending a recording to Deepgram: streamed upload vs. the
+original read-the-whole-file upload.
+
+    python benchmarks/upload_memory.py --sizes-mb 20 200
+
+Runs a local fake Deepgram endpoint that drains the request body and returns a
+one-word transcript, then transcribes a random file of each size in a fresh
+child process per mode and reports the child's peak RSS. No API key or network
+access is needed; the transcription cache is disabled.
+"""
+import os
+import sys
+import json
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+BENCHMARK_SETTINGS = {
+    "DATABASE_URL": "sqlite://",
+    "CELERY_BROKER_URL": "memory://",
+    "CELERY_RESULT_BACKEND": "cache+memory://",
+    "DEEPGRAM_API_KEY": "benchmark",
+    "OPENAI_API_KEY": "benchmark",
+}
+
+_RESPONSE = json.dumps(
+    {
+        "results": {
+            "channels": [
+                {"alternatives": [{"words": [{"start": 0.0, "end": 0.5, "word": "hello", "speaker": 0, "confidence": 1.0}]}]}
+            ]
+        }
+    }
+).encode()
+
+
+class _FakeDeepgram(BaseHTTPRequestHandler):
+    def do_POST(self):
+        remaining = int(self.headers.get("Content-Length") or 0)
+        while remaining > 0:
+            remaining -= len(self.rfile.read(min(remaining, 1024 * 1024)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _child(mode: str, path: str, url: str) -> None:
+    # Only the settings the app requires; nothing here connects to them.
+    for name, value in BENCHMARK_SETTINGS.items():
+        os.environ.setdefault(name, value)
+    os.environ["TRANSCRIPTION_CACHE_ENABLED"] = "false"
+    sys.path.insert(0, BACKEND_DIR)
+    from app.services import transcription_service
+
+    transcription_service._DEEPGRAM_URL = url
+    if mode == "streamed":
+        transcription_service.transcribe_audio_file(path)
+    else:
+        # The implementation before streaming: the whole file in one bytes object
+        import requests
+
+        _, headers = transcription_service._deepgram_request(path)
+        with open(path, "rb") as audio_file:
+            audio_data = audio_file.read()
+        requests.post(url, headers=headers, data=audio_data, timeout=300).raise_for_status()
+    # ru_maxrss is in KiB on Linux
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Peak RSS of the Deepgram upload path.")
+    parser.add_argument("--sizes-mb", nargs="+", type=int, default=[20, 200], help="File sizes to test (default: 20 200)")
+    parser.add_argument("--modes", nargs="+", choices=["buffered", "streamed"], default=["buffered", "streamed"])
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "PATH", "URL"), help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.child:
+        _child(*args.child)
+        return 0
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeDeepgram)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/listen"
+
+    print(f"{'size':>8} {'mode':>9} {'peak RSS':>10}")
+    try:
+        for size_mb in args.sizes_mb:
+            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as recording:
+                for _ in range(size_mb):
+                    recording.write(os.urandom(1024 * 1024))
+            try:
+                for mode in args.modes:
+                    child = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), "--child", mode, recording.name, url],
+                        capture_output=True,
+                        text=True,
+                    )
+                    if child.returncode != 0:
+                        print(child.stderr, file=sys.stderr)
+                        return 1
+                    peak_mb = int(child.stdout.strip().splitlines()[-1]) / 1024
+                    print(f"{size_mb:>5} MB {mode:>9} {peak_mb:>7.0f} MB")
+            finally:
+                os.remove(recording.name)
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -72,6 +72,15 @@ export interface JobStatusResponse {
   message: string
 }
 
+export interface MeetingProgressEvent {
+  meeting_id: string
+  stage: string
+  status: 'running' | 'completed' | 'failed'
+  progress: number | null
+  message: string
+  timestamp: number
+}
+
 export interface MeetingDetailsResponse extends MeetingResponse {
   transcript?: string
   summary?: string
@@ -146,6 +155,11 @@ export const api = {
     return handleResponse<JobStatusResponse>(response)
   },
 
+  // Server-sent stage progress for a meeting
+  meetingEventsUrl(meetingId: string): string {
+    return `${API_BASE_URL}/meetings/${meetingId}/events`
+  },
+
   // Get meeting details
   async getMeetingDetails(meetingId: string): Promise<MeetingDetailsResponse> {
     const response = await fetch(`${API_BASE_URL}/meetings/${meetingId}`)
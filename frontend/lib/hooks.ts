@@ -4,6 +4,7 @@ import {
   MeetingResponse,
   MeetingDetailsResponse,
   JobStatusResponse,
+  MeetingProgressEvent,
   ApiError,
   ChatMessage,
   MeetingChatResponse,
@@ -121,8 +122,10 @@ export function useMeetingsList(limit: number = 20) {
 
 export function useMeetingStatus(meetingId: string | null) {
   const [status, setStatus] = useState<JobStatusResponse | null>(null)
+  const [progress, setProgress] = useState<MeetingProgressEvent | null>(null)
   const [isLoading, setIsLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
+  const [streamFailed, setStreamFailed] = useState(false)
 
   const fetchStatus = useCallback(async () => {
     if (!meetingId) return
@@ -144,19 +147,59 @@ export function useMeetingStatus(meetingId: string | null) {
 
   useEffect(() => {
     fetchStatus()
-    
-    // Poll for status updates if processing
-    const interval = setInterval(() => {
-      if (status?.status === 'PROCESSING' || status?.status === 'PENDING') {
-        fetchStatus()
+  }, [fetchStatus])
+
+  const isActive = status?.status === 'PROCESSING' || status?.status === 'PENDING'
+
+  // Follow progress pushed by the worker while the meeting is being processed
+  useEffect(() => {
+    if (!meetingId || !isActive || streamFailed || typeof EventSource === 'undefined') return
+
+    const source = new EventSource(api.meetingEventsUrl(meetingId))
+
+    source.addEventListener('status', (event) => {
+      const data = JSON.parse((event as MessageEvent).data) as Pick<JobStatusResponse, 'meeting_id' | 'status'>
+      setStatus((previous) => ({
+        meeting_id: data.meeting_id,
+        status: data.status,
+        message: previous?.status === data.status ? previous.message : `Processing status for meeting ${data.meeting_id} is ${data.status}`,
+      }))
+      if (data.status === 'COMPLETED' || data.status === 'FAILED') {
+        source.close()
+      }
+    })
+
+    source.addEventListener('progress', (event) => {
+      const data = JSON.parse((event as MessageEvent).data) as MeetingProgressEvent
+      setProgress(data)
+      setStatus((previous) => previous && {
+        ...previous,
+        status: previous.status === 'PENDING' ? 'PROCESSING' : previous.status,
+        message: data.message,
+      })
+    })
+
+    source.onerror = () => {
+      // Closed by the server or unreachable: fall back to polling
+      if (source.readyState === EventSource.CLOSED) {
+        setStreamFailed(true)
       }
-    }, 2000)
+    }
+
+    return () => source.close()
+  }, [meetingId, isActive, streamFailed])
+
+  // Polling fallback when the event stream is unavailable
+  useEffect(() => {
+    if (!isActive || !(streamFailed || typeof EventSource === 'undefined')) return
 
+    const interval = setInterval(fetchStatus, 2000)
     return () => clearInterval(interval)
-  }, [fetchStatus, status?.status])
+  }, [fetchStatus, isActive, streamFailed])
 
   return {
     status,
+    progress,
     isLoading,
     error,
     refetch: fetchStatus